@@ -0,0 +1,109 @@
+# account_cache.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_SIZE = 1024       # accounts kept in memory
+CACHE_TTL = 60          # seconds before an entry must be re-read from the database
+LOG_EVERY = 500         # lookups between hit-rate log lines
+
+
+class AccountCache:
+    """In-process account state (name, balance) keyed by account number.
+
+    Entries expire after ttl seconds and the least recently used entry is
+    evicted once max_entries is reached. Postings write their new balance
+    through with the ledger row id as a version, so a slow, older posting
+    can never overwrite a newer balance.
+    """
+
+    def __init__(self, max_entries=CACHE_SIZE, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()   # acc_no -> [state, version, expires_at]
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0, 'writes': 0}
+
+    def get(self, acc_no, require=("balance",)):
+        """Cached state dict, or None on a miss.
+
+        An entry lacking any of the require keys (a balance written through
+        before the name was read) counts as a miss.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(acc_no)
+            if entry is not None and entry[2] <= now:
+                del self._entries[acc_no]
+                self._stats['expirations'] += 1
+                entry = None
+            if entry is not None and not all(key in entry[0] for key in require):
+                entry = None
+            if entry is None:
+                self._stats['misses'] += 1
+            else:
+                self._entries.move_to_end(acc_no)
+                self._stats['hits'] += 1
+            lookups = self._stats['hits'] + self._stats['misses']
+        if lookups % LOG_EVERY == 0:
+            self.log_stats()
+        return dict(entry[0]) if entry is not None else None
+
+    def fill(self, acc_no, **state):
+        """Cache state read from the database.
+
+        Keys the entry already has are kept: a balance written through by a
+        posting is at least as new as this read.
+        """
+        with self._lock:
+            entry = self._entries.get(acc_no)
+            if entry is None:
+                self._store(acc_no, state, 0)
+            else:
+                for key, value in state.items():
+                    entry[0].setdefault(key, value)
+
+    def write_balance(self, acc_no, balance, version):
+        """Write-through from a committed posting; version is its transaction_id"""
+        with self._lock:
+            entry = self._entries.get(acc_no)
+            if entry is None:
+                self._store(acc_no, {'balance': balance}, version)
+            elif version >= entry[1]:
+                # The expiry stays put, so the rest of the entry is still re-read on time
+                entry[0]['balance'] = balance
+                entry[1] = version
+                self._entries.move_to_end(acc_no)
+            self._stats['writes'] += 1
+
+    def invalidate(self, acc_no):
+        with self._lock:
+            self._entries.pop(acc_no, None)
+
+    def _store(self, acc_no, state, version):
+        self._entries[acc_no] = [dict(state), version, time.monotonic() + self.ttl]
+        self._entries.move_to_end(acc_no)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats['evictions'] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    def log_stats(self):
+        stats = self.stats()
+        logging.info(
+            f"Account cache: {stats['hit_rate']:.1%} hit rate "
+            f"({stats['hits']} hits, {stats['misses']} misses), "
+            f"{stats['evictions']} evictions, {stats['expirations']} expirations, "
+            f"{stats['writes']} write-throughs, {stats['size']} cached"
+        )
+
+
+account_cache = AccountCache()
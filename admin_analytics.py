@@ -0,0 +1,194 @@
+# admin_analytics
+from PyQt5.QtWidgets import (QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QHBoxLayout,
+                            QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView, QTabWidget)
+from PyQt5.QtGui import QColor, QIcon
+from PyQt5.QtCore import Qt
+from db_executor import get_executor, ExecutorBusyError, PRIORITY_BACKGROUND
+from navigation import get_navigator
+from assets import logo_pixmap
+from bank_core import admin
+from money import format_paise
+
+DAYS = 31
+MONTHS = 12
+FLOW_HEADERS = ["Deposits", "Count", "Withdrawals", "Count", "Net Flow"]
+NET_IN = QColor('#2ecc71')
+NET_OUT = QColor('#e74c3c')
+
+
+class AdminAnalyticsWindow(QWidget):
+    """Deposits, withdrawals and net flow per day, per month and per account.
+
+    Everything shown comes from the rollup tables that rollups.py keeps up
+    to date, so each tab is a primary-key range read however large the
+    ledger grows; the status line says how far behind the ledger they are.
+    """
+
+    def __init__(self, username):
+        super().__init__()
+        self.username = username
+        self.loader = None
+        self.account_loader = None
+        self.setWindowTitle("Analytics - Bank Mate")
+        self.init_ui()
+
+    def activate(self, username):
+        self.username = username
+        self.account_input.clear()
+        self.account_table.setRowCount(0)
+        self.load_analytics()
+
+    def init_ui(self):
+        self.setObjectName("AdminAnalyticsWindow")
+
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(30, 30, 30, 20)
+        main_layout.setSpacing(20)
+
+        # Logo and Header
+        logo_label = QLabel()
+        logo_label.setPixmap(logo_pixmap(100))
+        logo_label.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(logo_label)
+
+        title = QLabel("📈 Analytics")
+        title.setObjectName("header")
+        title.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(title)
+
+        self.status_label = QLabel()
+        self.status_label.setObjectName("status")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(self.status_label)
+
+        # One tab per rollup
+        tabs = QTabWidget()
+        self.daily_table = self.create_table(["Day"] + FLOW_HEADERS)
+        tabs.addTab(self.daily_table, f"Daily (last {DAYS} days)")
+        self.monthly_table = self.create_table(["Month"] + FLOW_HEADERS + ["Active Accounts"])
+        tabs.addTab(self.monthly_table, f"Monthly (last {MONTHS} months)")
+
+        account_tab = QWidget()
+        account_layout = QVBoxLayout(account_tab)
+        search_layout = QHBoxLayout()
+        self.account_input = QLineEdit()
+        self.account_input.setPlaceholderText("Enter Account Number")
+        self.account_input.returnPressed.connect(self.load_account)
+        search_btn = QPushButton("Show Account")
+        search_btn.setObjectName("action-btn")
+        search_btn.setIcon(QIcon.fromTheme("system-search"))
+        search_btn.clicked.connect(self.load_account)
+        search_layout.addWidget(self.account_input)
+        search_layout.addWidget(search_btn)
+        account_layout.addLayout(search_layout)
+        self.account_table = self.create_table(["Month"] + FLOW_HEADERS)
+        account_layout.addWidget(self.account_table)
+        tabs.addTab(account_tab, "Per Account")
+        main_layout.addWidget(tabs)
+
+        # Action Box
+        action_box = QWidget()
+        action_box.setObjectName("action-box")
+        action_layout = QHBoxLayout(action_box)
+
+        refresh_btn = QPushButton("🔄 Refresh")
+        refresh_btn.setObjectName("action-btn")
+        refresh_btn.setIcon(QIcon.fromTheme("view-refresh"))
+        refresh_btn.clicked.connect(self.load_analytics)
+
+        back_btn = QPushButton("← Back to Dashboard")
+        back_btn.setObjectName("action-btn")
+        back_btn.setIcon(QIcon.fromTheme("go-previous"))
+        back_btn.clicked.connect(self.go_back)
+
+        action_layout.addWidget(refresh_btn)
+        action_layout.addWidget(back_btn)
+        main_layout.addWidget(action_box)
+
+        # Footer
+        footer = QLabel("© Chirag - Bank Mate 2025")
+        footer.setObjectName("footer")
+        footer.setAlignment(Qt.AlignRight)
+        main_layout.addWidget(footer)
+
+        self.setLayout(main_layout)
+        self.load_analytics()
+
+    def create_table(self, headers):
+        table = QTableWidget()
+        table.setColumnCount(len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setAlternatingRowColors(True)
+        table.verticalHeader().setVisible(False)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        return table
+
+    def load_analytics(self):
+        try:
+            job = get_executor().submit(admin.analytics, DAYS, MONTHS,
+                                        priority=PRIORITY_BACKGROUND, key="admin-analytics")
+        except ExecutorBusyError as e:
+            QMessageBox.warning(self, "Busy", str(e))
+            return
+        if job is None:
+            return
+
+        self.loader = job
+        self.loader.succeeded.connect(self.display_analytics)
+        self.loader.failed.connect(lambda error: QMessageBox.critical(self, "Error", f"Database Error: {error}"))
+
+    def display_analytics(self, stats):
+        # Newest first, like every other admin listing
+        self.fill_table(self.daily_table, reversed(stats['daily']), "%d %b %Y")
+        self.fill_table(self.monthly_table, reversed(stats['monthly']), "%b %Y")
+        behind = stats['latest'] - stats['rolled_up_to']
+        if behind > 0:
+            self.status_label.setText(f"Rolled up to transaction {stats['rolled_up_to']} "
+                                      f"({behind:,} newer ledger rows not counted yet)")
+        else:
+            self.status_label.setText(f"Up to date (transaction {stats['rolled_up_to']})")
+
+    def load_account(self):
+        acc_no = self.account_input.text().strip()
+        if not acc_no:
+            QMessageBox.warning(self, "Input Error", "Please enter an account number")
+            return
+        try:
+            job = get_executor().submit(admin.account_analytics, acc_no, MONTHS,
+                                        priority=PRIORITY_BACKGROUND, key="admin-account-analytics")
+        except ExecutorBusyError as e:
+            QMessageBox.warning(self, "Busy", str(e))
+            return
+        if job is None:
+            return
+
+        self.account_loader = job
+        self.account_loader.succeeded.connect(lambda rows: self.display_account(acc_no, rows))
+        self.account_loader.failed.connect(
+            lambda error: QMessageBox.critical(self, "Error", f"Database Error: {error}"))
+
+    def display_account(self, acc_no, rows):
+        self.fill_table(self.account_table, reversed(rows), "%b %Y")
+        if not rows:
+            QMessageBox.information(self, "No Activity",
+                                    f"No postings on account {acc_no} in the last {MONTHS} months")
+
+    def fill_table(self, table, rows, date_format):
+        """Rows are (period, deposits_paise, deposit_count, withdrawals_paise, withdrawal_count, *extra)"""
+        rows = list(rows)
+        table.setRowCount(len(rows))
+        for row_idx, (period, deposits, deposit_count, withdrawals, withdrawal_count, *extra) in enumerate(rows):
+            net = deposits - withdrawals
+            cells = [period.strftime(date_format), format_paise(deposits), str(deposit_count),
+                     format_paise(withdrawals), str(withdrawal_count), format_paise(net)]
+            cells += [str(value) for value in extra]
+            for col_idx, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignCenter)
+                if col_idx == 5:
+                    item.setForeground(NET_IN if net >= 0 else NET_OUT)
+                table.setItem(row_idx, col_idx, item)
+
+    def go_back(self):
+        get_navigator().go("admin_dashboard", username=self.username)
@@ -1,11 +1,12 @@
 #admin_dashboard
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QLabel, QPushButton, 
                             QHBoxLayout, QMessageBox, QInputDialog, QLineEdit)
-from PyQt5.QtGui import QPixmap, QFont
+from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
-import bcrypt
-import logging
 from exception_handler import install_exception_handler
+from auth_service import auth_service
+from navigation import get_navigator
+from assets import logo_pixmap
 
 class AdminDashboard(QWidget):
     def __init__(self, username):
@@ -13,43 +14,14 @@ class AdminDashboard(QWidget):
         install_exception_handler()
         self.admin_username = username
         self.setWindowTitle(f"Admin Dashboard - {username}")
-        self.showMaximized()
         self.init_ui()
 
+    def activate(self, username):
+        self.admin_username = username
+        self.setWindowTitle(f"Admin Dashboard - {username}")
+
     def init_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #FFF1D0;
-                font-family: 'Verdana';
-            }
-            #title {
-                font-size: 28px;
-                font-weight: bold;
-                color: #2C3E50;
-                margin: 20px 0;
-            }
-            #logo {
-                margin-bottom: 20px;
-            }
-            #footer {
-                color: #555;
-                font-size: 12px;
-                font-weight: bold;
-                padding-top: 20px;
-            }
-            .feature-box {
-                background-color: white;
-                border-radius: 10px;
-                padding: 20px;
-                margin: 10px;
-                min-width: 250px;
-                border: 3px solid;
-            }
-            QLabel#feature-label {
-                font-weight: bold;
-                font-size: 16px;
-            }
-        """)
+        self.setObjectName("AdminDashboard")
 
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(50, 30, 50, 30)
@@ -58,8 +30,7 @@ class AdminDashboard(QWidget):
         # Logo
         logo = QLabel()
         logo.setObjectName("logo")
-        logo.setPixmap(QPixmap("logo.png").scaled(120, 120, 
-                    Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        logo.setPixmap(logo_pixmap(120))
         logo.setAlignment(Qt.AlignCenter)
 
         # Title
@@ -78,10 +49,14 @@ class AdminDashboard(QWidget):
         users_box = self.create_feature_box("👥 View Users", "#3498db", self.view_all_users)
         trans_box = self.create_feature_box("💳 Transactions", "#2ecc71", self.view_transactions)
         search_box = self.create_feature_box("🔍 Search User", "#9b59b6", self.search_user)
+        analytics_box = self.create_feature_box("📈 Analytics", "#e67e22", self.view_analytics)
+        insights_box = self.create_feature_box("🧮 Insights", "#16a085", self.view_insights)
 
         features_layout.addWidget(users_box)
         features_layout.addWidget(trans_box)
         features_layout.addWidget(search_box)
+        features_layout.addWidget(analytics_box)
+        features_layout.addWidget(insights_box)
 
         # Logout Button
         logout_btn = QPushButton("🚪 Logout")
@@ -142,8 +117,8 @@ class AdminDashboard(QWidget):
         
         return box
 
-    def verify_password(self):
-        """Verify admin password before sensitive actions"""
+    def verify_password(self, on_verified):
+        """Verify admin password before sensitive actions, then call on_verified"""
         password, ok = QInputDialog.getText(
             self, 
             'Admin Verification', 
@@ -152,54 +127,62 @@ class AdminDashboard(QWidget):
         )
         
         if ok and password:
-            try:
-                from db_config import get_db_connection
-                conn, cursor = get_db_connection()
-                cursor.execute(
-                    "SELECT password_hash FROM admins WHERE username = %s", 
-                    (self.admin_username,)
-                )
-                result = cursor.fetchone()
-                
-                if result and bcrypt.checkpw(password.encode(), result[0].encode()):
-                    return True
-                QMessageBox.warning(self, "Error", "Incorrect password!")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Database error: {str(e)}")
-            finally:
-                if 'conn' in locals():
-                    conn.close()
-        return False
+            self.auth_request = auth_service.verify_admin(self.admin_username, password)
+            self.auth_request.finished.connect(
+                lambda verified, message: self.handle_verification(verified, message, on_verified))
+
+    def handle_verification(self, verified, message, on_verified):
+        if verified:
+            on_verified()
+        elif message == "Invalid credentials":
+            QMessageBox.warning(self, "Error", "Incorrect password!")
+        else:
+            QMessageBox.critical(self, "Error", message)
 
     def view_all_users(self):
-        if self.verify_password():
-            try:
-                from admin_view_users import AdminViewUsersWindow
-                self.users_window = AdminViewUsersWindow(self.admin_username)
-                self.users_window.show()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to open users: {str(e)}")
+        self.verify_password(self.open_users_window)
+
+    def open_users_window(self):
+        try:
+            get_navigator().go("admin_users", username=self.admin_username)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open users: {str(e)}")
 
     def view_transactions(self):
-        if self.verify_password():
-            try:
-                from admin_view_transactions import AdminViewTransactionsWindow
-                self.trans_window = AdminViewTransactionsWindow(self.admin_username)
-                self.trans_window.show()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to open transactions: {str(e)}")
+        self.verify_password(self.open_transactions_window)
+
+    def open_transactions_window(self):
+        try:
+            get_navigator().go("admin_transactions", username=self.admin_username)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open transactions: {str(e)}")
 
     def search_user(self):
-        if self.verify_password():
-            try:
-                from admin_search_user import AdminSearchUserWindow
-                self.search_window = AdminSearchUserWindow(self.admin_username)
-                self.search_window.show()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to open search: {str(e)}")
+        self.verify_password(self.open_search_window)
+
+    def open_search_window(self):
+        try:
+            get_navigator().go("admin_search", username=self.admin_username)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open search: {str(e)}")
+
+    def view_analytics(self):
+        self.verify_password(self.open_analytics_window)
+
+    def open_analytics_window(self):
+        try:
+            get_navigator().go("admin_analytics", username=self.admin_username)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open analytics: {str(e)}")
+
+    def view_insights(self):
+        self.verify_password(self.open_insights_window)
+
+    def open_insights_window(self):
+        try:
+            get_navigator().go("admin_insights", username=self.admin_username)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open insights: {str(e)}")
 
     def logout(self):
-        from main import MainWindow
-        self.main_window = MainWindow()
-        self.main_window.show()
-        self.close()
+        get_navigator().go("main")
@@ -0,0 +1,242 @@
+# admin_insights
+import threading
+from PyQt5.QtWidgets import (QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QComboBox,
+                            QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView, QTabWidget,
+                            QProgressBar)
+from PyQt5.QtGui import QIcon, QPixmap
+from PyQt5.QtCore import Qt, QTimer
+from datetime import datetime, timedelta
+from db_executor import start_long_job
+from navigation import get_navigator
+from assets import logo_pixmap
+from bank_core import REMOTE
+from ledger_insights import build_report, InsightsCancelled, TOP_ACCOUNTS
+from money import format_paise
+
+PERIODS = [("Last 7 days", 7), ("Last 30 days", 30), ("Last 90 days", 90),
+           ("Last 365 days", 365), ("All time", None)]
+CHART_TABS = [("volume", "📊 Volume"), ("ticket", "🎫 Average Ticket"),
+              ("heatmap", "🕒 Hourly Heatmap"), ("accounts", "🏆 Top Accounts")]
+PROGRESS_INTERVAL = 250     # ms between progress updates while a run streams the ledger
+
+
+class RunCanceller:
+    """Stop flag of the analysis in progress.
+
+    A plain object, so it can still be called from the screen's destroyed
+    signal after the screen itself is gone.
+    """
+
+    def __init__(self):
+        self.event = None
+
+    def start(self):
+        """A fresh flag for a new run"""
+        self.event = threading.Event()
+        return self.event
+
+    def cancel(self, *args):
+        if self.event is not None:
+            self.event.set()
+
+    def finish(self):
+        self.event = None
+
+
+class AdminInsightsWindow(QWidget):
+    """Volume, average ticket, top accounts and an hourly heatmap over the raw ledger.
+
+    The analysis streams the ledger in chunks and draws its charts on a
+    thread of its own, so the screen stays responsive while a long period
+    is scanned and the shared DB workers stay free; leaving the screen
+    cancels the run.
+    """
+
+    def __init__(self, username):
+        super().__init__()
+        self.username = username
+        self.job = None
+        self.runs = RunCanceller()
+        # Logging out deletes the screen; a run still going has no one left to show it to
+        self.destroyed.connect(self.runs.cancel)
+        self.rows_read = 0
+        self.setWindowTitle("Ledger Insights - Bank Mate")
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(PROGRESS_INTERVAL)
+        self.progress_timer.timeout.connect(self.show_progress)
+        self.init_ui()
+
+    def activate(self, username):
+        self.username = username
+
+    def init_ui(self):
+        self.setObjectName("AdminInsightsWindow")
+
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(30, 30, 30, 20)
+        main_layout.setSpacing(15)
+
+        # Logo and Header
+        logo_label = QLabel()
+        logo_label.setPixmap(logo_pixmap(100))
+        logo_label.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(logo_label)
+
+        title = QLabel("🧮 Ledger Insights")
+        title.setObjectName("header")
+        title.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(title)
+
+        # Period picker
+        controls = QHBoxLayout()
+        self.period_box = QComboBox()
+        for label, days in PERIODS:
+            self.period_box.addItem(label, days)
+        self.period_box.setCurrentIndex(1)
+        self.analyse_btn = QPushButton("Analyse")
+        self.analyse_btn.setObjectName("action-btn")
+        self.analyse_btn.setIcon(QIcon.fromTheme("system-run"))
+        self.analyse_btn.clicked.connect(self.start_analysis)
+        controls.addWidget(self.period_box)
+        controls.addWidget(self.analyse_btn)
+        main_layout.addLayout(controls)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 0)
+        self.progress.setVisible(False)
+        main_layout.addWidget(self.progress)
+
+        self.summary_label = QLabel("Choose a period and press Analyse")
+        self.summary_label.setObjectName("summary")
+        self.summary_label.setAlignment(Qt.AlignCenter)
+        self.summary_label.setWordWrap(True)
+        main_layout.addWidget(self.summary_label)
+
+        # One tab per chart; the top accounts tab also lists them
+        tabs = QTabWidget()
+        self.chart_labels = {}
+        for name, caption in CHART_TABS:
+            chart = QLabel()
+            chart.setAlignment(Qt.AlignCenter)
+            self.chart_labels[name] = chart
+            if name == "accounts":
+                page = QWidget()
+                page_layout = QVBoxLayout(page)
+                page_layout.addWidget(chart)
+                self.accounts_table = QTableWidget()
+                self.accounts_table.setColumnCount(4)
+                self.accounts_table.setHorizontalHeaderLabels(["Account No", "Volume", "Postings", "Avg Ticket"])
+                self.accounts_table.setAlternatingRowColors(True)
+                self.accounts_table.verticalHeader().setVisible(False)
+                self.accounts_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+                self.accounts_table.setEditTriggers(QTableWidget.NoEditTriggers)
+                page_layout.addWidget(self.accounts_table)
+                tabs.addTab(page, caption)
+            else:
+                tabs.addTab(chart, caption)
+        main_layout.addWidget(tabs)
+
+        # Action Box
+        action_box = QWidget()
+        action_box.setObjectName("action-box")
+        action_layout = QHBoxLayout(action_box)
+
+        back_btn = QPushButton("← Back to Dashboard")
+        back_btn.setObjectName("action-btn")
+        back_btn.setIcon(QIcon.fromTheme("go-previous"))
+        back_btn.clicked.connect(self.go_back)
+        action_layout.addWidget(back_btn)
+        main_layout.addWidget(action_box)
+
+        # Footer
+        footer = QLabel("© Chirag - Bank Mate 2025")
+        footer.setObjectName("footer")
+        footer.setAlignment(Qt.AlignRight)
+        main_layout.addWidget(footer)
+
+        self.setLayout(main_layout)
+
+    def start_analysis(self):
+        if REMOTE:
+            QMessageBox.information(self, "Ledger Insights",
+                                    "Run ledger_insights.py on the machine that hosts the bank service.")
+            return
+        days = self.period_box.currentData()
+        start = None if days is None else datetime.now() - timedelta(days=days)
+        stop_event = self.runs.start()
+        job = start_long_job(build_report, start, None, TOP_ACCOUNTS, progress=self.record_progress,
+                             should_stop=stop_event.is_set, key=("ledger-insights",))
+        if job is None:
+            # Another Insights screen's run, cancelled but not yet stopped
+            self.runs.finish()
+            QMessageBox.information(self, "Ledger Insights", "An analysis is already running")
+            return
+
+        self.rows_read = 0
+        self.job = job
+        self.job.succeeded.connect(self.display_report)
+        self.job.failed.connect(self.handle_failed)
+        self.analyse_btn.setEnabled(False)
+        self.period_box.setEnabled(False)
+        self.progress.setVisible(True)
+        self.summary_label.setText(f"Reading the ledger ({self.period_box.currentText().lower()})…")
+        self.progress_timer.start()
+
+    def record_progress(self, rows):
+        # Called on the worker thread; the timer shows it on the GUI thread
+        self.rows_read = rows
+
+    def show_progress(self):
+        if self.rows_read:
+            self.summary_label.setText(f"Read {self.rows_read:,} ledger rows…")
+
+    def finish_run(self):
+        self.progress_timer.stop()
+        self.progress.setVisible(False)
+        self.analyse_btn.setEnabled(True)
+        self.period_box.setEnabled(True)
+        self.job = None
+        self.runs.finish()
+
+    def display_report(self, report):
+        self.finish_run()
+        insights, charts = report
+        for name, png in charts.items():
+            pixmap = QPixmap()
+            pixmap.loadFromData(png, "PNG")
+            self.chart_labels[name].setPixmap(pixmap)
+
+        totals = insights.totals()
+        self.summary_label.setText(
+            f"{insights.rows:,} postings on {totals['accounts']:,} accounts · "
+            f"deposits {format_paise(totals['deposits_paise'])} · "
+            f"withdrawals {format_paise(totals['withdrawals_paise'])} · "
+            f"average ticket {format_paise(totals['avg_ticket_paise'])} · "
+            f"analysed in {insights.elapsed:.1f}s"
+        )
+
+        top = insights.top_accounts(TOP_ACCOUNTS)
+        self.accounts_table.setRowCount(len(top))
+        for row_idx, (acc_no, row) in enumerate(top.iterrows()):
+            cells = [str(acc_no), format_paise(int(row['volume_paise'])), f"{int(row['postings']):,}",
+                     format_paise(int(row['avg_ticket_paise']))]
+            for col_idx, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignCenter)
+                self.accounts_table.setItem(row_idx, col_idx, item)
+
+    def handle_failed(self, error):
+        self.finish_run()
+        if isinstance(error, InsightsCancelled):
+            self.summary_label.setText("Analysis cancelled")
+            return
+        self.summary_label.setText("Analysis failed")
+        QMessageBox.critical(self, "Error", f"Ledger analysis failed: {error}")
+
+    def cancel(self):
+        """Stop a running analysis at its next chunk"""
+        self.runs.cancel()
+
+    def go_back(self):
+        self.cancel()
+        get_navigator().go("admin_dashboard", username=self.username)
@@ -1,11 +1,12 @@
 # admin_login.py
 from PyQt5.QtWidgets import (QWidget, QLabel, QLineEdit, QPushButton, 
                             QVBoxLayout, QMessageBox)
-from PyQt5.QtGui import QPixmap, QFont
+from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
-import bcrypt
-import logging
 from exception_handler import install_exception_handler
+from auth_service import auth_service
+from navigation import get_navigator
+from assets import logo_pixmap
 
 class AdminLoginWindow(QWidget):
     def __init__(self):
@@ -13,77 +14,14 @@ class AdminLoginWindow(QWidget):
         install_exception_handler()
         self.setWindowTitle("Admin Login - Bank Mate")
         self.resize(500, 500)
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #FFF1D0;
-                font-family: 'Verdana';
-            }
-            .login-box {
-                background-color: white;
-                border-radius: 15px;
-                padding: 40px;
-                border: 3px solid #FFB347;
-            }
-            QLabel {
-                color: #2d3436;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            QLineEdit {
-                padding: 12px;
-                border: 2px solid #74b9ff;
-                border-radius: 8px;
-                font-size: 14px;
-                min-width: 250px;
-                background: white;
-            }
-            QPushButton {
-                padding: 12px;
-                font-size: 14px;
-                min-width: 250px;
-                border-radius: 8px;
-                margin: 8px 0;
-                border: none;
-                font-weight: bold;
-            }
-            #title {
-                font-size: 24px;
-                font-weight: bold;
-                color: #2C3E50;
-                margin-bottom: 10px;
-            }
-            #logo {
-                margin-bottom: 20px;
-            }
-            #login_btn {
-                background: #3498db;
-                color: white;
-            }
-            #login_btn:hover {
-                background: #2980b9;
-            }
-            #register_btn {
-                background: #2ecc71;
-                color: white;
-            }
-            #register_btn:hover {
-                background: #27ae60;
-            }
-            #back_btn {
-                background: #636e72;
-                color: white;
-            }
-            #back_btn:hover {
-                background: #2d3436;
-            }
-            #footer {
-                color: #555;
-                font-size: 12px;
-                font-weight: bold;
-            }
-        """)
+        self.setObjectName("AdminLoginWindow")
         self.init_ui()
 
+    def activate(self):
+        self.user_input.clear()
+        self.pass_input.clear()
+        self.btn_login.setEnabled(True)
+
     def init_ui(self):
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(50, 30, 50, 30)
@@ -99,8 +37,7 @@ class AdminLoginWindow(QWidget):
         # Logo
         logo = QLabel()
         logo.setObjectName("logo")
-        logo.setPixmap(QPixmap("logo.png").scaled(100, 100, 
-                    Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        logo.setPixmap(logo_pixmap(100))
         logo.setAlignment(Qt.AlignCenter)
 
         # Title
@@ -120,9 +57,9 @@ class AdminLoginWindow(QWidget):
         self.pass_input.setEchoMode(QLineEdit.Password)
 
         # Buttons
-        btn_login = QPushButton("Login")
-        btn_login.setObjectName("login_btn")
-        btn_login.clicked.connect(self.login)
+        self.btn_login = QPushButton("Login")
+        self.btn_login.setObjectName("login_btn")
+        self.btn_login.clicked.connect(self.login)
 
         btn_register = QPushButton("Create New Admin")
         btn_register.setObjectName("register_btn")
@@ -144,7 +81,7 @@ class AdminLoginWindow(QWidget):
         box_layout.addWidget(self.user_input)
         box_layout.addWidget(lbl_pass)
         box_layout.addWidget(self.pass_input)
-        box_layout.addWidget(btn_login)
+        box_layout.addWidget(self.btn_login)
         box_layout.addWidget(btn_register)
         box_layout.addWidget(btn_back)
 
@@ -164,45 +101,32 @@ class AdminLoginWindow(QWidget):
             QMessageBox.warning(self, "Error", "Please enter both username and password")
             return
 
-        try:
-            from db_config import get_db_connection
-            conn, cursor = get_db_connection()
-            
-            cursor.execute("SELECT password_hash FROM admins WHERE username = %s", (username,))
-            result = cursor.fetchone()
-
-            if result and bcrypt.checkpw(password.encode(), result[0].encode()):
-                QMessageBox.information(self, "Success", "Login successful!")
-                from admin_dashboard import AdminDashboard
-                self.dashboard = AdminDashboard(username)
-                self.dashboard.show()
-                self.close()
-            else:
-                QMessageBox.warning(self, "Error", "Invalid credentials")
-
-        except Exception as e:
-            logging.error(f"Admin login error: {str(e)}")
-            QMessageBox.critical(self, "Error", f"Login failed: {str(e)}")
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        self.btn_login.setEnabled(False)
+        self.auth_request = auth_service.verify_admin(username, password)
+        self.auth_request.finished.connect(
+            lambda ok, message: self.handle_login(username, ok, message))
+
+    def handle_login(self, username, ok, message):
+        self.btn_login.setEnabled(True)
+        if ok:
+            QMessageBox.information(self, "Success", "Login successful!")
+            get_navigator().go("admin_dashboard", username=username)
+        else:
+            QMessageBox.warning(self, "Error", message)
 
     def open_register_admin(self):
-        from register_admin import AdminRegisterWindow
-        self.register_window = AdminRegisterWindow()
-        self.register_window.show()
-        self.close()
+        get_navigator().go("register_admin")
 
     def go_back(self):
-        from main import MainWindow
-        self.main_window = MainWindow()
-        self.main_window.show()
-        self.close()
+        get_navigator().go("main")
 
 if __name__ == "__main__":
     import sys
     from PyQt5.QtWidgets import QApplication
+    from theme import apply_theme
     app = QApplication(sys.argv)
-    window = AdminLoginWindow()
-    window.show()
+    apply_theme(app)
+    navigator = get_navigator()
+    navigator.go("admin_login")
+    navigator.show()
     sys.exit(app.exec_())
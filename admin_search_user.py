@@ -2,87 +2,28 @@
 from PyQt5.QtWidgets import (QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, 
                             QHBoxLayout, QTableWidget, QTableWidgetItem, QMessageBox, 
                             QHeaderView, QFrame)
-from PyQt5.QtGui import QFont, QPixmap, QColor, QIcon
+from PyQt5.QtGui import QFont, QColor, QIcon
 from PyQt5.QtCore import Qt
-from db_config import get_db_connection
+from async_bridge import run_async, async_bank
+from navigation import get_navigator
+from assets import logo_pixmap
+from money import format_paise, PAISE_PER_RUPEE
 
 class AdminSearchUserWindow(QWidget):
     def __init__(self, username):
         super().__init__()
         self.username = username
+        self.lookup = None
         self.setWindowTitle("Search User - Bank Mate")
-        self.showMaximized()
         self.init_ui()
 
+    def activate(self, username):
+        self.username = username
+        self.search_input.clear()
+        self.table.setRowCount(0)
+
     def init_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #FFF1D0;
-                font-family: 'Arial';
-            }
-            .header {
-                font-size: 28px;
-                font-weight: bold;
-                color: #2C3E50;
-                margin-bottom: 20px;
-            }
-            .search-box {
-                background-color: white;
-                border-radius: 10px;
-                padding: 20px;
-                margin-bottom: 20px;
-                border: 2px solid #ddd;
-            }
-            QLineEdit {
-                padding: 12px;
-                font-size: 16px;
-                border: 1px solid #ddd;
-                border-radius: 5px;
-            }
-            QTableWidget {
-                background-color: white;
-                border-radius: 10px;
-                padding: 5px;
-                border: 2px solid #ddd;
-                alternate-background-color: #f9f9f9;
-                gridline-color: #e0e0e0;
-                font-size: 18px;
-            }
-            QTableWidget::item {
-                padding: 20px;
-                border-bottom: 1px solid #e0e0e0;
-            }
-            QTableWidget::item:selected {
-                background-color: #3498db;
-                color: white;
-            }
-            QHeaderView::section {
-                background-color: #3498db;
-                color: white;
-                padding: 20px;
-                font-weight: bold;
-                border: none;
-                font-size: 18px;
-            }
-            .action-btn {
-                background-color: #f39c12;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 12px 24px;
-                font-size: 16px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            .action-btn:hover {
-                background-color: #e67e22;
-            }
-            #footer {
-                color: #7f8c8d;
-                font-size: 12px;
-                font-weight: bold;
-            }
-        """)
+        self.setObjectName("AdminSearchUserWindow")
 
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(40, 40, 40, 30)
@@ -90,8 +31,7 @@ class AdminSearchUserWindow(QWidget):
 
         # Logo and Header
         logo_label = QLabel()
-        logo_pixmap = QPixmap("logo.png")
-        logo_label.setPixmap(logo_pixmap.scaled(120, 120, Qt.KeepAspectRatio))
+        logo_label.setPixmap(logo_pixmap(120))
         logo_label.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(logo_label)
 
@@ -164,48 +104,37 @@ class AdminSearchUserWindow(QWidget):
             QMessageBox.warning(self, "Input Error", "Please enter a valid numeric account number.")
             return
 
-        conn, cursor = get_db_connection()
-        if conn:
-            try:
-                cursor.execute("SELECT account_no, name, balance FROM users WHERE account_no = %s", (account_no,))
-                record = cursor.fetchone()
+        # A newer search supersedes one still running; its query is interrupted
+        if self.lookup is not None:
+            self.lookup.cancel()
+        self.lookup = run_async(async_bank().find_user, account_no)
+        self.lookup.succeeded.connect(self.display_user)
+        self.lookup.failed.connect(lambda error: QMessageBox.critical(self, "Error", f"Database error: {str(error)}"))
+
+    def display_user(self, record):
+        if record:
+            self.table.setRowCount(1)
+            for col_idx, data in enumerate(record):
+                item = QTableWidgetItem(format_paise(data) if col_idx == 2 else str(data))
+                item.setTextAlignment(Qt.AlignCenter)
+                
+                # Set comfortable font size for items
+                font = QFont()
+                font.setPointSize(16)
+                item.setFont(font)
+                
+                # Highlight balance column
+                if col_idx == 2:  
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    if data < 0:
+                        item.setForeground(QColor('#e74c3c'))  # Red for negative
+                    elif data > 10000 * PAISE_PER_RUPEE:
+                        item.setForeground(QColor('#2ecc71'))  # Green for high balance
                 
-                if record:
-                    self.table.setRowCount(1)
-                    for col_idx, data in enumerate(record):
-                        item = QTableWidgetItem(str(data))
-                        item.setTextAlignment(Qt.AlignCenter)
-                        
-                        # Set comfortable font size for items
-                        font = QFont()
-                        font.setPointSize(16)
-                        item.setFont(font)
-                        
-                        # Highlight balance column
-                        if col_idx == 2:  
-                            item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                            try:
-                                balance = float(data)
-                                if balance < 0:
-                                    item.setForeground(QColor('#e74c3c'))  # Red for negative
-                                elif balance > 10000:
-                                    item.setForeground(QColor('#2ecc71'))  # Green for high balance
-                            except ValueError:
-                                pass
-                        
-                        self.table.setItem(0, col_idx, item)
-                else:
-                    QMessageBox.information(self, "Not Found", "No user found with that account number.")
-                    self.table.setRowCount(0)
-                    
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Database error: {str(e)}")
-            finally:
-                cursor.close()
-                conn.close()
+                self.table.setItem(0, col_idx, item)
+        else:
+            QMessageBox.information(self, "Not Found", "No user found with that account number.")
+            self.table.setRowCount(0)
 
     def go_back(self):
-        from admin_dashboard import AdminDashboard
-        self.dashboard = AdminDashboard(self.username)
-        self.dashboard.show()
-        self.close()
+        get_navigator().go("admin_dashboard", username=self.username)
@@ -1,73 +1,29 @@
 #admin_view_transactions
-from PyQt5.QtWidgets import (QWidget, QLabel, QPushButton, QVBoxLayout, 
-                            QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView)
-from PyQt5.QtGui import QFont, QPixmap, QColor
-from PyQt5.QtCore import Qt
-from db_config import get_db_connection
+from PyQt5.QtWidgets import (QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QLineEdit,
+                            QCheckBox, QDateEdit, QTableView, QHeaderView, QFileDialog, QMessageBox)
+from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, QDate
+from datetime import datetime, timedelta
+from ledger_models import LedgerTableModel
+from navigation import get_navigator
+from assets import logo_pixmap
+from db_executor import start_long_job
+from bank_core import REMOTE
+from ledger_export import export_ledger
 
 class AdminViewTransactionsWindow(QWidget):
     def __init__(self, username):
         super().__init__()
         self.username = username
         self.setWindowTitle("View Transactions - Bank Mate")
-        self.showMaximized()
         self.init_ui()
 
+    def activate(self, username):
+        self.username = username
+        self.load_transactions()
+
     def init_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #FFF1D0;
-                font-family: 'Arial';
-            }
-            .header {
-                font-size: 24px;
-                font-weight: bold;
-                color: #2C3E50;
-                margin-bottom: 20px;
-            }
-            QTableWidget {
-                background-color: white;
-                border-radius: 10px;
-                padding: 5px;
-                border: 2px solid #ddd;
-                alternate-background-color: #f9f9f9;
-                gridline-color: #e0e0e0;
-            }
-            QTableWidget::item {
-                padding: 10px;
-                border-bottom: 1px solid #e0e0e0;
-            }
-            QTableWidget::item:selected {
-                background-color: #3498db;
-                color: white;
-            }
-            QHeaderView::section {
-                background-color: #3498db;
-                color: white;
-                padding: 10px;
-                font-weight: bold;
-                border: none;
-                font-size: 14px;
-            }
-            .action-btn {
-                background-color: #f39c12;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 10px 20px;
-                font-size: 14px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            .action-btn:hover {
-                background-color: #e67e22;
-            }
-            #footer {
-                color: #7f8c8d;
-                font-size: 11px;
-                font-weight: bold;
-            }
-        """)
+        self.setObjectName("AdminViewTransactionsWindow")
 
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(30, 30, 30, 20)
@@ -75,8 +31,7 @@ class AdminViewTransactionsWindow(QWidget):
 
         # Logo and Header
         logo_label = QLabel()
-        logo_pixmap = QPixmap("logo.png")
-        logo_label.setPixmap(logo_pixmap.scaled(100, 100, Qt.KeepAspectRatio))
+        logo_label.setPixmap(logo_pixmap(100))
         logo_label.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(logo_label)
 
@@ -85,22 +40,50 @@ class AdminViewTransactionsWindow(QWidget):
         title.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(title)
 
-        # Transactions Table with unique design
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Account No", "Type", "Amount", "Timestamp"])
+        # Transactions Table - rows are paged in lazily as the admin scrolls
+        self.model = LedgerTableModel(parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.setAlternatingRowColors(True)
         self.table.verticalHeader().setVisible(False)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         main_layout.addWidget(self.table)
 
-        # Back Button
+        # Export filters: one account and/or a range of days, both optional
+        filters_layout = QHBoxLayout()
+        self.export_account = QLineEdit()
+        self.export_account.setPlaceholderText("All accounts")
+        self.export_range = QCheckBox("From")
+        self.export_from = QDateEdit(QDate.currentDate().addMonths(-1))
+        self.export_to = QDateEdit(QDate.currentDate())
+        for date_edit in (self.export_from, self.export_to):
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat("yyyy-MM-dd")
+            date_edit.setEnabled(False)
+            self.export_range.toggled.connect(date_edit.setEnabled)
+        filters_layout.addWidget(QLabel("Account:"))
+        filters_layout.addWidget(self.export_account)
+        filters_layout.addWidget(self.export_range)
+        filters_layout.addWidget(self.export_from)
+        filters_layout.addWidget(QLabel("to"))
+        filters_layout.addWidget(self.export_to)
+        main_layout.addLayout(filters_layout)
+
+        # Export and Back Buttons
+        buttons_layout = QHBoxLayout()
+        self.export_btn = QPushButton("⬇ Export Ledger")
+        self.export_btn.setObjectName("action-btn")
+        self.export_btn.clicked.connect(self.export_transactions)
+        buttons_layout.addWidget(self.export_btn)
+        buttons_layout.addStretch()
+
         back_btn = QPushButton("← Back to Dashboard")
         back_btn.setObjectName("action-btn")
         back_btn.clicked.connect(self.go_back)
-        main_layout.addWidget(back_btn, alignment=Qt.AlignRight)
+        buttons_layout.addWidget(back_btn)
+        main_layout.addLayout(buttons_layout)
 
         # Footer
         footer = QLabel("© Chirag - Bank Mate 2025")
@@ -112,43 +95,55 @@ class AdminViewTransactionsWindow(QWidget):
         self.load_transactions()
 
     def load_transactions(self):
-        conn, cursor = get_db_connection()
-        if conn:
-            try:
-                cursor.execute("SELECT account_no, type, amount, timestamp FROM transactions ORDER BY timestamp DESC")
-                records = cursor.fetchall()
-                self.table.setRowCount(len(records))
-                
-                for row_idx, row_data in enumerate(records):
-                    for col_idx, data in enumerate(row_data):
-                        item = QTableWidgetItem(str(data))
-                        item.setTextAlignment(Qt.AlignCenter)
-                        
-                        
-                        if col_idx == 1:  
-                            if "deposit" in str(data).lower():
-                                item.setForeground(QColor('#2ecc71'))  # Green for deposits
-                            elif "withdraw" in str(data).lower():
-                                item.setForeground(QColor('#e74c3c'))  # Red for withdrawals
-                            elif "transfer" in str(data).lower():
-                                item.setForeground(QColor('#3498db'))  # Blue for transfers
-                        
-                        
-                        if col_idx == 2:  # Amount column
-                            item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                        
-                        self.table.setItem(row_idx, col_idx, item)
-                
-                self.table.resizeColumnsToContents()
-                
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to load transactions: {e}")
-            finally:
-                cursor.close()
-                conn.close()
+        self.model.refresh()
+
+    def export_transactions(self):
+        if REMOTE:
+            QMessageBox.information(self, "Export",
+                                    "Run ledger_export.py on the machine that hosts the bank service.")
+            return
+        acc_no = self.export_account.text().strip() or None
+        start = end = None
+        if self.export_range.isChecked():
+            first, last = self.export_from.date().toPyDate(), self.export_to.date().toPyDate()
+            if first > last:
+                QMessageBox.warning(self, "Export", "The start date is after the end date")
+                return
+            # Whole days: the end bound is exclusive, so stop at the start of the day after
+            start = datetime.combine(first, datetime.min.time())
+            end = datetime.combine(last + timedelta(days=1), datetime.min.time())
+
+        path, _ = QFileDialog.getSaveFileName(self, "Export Ledger", "ledger.csv",
+                                              "CSV (*.csv);;Parquet (*.parquet)")
+        if not path:
+            return
+
+        # Streams on its own connection and thread, so a long export does
+        # not hold one of the shared DB workers the other screens queue on
+        job = start_long_job(export_ledger, path, start=start, end=end, acc_no=acc_no,
+                             key=("ledger-export",))
+        if job is None:
+            QMessageBox.information(self, "Export", "An export is already running")
+            return
+
+        self.export_job = job
+        self.export_job.succeeded.connect(lambda stats: self.handle_exported(path, stats))
+        self.export_job.failed.connect(self.handle_export_failed)
+        self.export_btn.setEnabled(False)
+        self.export_btn.setText("Exporting…")
+
+    def handle_exported(self, path, stats):
+        self.reset_export_button()
+        QMessageBox.information(self, "Export",
+                                f"Exported {stats['rows']:,} transactions to {path}")
+
+    def handle_export_failed(self, error):
+        self.reset_export_button()
+        QMessageBox.critical(self, "Export Failed", str(error))
+
+    def reset_export_button(self):
+        self.export_btn.setEnabled(True)
+        self.export_btn.setText("⬇ Export Ledger")
 
     def go_back(self):
-        from admin_dashboard import AdminDashboard
-        self.dashboard = AdminDashboard(self.username)
-        self.dashboard.show()
-        self.close()
+        get_navigator().go("admin_dashboard", username=self.username)
@@ -1,73 +1,27 @@
 # admin_view_users
 from PyQt5.QtWidgets import (QWidget, QLabel, QPushButton, QVBoxLayout, 
                             QTableWidget, QTableWidgetItem, QMessageBox, QHBoxLayout)
-from PyQt5.QtGui import QFont, QPixmap, QIcon
+from PyQt5.QtGui import QFont, QIcon
 from PyQt5.QtCore import Qt
-from db_config import get_db_connection
+from db_executor import get_executor, ExecutorBusyError, PRIORITY_BACKGROUND
+from navigation import get_navigator
+from assets import logo_pixmap
+from bank_core import admin
+from money import format_paise
 
 class AdminViewUsersWindow(QWidget):
     def __init__(self, username):
         super().__init__()
         self.username = username
         self.setWindowTitle("View All Users - Bank Mate")
-        self.showMaximized()
         self.init_ui()
 
+    def activate(self, username):
+        self.username = username
+        self.load_users()
+
     def init_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #FFF1D0;
-                font-family: 'Arial';
-            }
-            .header {
-                font-size: 24px;
-                font-weight: bold;
-                color: #2C3E50;
-                margin-bottom: 20px;
-            }
-            QTableWidget {
-                background-color: white;
-                border-radius: 10px;
-                padding: 10px;
-                border: 2px solid #ddd;
-            }
-            QTableWidget::item {
-                padding: 8px;
-            }
-            QHeaderView::section {
-                background-color: #3498db;
-                color: white;
-                padding: 8px;
-                font-weight: bold;
-            }
-            .action-box {
-                background-color: white;
-                border-radius: 10px;
-                padding: 15px;
-                margin: 10px 0;
-                border: 3px solid #f39c12;
-            }
-            .action-btn {
-                background-color: #f39c12;
-                color: white;
-                border: none;
-                border-radius: 5px;
-                padding: 10px 20px;
-                font-size: 14px;
-                font-weight: bold;
-            }
-            .action-btn:hover {
-                background-color: #e67e22;
-            }
-            .action-btn-icon {
-                margin-right: 8px;
-            }
-            #footer {
-                color: #7f8c8d;
-                font-size: 11px;
-                font-weight: bold;
-            }
-        """)
+        self.setObjectName("AdminViewUsersWindow")
 
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(30, 30, 30, 20)
@@ -75,8 +29,7 @@ class AdminViewUsersWindow(QWidget):
 
         # Logo and Header
         logo_label = QLabel()
-        logo_pixmap = QPixmap("logo.png")
-        logo_label.setPixmap(logo_pixmap.scaled(100, 100, Qt.KeepAspectRatio))
+        logo_label.setPixmap(logo_pixmap(100))
         logo_label.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(logo_label)
 
@@ -121,27 +74,28 @@ class AdminViewUsersWindow(QWidget):
         self.load_users()
 
     def load_users(self):
-        conn, cursor = get_db_connection()
-        if conn:
-            try:
-                cursor.execute("SELECT account_no, name, balance FROM users")
-                records = cursor.fetchall()
-                self.table.setRowCount(len(records))
-                for row_idx, row_data in enumerate(records):
-                    for col_idx, data in enumerate(row_data):
-                        item = QTableWidgetItem(str(data))
-                        item.setTextAlignment(Qt.AlignCenter)
-                        self.table.setItem(row_idx, col_idx, item)
-                self.table.resizeColumnsToContents()
-                QMessageBox.information(self, "Success", "User data refreshed successfully!")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Database Error: {e}")
-            finally:
-                cursor.close()
-                conn.close()
+        # A full listing is a refresh, so it yields to lookups tellers are waiting on
+        try:
+            job = get_executor().submit(admin.list_users, priority=PRIORITY_BACKGROUND, key="admin-users")
+        except ExecutorBusyError as e:
+            QMessageBox.warning(self, "Busy", str(e))
+            return
+        if job is None:
+            return
+
+        self.loader = job
+        self.loader.succeeded.connect(self.display_users)
+        self.loader.failed.connect(lambda error: QMessageBox.critical(self, "Error", f"Database Error: {error}"))
+
+    def display_users(self, records):
+        self.table.setRowCount(len(records))
+        for row_idx, row_data in enumerate(records):
+            for col_idx, data in enumerate(row_data):
+                item = QTableWidgetItem(format_paise(data) if col_idx == 2 else str(data))
+                item.setTextAlignment(Qt.AlignCenter)
+                self.table.setItem(row_idx, col_idx, item)
+        self.table.resizeColumnsToContents()
+        QMessageBox.information(self, "Success", "User data refreshed successfully!")
 
     def go_back(self):
-        from admin_dashboard import AdminDashboard
-        self.dashboard = AdminDashboard(self.username)
-        self.dashboard.show()
-        self.close()
+        get_navigator().go("admin_dashboard", username=self.username)
@@ -0,0 +1,71 @@
+# assets.py
+import logging
+import os
+import sys
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap
+
+# assets/ next to the sources, or inside the PyInstaller bundle
+BASE_DIR = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+ASSET_DIRS = (os.path.join(BASE_DIR, "assets"), BASE_DIR, os.getcwd())
+
+_pixmaps = {}       # (name, width, height) -> scaled QPixmap
+_sources = {}       # name -> decoded full-size QPixmap
+_stats = {'hits': 0, 'misses': 0, 'decodes': 0}
+
+
+def asset_path(name):
+    """Absolute path of an asset file, looked up in ASSET_DIRS"""
+    for directory in ASSET_DIRS:
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            return path
+    logging.warning(f"Asset not found: {name}")
+    return name
+
+
+def pixmap(name, width=None, height=None):
+    """Shared pixmap for an image scaled to width x height (aspect kept).
+
+    Each image is decoded once and each size is smooth-scaled once; screens
+    get the same implicitly shared QPixmap, so building a screen costs no
+    image work. With only width given the image is scaled to that width.
+    Call from the GUI thread only.
+    """
+    key = (name, width, height)
+    cached = _pixmaps.get(key)
+    if cached is not None:
+        _stats['hits'] += 1
+        return cached
+
+    _stats['misses'] += 1
+    source = _sources.get(name)
+    if source is None:
+        source = QPixmap(asset_path(name))
+        _sources[name] = source
+        _stats['decodes'] += 1
+
+    if source.isNull() or (width is None and height is None):
+        scaled = source
+    elif height is None:
+        scaled = source.scaledToWidth(width, Qt.SmoothTransformation)
+    else:
+        scaled = source.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    _pixmaps[key] = scaled
+    return scaled
+
+
+def logo_pixmap(size):
+    """The Bank Mate logo fitted into a size x size box"""
+    return pixmap("logo.png", size, size)
+
+
+def asset_stats():
+    stats = dict(_stats)
+    stats['cached'] = len(_pixmaps)
+    return stats
+
+
+def clear_assets():
+    _pixmaps.clear()
+    _sources.clear()
@@ -0,0 +1,115 @@
+# async_bridge.py
+import asyncio
+import logging
+import threading
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from async_db import AsyncConnectionPool, AsyncBank
+from bank_core import REMOTE, accounts, ledger, admin, ledger_writer
+from bank_core.remote import RemoteAsyncBank
+
+
+class AsyncJob(QObject):
+    """Handle for a coroutine running on the bridge loop.
+
+    Create it on the GUI thread (run_async() does) so its signals are
+    delivered there. cancel() stops the coroutine and interrupts its query.
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+    cancelled = pyqtSignal()
+
+    def __init__(self, loop):
+        super().__init__()
+        self._loop = loop
+        self._future = None
+        self._cancel_requested = False
+
+    def _start(self, coro_fn, args, kwargs):
+        if self._cancel_requested:
+            self.cancelled.emit()
+            return
+        self._future = asyncio.run_coroutine_threadsafe(coro_fn(*args, **kwargs), self._loop)
+        self._future.add_done_callback(self._done)
+
+    def cancel(self):
+        self._cancel_requested = True
+        if self._future is not None and not self._future.done():
+            self._loop.call_soon_threadsafe(self._future.cancel)
+
+    def _done(self, future):
+        # Runs on the loop thread; the signals hop to the GUI thread
+        if future.cancelled():
+            self.cancelled.emit()
+            return
+        error = future.exception()
+        if error is None:
+            self.succeeded.emit(future.result())
+        else:
+            logging.error(f"Async job failed: {str(error)}")
+            self.failed.emit(error)
+
+
+class AsyncBridge:
+    """An asyncio loop on a background thread, owning the async pool, for Qt screens.
+
+    Qt keeps the main thread's event loop, so coroutines run on this loop
+    instead and report back through AsyncJob signals.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        if REMOTE:
+            # Client mode: the terminal never opens the database itself
+            self.pool = None
+            self.bank = RemoteAsyncBank(accounts, ledger, admin)
+        else:
+            self.pool = AsyncConnectionPool()
+            self.bank = AsyncBank(self.pool, writer=ledger_writer)
+        self._thread = threading.Thread(target=self._run, name="async-db-loop", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro_fn, *args, **kwargs):
+        """Schedule coro_fn(*args, **kwargs) and return its AsyncJob"""
+        job = AsyncJob(self.loop)
+        # Start on the next turn of the Qt loop, once the caller has connected
+        QTimer.singleShot(0, lambda: job._start(coro_fn, args, kwargs))
+        return job
+
+    def shutdown(self):
+        if not self.loop.is_running():
+            return
+        if self.pool is not None:
+            asyncio.run_coroutine_threadsafe(self.pool.close(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+
+
+_bridge = None
+_bridge_lock = threading.Lock()
+
+
+def get_bridge():
+    """The shared bridge, started on first use"""
+    global _bridge
+    with _bridge_lock:
+        if _bridge is None:
+            _bridge = AsyncBridge()
+        return _bridge
+
+
+def run_async(coro_fn, *args, **kwargs):
+    return get_bridge().submit(coro_fn, *args, **kwargs)
+
+
+def async_bank():
+    """AsyncBank on the bridge loop, for run_async(async_bank().find_user, acc_no)"""
+    return get_bridge().bank
+
+
+def shutdown_bridge():
+    if _bridge is not None:
+        _bridge.shutdown()
@@ -0,0 +1,272 @@
+# async_db.py
+"""asyncio access to the bank database.
+
+    pool = AsyncConnectionPool()
+    bank = AsyncBank(pool)
+    rows = await bank.history("1001")
+    await pool.close()
+
+Neither driver has an async protocol we can use without new dependencies,
+so each pooled connection is pinned to its own worker thread: a coroutine
+awaiting a query is parked while the event loop keeps serving others, and
+the thread count is bounded by the pool size rather than by the number of
+clients. Cancelling the awaiting task interrupts the statement in flight
+(sqlite3 interrupt() / MySQL KILL QUERY), and the connection goes back to
+the pool once it has rolled back.
+"""
+import asyncio
+import functools
+import logging
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from db_config import get_backend, ensure_schema, POOL_SIZE, POOL_TIMEOUT, MAX_CONNECTION_AGE
+from bank_core import AccountService, AdminService, LedgerService
+
+
+class AsyncConnection:
+    """A DB-API connection driven from asyncio through its own thread"""
+
+    def __init__(self, backend, conn):
+        self._backend = backend
+        self.raw = conn
+        self.created_at = time.monotonic()
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="async-db")
+        self._running = None
+
+    async def call(self, fn, *args, **kwargs):
+        """await fn(conn, *args, **kwargs) on this connection's thread"""
+        loop = asyncio.get_running_loop()
+        self._running = loop.run_in_executor(
+            self._thread, functools.partial(fn, self.raw, *args, **kwargs)
+        )
+        try:
+            return await asyncio.shield(self._running)
+        except asyncio.CancelledError:
+            if not self._running.done():
+                loop.run_in_executor(None, self._interrupt)
+            raise
+
+    async def run(self, fn, *args, **kwargs):
+        """await fn(conn, cursor, *args, **kwargs) with a fresh buffered cursor"""
+        return await self.call(_with_cursor, fn, *args, **kwargs)
+
+    def _interrupt(self):
+        try:
+            self._backend.interrupt(self.raw)
+        except Exception as e:
+            logging.warning(f"Could not interrupt cancelled query: {str(e)}")
+
+    async def settle(self):
+        """Wait out a cancelled statement and leave the connection idle; False if it is unusable"""
+        if self._running is not None:
+            await asyncio.wait([self._running])
+            self._running = None
+        try:
+            return await self.call(_reset)
+        except Exception as e:
+            logging.warning(f"Discarding async connection: {str(e)}")
+            return False
+
+    async def close(self):
+        try:
+            await self.call(lambda conn: conn.close())
+        except Exception:
+            pass
+        self._thread.shutdown(wait=False)
+
+
+def _with_cursor(conn, fn, *args, **kwargs):
+    cursor = conn.cursor(buffered=True)
+    try:
+        return fn(conn, cursor, *args, **kwargs)
+    finally:
+        cursor.close()
+
+
+def _reset(conn):
+    if conn.in_transaction:
+        conn.rollback()
+    return conn.is_connected()
+
+
+class AsyncConnectionPool:
+    """Bounded pool of AsyncConnections; the asyncio counterpart of db_config.ConnectionPool"""
+
+    def __init__(self, backend=None, max_size=POOL_SIZE, timeout=POOL_TIMEOUT,
+                 max_age=MAX_CONNECTION_AGE):
+        self.backend = backend or get_backend()
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_age = max_age
+        self._idle = deque()
+        self._open = 0
+        self._cond = None
+        self._schema_checked = False
+        self._stats = {'checkouts': 0, 'waits': 0, 'wait_time': 0.0, 'created': 0,
+                       'recycled': 0, 'cancelled': 0}
+
+    async def acquire(self):
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        if not self._schema_checked:
+            await asyncio.get_running_loop().run_in_executor(None, ensure_schema)
+            self._schema_checked = True
+
+        started = time.monotonic()
+        async with self._cond:
+            if not self._idle and self._open >= self.max_size:
+                self._stats['waits'] += 1
+                try:
+                    await asyncio.wait_for(
+                        self._cond.wait_for(lambda: self._idle or self._open < self.max_size),
+                        self.timeout
+                    )
+                except asyncio.TimeoutError:
+                    raise ConnectionError("Timed out waiting for a free database connection")
+                self._stats['wait_time'] += time.monotonic() - started
+            conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                self._open += 1
+            self._stats['checkouts'] += 1
+
+        if conn is not None and time.monotonic() - conn.created_at > self.max_age:
+            self._stats['recycled'] += 1
+            await conn.close()
+            conn = None
+        if conn is None:
+            try:
+                raw = await asyncio.get_running_loop().run_in_executor(None, self.backend.connect)
+            except BaseException:
+                async with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                raise
+            conn = AsyncConnection(self.backend, raw)
+            self._stats['created'] += 1
+        return conn
+
+    async def release(self, conn, cancelled=False):
+        if cancelled:
+            self._stats['cancelled'] += 1
+        healthy = await conn.settle()
+        async with self._cond:
+            if healthy:
+                self._idle.append(conn)
+            else:
+                self._open -= 1
+            self._cond.notify()
+        if not healthy:
+            await conn.close()
+
+    @asynccontextmanager
+    async def connection(self):
+        conn = await self.acquire()
+        try:
+            yield conn
+        except asyncio.CancelledError:
+            # Settle in the background so the cancelled caller returns at once
+            asyncio.get_running_loop().create_task(self.release(conn, cancelled=True))
+            raise
+        except BaseException:
+            await self.release(conn)
+            raise
+        else:
+            await self.release(conn)
+
+    async def run(self, fn, *args, **kwargs):
+        """Borrow a connection and await fn(conn, cursor, *args, **kwargs) on it"""
+        async with self.connection() as conn:
+            return await conn.run(fn, *args, **kwargs)
+
+    def stats(self):
+        stats = dict(self._stats)
+        stats['open'] = self._open
+        stats['idle'] = len(self._idle)
+        stats['avg_wait'] = stats['wait_time'] / stats['waits'] if stats['waits'] else 0.0
+        return stats
+
+    async def close(self):
+        idle, self._idle = list(self._idle), deque()
+        self._open -= len(idle)
+        for conn in idle:
+            await conn.close()
+
+
+@contextmanager
+def _borrowed(conn, cursor):
+    yield conn, cursor
+
+
+def _service_call(conn, cursor, service_class, method, args, kwargs):
+    # A bank_core service bound to this one connection, so the async path
+    # runs exactly the SQL the threaded path does
+    service = service_class(connect=lambda: _borrowed(conn, cursor))
+    return getattr(service, method)(*args, **kwargs)
+
+
+class AsyncBank:
+    """The bank_core operations, awaitable, over an AsyncConnectionPool.
+
+    Given a LedgerWriter, deposits and withdrawals are group-committed
+    through it and awaited without holding a pooled connection.
+    """
+
+    def __init__(self, pool, writer=None):
+        self.pool = pool
+        self.writer = writer
+
+    async def _call(self, service_class, method, *args, **kwargs):
+        return await self.pool.run(_service_call, service_class, method, args, kwargs)
+
+    # Customer side
+
+    async def register_account(self, name, acc_no, pin):
+        return await self._call(AccountService, "register", name, acc_no, pin)
+
+    async def account_state(self, acc_no):
+        return await self._call(AccountService, "state", acc_no)
+
+    async def pin_hash(self, acc_no):
+        return await self._call(AccountService, "pin_hash", acc_no)
+
+    async def deposit(self, acc_no, amount, request_id=None):
+        if self.writer is not None:
+            return await asyncio.wrap_future(self.writer.submit(acc_no, "Deposit", amount, request_id))
+        return await self._call(LedgerService, "deposit", acc_no, amount, request_id)
+
+    async def withdraw(self, acc_no, amount, request_id=None):
+        if self.writer is not None:
+            return await asyncio.wrap_future(self.writer.submit(acc_no, "Withdrawal", amount, request_id))
+        return await self._call(LedgerService, "withdraw", acc_no, amount, request_id)
+
+    async def transfer(self, from_acc, to_acc, amount, request_id=None):
+        return await self._call(LedgerService, "transfer", from_acc, to_acc, amount, request_id)
+
+    async def history(self, acc_no=None, start=None, inclusive=False, limit=None):
+        kwargs = {} if limit is None else {'limit': limit}
+        return await self._call(LedgerService, "history", acc_no, start, inclusive, **kwargs)
+
+    async def balance_at(self, acc_no, when):
+        return await self._call(LedgerService, "balance_at", acc_no, when)
+
+    # Admin side
+
+    async def register_admin(self, username, password):
+        return await self._call(AdminService, "register", username, password)
+
+    async def list_users(self):
+        return await self._call(AdminService, "list_users")
+
+    async def find_user(self, acc_no):
+        return await self._call(AdminService, "find_user", acc_no)
+
+    async def analytics(self, days=31, months=12):
+        return await self._call(AdminService, "analytics", days, months)
+
+    async def account_analytics(self, acc_no, months=12):
+        return await self._call(AdminService, "account_analytics", acc_no, months)
+
+    async def password_hash(self, username):
+        return await self._call(AdminService, "password_hash", username)
@@ -0,0 +1,139 @@
+# auth_service.py
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from db_executor import get_executor, ExecutorBusyError
+from hashing import check_secret
+from login_throttle import LoginThrottle, LockedOutError
+from bank_core import accounts, admin, REMOTE
+
+# bcrypt is deliberately slow; never let it have every core
+HASH_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+MAX_PENDING_CHECKS = HASH_WORKERS * 2   # verifications queued or running at once
+
+
+class AuthRequest(QObject):
+    """Pending login; finished(ok, message) is delivered on the GUI thread"""
+    finished = pyqtSignal(bool, str)
+
+
+class AuthService:
+    """Verifies PINs and admin passwords without touching the GUI thread.
+
+    The hash lookup runs on the shared DB executor and bcrypt runs in a
+    small process pool; in client mode (bank_core.REMOTE) the service does
+    both and only the verdict comes back. Failed attempts are counted in
+    memory per identity, and the number of verifications in flight is
+    capped, so a brute-force burst is turned away instead of queueing up
+    CPU work.
+    """
+
+    def __init__(self, workers=HASH_WORKERS, max_pending=MAX_PENDING_CHECKS):
+        self.workers = workers
+        self._pool = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._throttle = LoginThrottle()
+
+    def verify_customer(self, acc_no, pin):
+        return self._verify(
+            ("user", acc_no), accounts.check_pin if REMOTE else accounts.pin_hash, acc_no, pin,
+            not_found="Account not found", mismatch="Incorrect PIN"
+        )
+
+    def verify_admin(self, username, password):
+        return self._verify(
+            ("admin", username), admin.check_password if REMOTE else admin.password_hash,
+            username, password,
+            not_found="Invalid credentials", mismatch="Invalid credentials"
+        )
+
+    def _verify(self, throttle_key, lookup, identity, secret, not_found, mismatch):
+        request = AuthRequest()
+
+        try:
+            self._throttle.check(throttle_key)
+        except LockedOutError as e:
+            return self._reject(request, str(e))
+        if not self._slots.acquire(blocking=False):
+            return self._reject(request, "Too many login attempts in progress, please wait a moment")
+
+        try:
+            if REMOTE:
+                job = get_executor().submit(lookup, identity, secret)
+            else:
+                job = get_executor().submit(lookup, identity)
+        except ExecutorBusyError as e:
+            self._slots.release()
+            return self._reject(request, str(e))
+
+        def looked_up(stored_hash):
+            # The stored hash, or in client mode the service's True/False verdict
+            if stored_hash is None:
+                self._throttle.record(throttle_key, False)
+                self._finish(request, False, not_found)
+                return
+            if REMOTE:
+                self._throttle.record(throttle_key, stored_hash)
+                self._finish(request, stored_hash, "Login successful!" if stored_hash else mismatch)
+                return
+            try:
+                future = self._hash_pool().submit(check_secret, secret, stored_hash)
+            except Exception as e:
+                lookup_failed(e)
+                return
+            future.add_done_callback(checked)
+
+        def checked(future):
+            # Runs on the pool's callback thread; the signal hops to the GUI thread
+            try:
+                ok = future.result()
+            except Exception as e:
+                logging.error(f"Password check failed: {str(e)}")
+                self._finish(request, False, f"Login failed: {str(e)}")
+                return
+            self._throttle.record(throttle_key, ok)
+            self._finish(request, ok, "Login successful!" if ok else mismatch)
+
+        def lookup_failed(error):
+            if isinstance(error, LockedOutError):
+                # The service keeps its own count across terminals
+                self._finish(request, False, str(error))
+                return
+            logging.error(f"Login lookup error: {str(error)}")
+            self._finish(request, False, f"Login failed: {str(error)}")
+
+        request.job = job
+        job.succeeded.connect(looked_up)
+        job.failed.connect(lookup_failed)
+        return request
+
+    def _finish(self, request, ok, message):
+        self._slots.release()
+        request.finished.emit(ok, message)
+
+    @staticmethod
+    def _reject(request, message):
+        # Emit after the caller has had a chance to connect
+        QTimer.singleShot(0, lambda: request.finished.emit(False, message))
+        return request
+
+    def _hash_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # spawn: a forked child would copy Qt state, the DB executor's threads and any lock they hold
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+auth_service = AuthService()
@@ -0,0 +1,46 @@
+# bank_core/__init__.py
+"""Banking operations with no Qt dependency.
+
+The screens call these services from DB executor jobs; batch jobs, load
+generators and scripts can call them directly:
+
+    from bank_core import accounts, ledger
+    ledger.deposit("1001", 500)
+
+or from asyncio code through the aio_* fronts:
+
+    await aio_ledger.withdraw("1001", 200)
+
+BANKMATE_GROUP_COMMIT=1 sends the ledger's postings through a shared
+LedgerWriter (ledger_writer) that commits them in batches.
+
+With BANKMATE_SERVICE_URL set, the singletons are bank_core.remote
+clients of a running bank_server instead, and REMOTE is True.
+"""
+from ledger import (Posting, Transfer, InsufficientFundsError, AccountNotFoundError,
+                    RequestIdConflictError)
+from bank_core.account_service import AccountService, AccountExistsError
+from bank_core.admin_service import AdminService, AdminExistsError
+from bank_core.ledger_service import LedgerService
+from bank_core.ledger_writer import LedgerWriter, GROUP_COMMIT
+from bank_core.aio import AsyncService
+from bank_core.remote import (SERVICE_URL, ServiceClient, ServiceUnavailableError,
+                              RemoteAccountService, RemoteLedgerService, RemoteAdminService)
+
+REMOTE = bool(SERVICE_URL)
+
+if REMOTE:
+    _client = ServiceClient(SERVICE_URL)
+    accounts = RemoteAccountService(_client)
+    ledger = RemoteLedgerService(_client)
+    admin = RemoteAdminService(_client)
+    ledger_writer = None
+else:
+    ledger_writer = LedgerWriter() if GROUP_COMMIT else None
+    accounts = AccountService()
+    ledger = LedgerService(writer=ledger_writer)
+    admin = AdminService()
+
+aio_accounts = AsyncService(accounts)
+aio_ledger = AsyncService(ledger)
+aio_admin = AsyncService(admin)
@@ -0,0 +1,76 @@
+# bank_core/account_service.py
+from db_config import db_connection, transaction
+from account_cache import account_cache
+from hashing import check_secret, hash_secret
+from ledger import AccountNotFoundError
+from money import Money
+
+PIN_LENGTH = 4
+
+
+class AccountExistsError(ValueError):
+    """Raised when registering an account number that is already taken"""
+
+    def __init__(self, acc_no):
+        super().__init__("Account already exists!")
+        self.acc_no = acc_no
+
+
+class AccountService:
+    """Customer accounts: registration, PIN checks and account state"""
+
+    def __init__(self, connect=db_connection, cache=account_cache):
+        self._connect = connect
+        self._cache = cache
+
+    def register(self, name, acc_no, pin):
+        """Open an account with a zero balance"""
+        name, acc_no, pin = name.strip(), acc_no.strip(), pin.strip()
+        if not name or not acc_no or not pin:
+            raise ValueError("All fields are required!")
+        if len(pin) != PIN_LENGTH or not pin.isdigit():
+            raise ValueError(f"PIN must be {PIN_LENGTH} digits!")
+
+        pin_hash = hash_secret(pin)
+        with self._connect() as (conn, cursor):
+            with transaction(conn):
+                cursor.execute("SELECT 1 FROM users WHERE account_no = %s", (acc_no,))
+                if cursor.fetchone():
+                    raise AccountExistsError(acc_no)
+                cursor.execute(
+                    "INSERT INTO users (name, account_no, pin_hash, balance_paise) VALUES (%s, %s, %s, 0)",
+                    (name, acc_no, pin_hash)
+                )
+
+    def pin_hash(self, acc_no):
+        """Stored bcrypt hash of the account's PIN, or None if there is no such account"""
+        with self._connect() as (conn, cursor):
+            cursor.execute("SELECT pin_hash FROM users WHERE account_no = %s", (acc_no,))
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def check_pin(self, acc_no, pin):
+        """None for an unknown account, else whether the PIN matches; hashes in the calling thread"""
+        stored = self.pin_hash(acc_no)
+        return None if stored is None else check_secret(pin, stored)
+
+    def verify_pin(self, acc_no, pin):
+        """True if the PIN matches; hashes in the calling thread"""
+        return bool(self.check_pin(acc_no, pin))
+
+    def state(self, acc_no):
+        """Name and balance (Money), from the account cache when it has them"""
+        cached = self._cache.get(acc_no, require=("name", "balance"))
+        if cached is not None:
+            return cached
+        with self._connect() as (conn, cursor):
+            cursor.execute("SELECT name, balance_paise FROM users WHERE account_no = %s", (acc_no,))
+            row = cursor.fetchone()
+        if row is None:
+            raise AccountNotFoundError(acc_no)
+        balance = Money(row[1])
+        self._cache.fill(acc_no, name=row[0], balance=balance)
+        return {'name': row[0], 'balance': balance}
+
+    def balance(self, acc_no):
+        return self.state(acc_no)['balance']
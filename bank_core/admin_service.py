@@ -0,0 +1,112 @@
+# bank_core/admin_service.py
+from datetime import date, timedelta
+from db_config import db_connection, transaction
+from hashing import check_secret, hash_secret
+
+
+class AdminExistsError(ValueError):
+    """Raised when registering an admin username that is already taken"""
+
+    def __init__(self, username):
+        super().__init__("Username already exists")
+        self.username = username
+
+
+class AdminService:
+    """Admin accounts and the queries behind the admin screens"""
+
+    def __init__(self, connect=db_connection):
+        self._connect = connect
+
+    def register(self, username, password):
+        if not username or not password:
+            raise ValueError("Please enter both username and password")
+        password_hash = hash_secret(password)
+        with self._connect() as (conn, cursor):
+            with transaction(conn):
+                cursor.execute("SELECT 1 FROM admins WHERE username = %s", (username,))
+                if cursor.fetchone():
+                    raise AdminExistsError(username)
+                cursor.execute(
+                    "INSERT INTO admins (username, password_hash) VALUES (%s, %s)",
+                    (username, password_hash)
+                )
+
+    def password_hash(self, username):
+        """Stored bcrypt hash of the admin's password, or None for an unknown username"""
+        with self._connect() as (conn, cursor):
+            cursor.execute("SELECT password_hash FROM admins WHERE username = %s", (username,))
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    def check_password(self, username, password):
+        """None for an unknown username, else whether the password matches"""
+        stored = self.password_hash(username)
+        return None if stored is None else check_secret(password, stored)
+
+    def verify(self, username, password):
+        """True if the password matches; hashes in the calling thread"""
+        return bool(self.check_password(username, password))
+
+    def list_users(self):
+        """Every account as (account_no, name, balance_paise)"""
+        with self._connect() as (conn, cursor):
+            cursor.execute("SELECT account_no, name, balance_paise FROM users")
+            return cursor.fetchall()
+
+    def find_user(self, acc_no):
+        """(account_no, name, balance_paise) for one account, or None"""
+        with self._connect() as (conn, cursor):
+            cursor.execute("SELECT account_no, name, balance_paise FROM users WHERE account_no = %s",
+                           (acc_no,))
+            return cursor.fetchone()
+
+    def analytics(self, days=31, months=12):
+        """Ledger totals from the rollup tables, as a dict.
+
+        'daily' rows are (day, deposits_paise, deposit_count,
+        withdrawals_paise, withdrawal_count) for the last days days;
+        'monthly' rows add active_accounts, for the last months months.
+        'rolled_up_to' is the last transaction_id the rollups include and
+        'latest' the newest in the ledger, so the screen can say how far
+        behind they are. Both reads are primary-key ranges.
+        """
+        if days < 1 or months < 1:
+            raise ValueError("days and months must be at least 1")
+        today = date.today()
+        first_day = today - timedelta(days=days - 1)
+        first_month = _months_back(today, months - 1)
+        with self._connect() as (conn, cursor):
+            cursor.execute(
+                "SELECT day, deposits_paise, deposit_count, withdrawals_paise, withdrawal_count "
+                "FROM ledger_daily WHERE day >= %s ORDER BY day", (first_day,)
+            )
+            daily = cursor.fetchall()
+            cursor.execute(
+                "SELECT month, deposits_paise, deposit_count, withdrawals_paise, withdrawal_count, "
+                "active_accounts FROM ledger_monthly WHERE month >= %s ORDER BY month", (first_month,)
+            )
+            monthly = cursor.fetchall()
+            cursor.execute("SELECT watermark FROM rollup_state WHERE name = 'ledger'")
+            rolled_up_to = cursor.fetchone()[0]
+            cursor.execute("SELECT COALESCE(MAX(transaction_id), 0) FROM transactions")
+            latest = cursor.fetchone()[0]
+        return {'daily': daily, 'monthly': monthly, 'rolled_up_to': rolled_up_to, 'latest': latest}
+
+    def account_analytics(self, acc_no, months=12):
+        """One account's (month, deposits_paise, deposit_count, withdrawals_paise, withdrawal_count) rows"""
+        if months < 1:
+            raise ValueError("months must be at least 1")
+        with self._connect() as (conn, cursor):
+            cursor.execute(
+                "SELECT month, deposits_paise, deposit_count, withdrawals_paise, withdrawal_count "
+                "FROM account_monthly WHERE account_no = %s AND month >= %s ORDER BY month",
+                (acc_no, _months_back(date.today(), months - 1))
+            )
+            return cursor.fetchall()
+
+
+def _months_back(day, months):
+    """The first of the month months before day's month"""
+    index = day.year * 12 + day.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
@@ -0,0 +1,44 @@
+# bank_core/aio.py
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from db_config import POOL_SIZE
+
+_executor = None
+
+
+def _default_executor():
+    # One thread per pooled connection: more would only queue on the pool
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=POOL_SIZE, thread_name_prefix="bank-core")
+    return _executor
+
+
+class AsyncService:
+    """asyncio front for a service: every public method becomes a coroutine.
+
+        accounts = AsyncService(AccountService())
+        state = await accounts.state("1001")
+
+    Calls run on a thread pool sized to the connection pool, so the event
+    loop never blocks on the database or on bcrypt.
+    """
+
+    def __init__(self, service, executor=None):
+        self._service = service
+        self._executor = executor
+
+    def __getattr__(self, name):
+        method = getattr(self._service, name)
+        if name.startswith("_") or not callable(method):
+            return method
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor or _default_executor(),
+                functools.partial(method, *args, **kwargs)
+            )
+        return call
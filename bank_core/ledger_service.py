@@ -0,0 +1,144 @@
+# bank_core/ledger_service.py
+from datetime import date, datetime, time, timedelta
+from db_config import db_connection
+from account_cache import account_cache
+from money import Money
+import ledger
+
+PAGE_SIZE = 200
+
+
+class LedgerService:
+    """Deposits, withdrawals and transaction history.
+
+    Given a LedgerWriter, postings are group-committed through it instead
+    of each taking its own transaction.
+    """
+
+    def __init__(self, connect=db_connection, cache=account_cache, writer=None):
+        self._connect = connect
+        self._cache = cache
+        self._writer = writer
+
+    @staticmethod
+    def _check_amount(amount):
+        """The amount as Money (rupees may be given as int, Decimal or str), if positive"""
+        amount = Money.of(amount)
+        if amount.paise <= 0:
+            raise ValueError("Amount must be positive")
+        return amount
+
+    def deposit(self, acc_no, amount, request_id=None):
+        """Credit the account; returns the Posting.
+
+        Calls repeated with the same request_id credit the account once and
+        all return that posting, so a caller unsure whether it went through
+        can simply retry.
+        """
+        amount = self._check_amount(amount)
+        ledger.check_request_id(request_id)
+        if self._writer is not None:
+            return self._writer.deposit(acc_no, amount, request_id)
+        with self._connect() as (conn, cursor):
+            posting = ledger.deposit(conn, cursor, acc_no, amount, request_id)
+        self._cache.write_balance(acc_no, posting.balance, posting.transaction_id)
+        return posting
+
+    def withdraw(self, acc_no, amount, request_id=None):
+        """Debit the account, raising InsufficientFundsError rather than overdrawing it.
+
+        request_id makes retries safe, as for deposit().
+        """
+        amount = self._check_amount(amount)
+        ledger.check_request_id(request_id)
+        if self._writer is not None:
+            return self._writer.withdraw(acc_no, amount, request_id)
+        with self._connect() as (conn, cursor):
+            posting = ledger.withdraw(conn, cursor, acc_no, amount, request_id)
+        self._cache.write_balance(acc_no, posting.balance, posting.transaction_id)
+        return posting
+
+    def transfer(self, from_acc, to_acc, amount, request_id=None):
+        """Move money between two accounts in one transaction; returns the Transfer (debit, credit).
+
+        Always its own transaction, with or without a LedgerWriter.
+        request_id makes retries safe, as for deposit().
+        """
+        amount = self._check_amount(amount)
+        ledger.check_request_id(request_id)
+        with self._connect() as (conn, cursor):
+            done = ledger.transfer(conn, cursor, from_acc, to_acc, amount, request_id)
+        for acc_no, posting in ((from_acc, done.debit), (to_acc, done.credit)):
+            self._cache.write_balance(acc_no, posting.balance, posting.transaction_id)
+        return done
+
+    def settle(self, batch):
+        """Settle a settlement.SettlementBatch of transfers, netted, in one transaction; returns its stats"""
+        import settlement
+        with self._connect() as (conn, cursor):
+            stats = settlement.settle(conn, cursor, batch)
+        for acc_no in batch.accounts:
+            self._cache.invalidate(acc_no)
+        return stats
+
+    def history(self, acc_no=None, start=None, inclusive=False, limit=PAGE_SIZE):
+        """One page of ledger rows, newest first.
+
+        Rows are (transaction_id, account_no, type, amount_paise, timestamp,
+        balance_after_paise), the last being the balance the row left.
+
+        acc_no limits the page to one account. start is the (timestamp,
+        transaction_id) key to continue from; the keyset predicate lets the
+        (timestamp, transaction_id) ordering walk an index instead of
+        counting past an OFFSET.
+        """
+        sql = ("SELECT transaction_id, account_no, type, amount_paise, timestamp, balance_after_paise "
+               "FROM transactions")
+        conditions = []
+        params = []
+        if acc_no is not None:
+            conditions.append("account_no = %s")
+            params.append(acc_no)
+        if start is not None:
+            timestamp, txn_id = start
+            op = "<=" if inclusive else "<"
+            conditions.append(f"(timestamp < %s OR (timestamp = %s AND transaction_id {op} %s))")
+            params += [timestamp, timestamp, txn_id]
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY timestamp DESC, transaction_id DESC LIMIT %s"
+        params.append(limit)
+        with self._connect() as (conn, cursor):
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def balance_at(self, acc_no, when):
+        """The account's balance (Money) as of when: a datetime, or a date for the close of that day.
+
+        That is the running balance stored on its last ledger row at or
+        before then - one seek down the (account_no, timestamp,
+        transaction_id) history index - or zero before its first posting.
+        """
+        if isinstance(when, datetime):
+            bound, op = when, "<="
+        elif isinstance(when, date):
+            bound, op = datetime.combine(when + timedelta(days=1), time.min), "<"
+        else:
+            raise TypeError("when must be a datetime or a date")
+        with self._connect() as (conn, cursor):
+            cursor.execute(
+                f"SELECT transaction_id, balance_after_paise FROM transactions "
+                f"WHERE account_no = %s AND timestamp {op} %s "
+                f"ORDER BY timestamp DESC, transaction_id DESC LIMIT 1",
+                (acc_no, bound)
+            )
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute("SELECT 1 FROM users WHERE account_no = %s", (acc_no,))
+                if cursor.fetchone() is None:
+                    raise ledger.AccountNotFoundError(acc_no)
+                return Money(0)
+            if row[1] is None:
+                raise LookupError(f"Ledger row {row[0]} has no running balance yet; "
+                                  f"run `python migrations.py --backfill-balances`")
+            return Money(row[1])
@@ -0,0 +1,264 @@
+# bank_core/remote.py
+"""Client side of bank_server: the bank_core services over HTTP.
+
+With BANKMATE_SERVICE_URL set (e.g. http://127.0.0.1:8765) the bank_core
+singletons are these classes, so every screen goes through the shared
+service instead of opening its own database connections. They raise the
+same exceptions as the local services, and nothing is cached locally:
+other terminals change balances too.
+"""
+import http.client
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime
+from urllib.parse import urlsplit, urlencode, quote
+from ledger import Posting, Transfer, InsufficientFundsError, AccountNotFoundError, RequestIdConflictError
+from money import Money
+from login_throttle import LockedOutError
+from bank_core.account_service import AccountExistsError
+from bank_core.admin_service import AdminExistsError
+from bank_core.ledger_service import PAGE_SIZE
+from bank_core.aio import AsyncService
+
+SERVICE_URL = os.environ.get('BANKMATE_SERVICE_URL', '')
+SERVICE_TIMEOUT = 15    # seconds; above the server's own pool wait
+
+
+class ServiceUnavailableError(ConnectionError):
+    """The service could not be reached, or had no database connection free"""
+
+
+def _error(payload, status):
+    """The exception a failed request stands for, from the service's error body"""
+    kind = payload.get('kind')
+    message = payload.get('error', f"HTTP {status}")
+    if kind == "insufficient_funds":
+        return InsufficientFundsError(payload['account_no'], Money(payload['balance_paise']),
+                                      Money(payload['amount_paise']))
+    if kind == "request_id_conflict":
+        return RequestIdConflictError(payload['request_id'])
+    if kind == "account_not_found":
+        return AccountNotFoundError(payload['account_no'])
+    if kind == "account_exists":
+        return AccountExistsError(payload['account_no'])
+    if kind == "admin_exists":
+        return AdminExistsError(payload['username'])
+    if kind == "locked_out":
+        return LockedOutError(payload['retry_after'])
+    if kind == "invalid":
+        return ValueError(message)
+    if kind == "unavailable":
+        return ServiceUnavailableError(message)
+    return RuntimeError(f"Bank service error: {message}")
+
+
+def _ledger_row(row):
+    txn_id, acc_no, txn_type, amount_paise, timestamp, balance_after_paise = row
+    return (txn_id, acc_no, txn_type, amount_paise, datetime.fromisoformat(timestamp), balance_after_paise)
+
+
+def _rollup_row(row):
+    return (date.fromisoformat(row[0]), *row[1:])
+
+
+class ServiceClient:
+    """JSON requests to bank_server over one keep-alive connection per thread"""
+
+    def __init__(self, url, timeout=SERVICE_TIMEOUT):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        self._local.conn = None
+        if conn is not None:
+            conn.close()
+
+    def request(self, method, path, body=None, query=None, idempotent=None):
+        if query:
+            path += "?" + urlencode({k: v for k, v in query.items() if v is not None})
+        data = None if body is None else json.dumps(body).encode('utf-8')
+        headers = {'Content-Type': 'application/json'} if data is not None else {}
+
+        # A kept-alive connection the server has since closed fails on first
+        # use; retry once on a fresh one, but only where repeating is harmless
+        if idempotent is None:
+            idempotent = method == "GET"
+        attempts = 2 if idempotent else 1
+        for attempt in range(attempts):
+            try:
+                conn = self._connection()
+                conn.request(method, path, body=data, headers=headers)
+                response = conn.getresponse()
+                payload = json.loads(response.read() or b"{}")
+                break
+            except (OSError, http.client.HTTPException) as e:
+                self._drop_connection()
+                if attempt + 1 == attempts:
+                    logging.error(f"Bank service request {method} {path} failed: {str(e)}")
+                    raise ServiceUnavailableError(f"Bank service unavailable: {str(e)}")
+
+        if response.status >= 400:
+            raise _error(payload, response.status)
+        return payload
+
+
+class RemoteAccountService:
+    """AccountService over the bank service"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def register(self, name, acc_no, pin):
+        self._client.request("POST", "/accounts",
+                             {'name': name, 'account_no': acc_no, 'pin': pin})
+
+    def check_pin(self, acc_no, pin):
+        """None for an unknown account, else whether the PIN matches; checked by the service"""
+        return self._client.request("POST", "/auth/customer",
+                                    {'account_no': acc_no, 'pin': pin})['ok']
+
+    def verify_pin(self, acc_no, pin):
+        return bool(self.check_pin(acc_no, pin))
+
+    def state(self, acc_no):
+        state = self._client.request("GET", f"/accounts/{quote(acc_no, safe='')}")
+        return {'name': state['name'], 'balance': Money(state['balance_paise'])}
+
+    def balance(self, acc_no):
+        return self.state(acc_no)['balance']
+
+
+class RemoteLedgerService:
+    """LedgerService over the bank service"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def _post(self, acc_no, operation, amount, request_id):
+        body = {'amount_paise': Money.of(amount).paise}
+        if request_id is not None:
+            body['request_id'] = request_id
+        # Sending a request id again cannot post twice, so those may be retried
+        posting = self._client.request("POST", f"/accounts/{quote(acc_no, safe='')}/{operation}",
+                                       body, idempotent=request_id is not None)
+        return Posting(posting['transaction_id'], Money(posting['balance_paise']))
+
+    def deposit(self, acc_no, amount, request_id=None):
+        return self._post(acc_no, "deposit", amount, request_id)
+
+    def withdraw(self, acc_no, amount, request_id=None):
+        return self._post(acc_no, "withdraw", amount, request_id)
+
+    def transfer(self, from_acc, to_acc, amount, request_id=None):
+        body = {'from_account': from_acc, 'to_account': to_acc, 'amount_paise': Money.of(amount).paise}
+        if request_id is not None:
+            body['request_id'] = request_id
+        done = self._client.request("POST", "/transfers", body, idempotent=request_id is not None)
+        return Transfer(*(Posting(leg['transaction_id'], Money(leg['balance_paise']))
+                          for leg in (done['debit'], done['credit'])))
+
+    def history(self, acc_no=None, start=None, inclusive=False, limit=PAGE_SIZE):
+        query = {'limit': limit}
+        if start is not None:
+            timestamp, txn_id = start
+            query.update(before=timestamp.isoformat(" "), before_id=txn_id,
+                         inclusive=int(bool(inclusive)))
+        if acc_no is None:
+            path = "/transactions"
+        else:
+            path = f"/accounts/{quote(acc_no, safe='')}/transactions"
+        return [_ledger_row(row) for row in self._client.request("GET", path, query=query)['rows']]
+
+    def balance_at(self, acc_no, when):
+        at = when.isoformat(" ") if isinstance(when, datetime) else when.isoformat()
+        balance = self._client.request("GET", f"/accounts/{quote(acc_no, safe='')}/balance", query={'at': at})
+        return Money(balance['balance_paise'])
+
+
+class RemoteAdminService:
+    """AdminService over the bank service"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def register(self, username, password):
+        self._client.request("POST", "/admins", {'username': username, 'password': password})
+
+    def check_password(self, username, password):
+        """None for an unknown username, else whether the password matches"""
+        return self._client.request("POST", "/auth/admin",
+                                    {'username': username, 'password': password})['ok']
+
+    def verify(self, username, password):
+        return bool(self.check_password(username, password))
+
+    def list_users(self):
+        return [tuple(row) for row in self._client.request("GET", "/admin/users")['users']]
+
+    def find_user(self, acc_no):
+        user = self._client.request("GET", f"/admin/users/{quote(acc_no, safe='')}")['user']
+        return None if user is None else tuple(user)
+
+    def analytics(self, days=31, months=12):
+        stats = self._client.request("GET", "/admin/analytics?" + urlencode({'days': days, 'months': months}))
+        for name in ("daily", "monthly"):
+            stats[name] = [_rollup_row(row) for row in stats[name]]
+        return stats
+
+    def account_analytics(self, acc_no, months=12):
+        rows = self._client.request(
+            "GET", f"/admin/analytics/accounts/{quote(acc_no, safe='')}?" + urlencode({'months': months})
+        )['months']
+        return [_rollup_row(row) for row in rows]
+
+
+class RemoteAsyncBank:
+    """async_db.AsyncBank's interface over the service, for async_bridge in client mode"""
+
+    def __init__(self, accounts, ledger, admin):
+        self._accounts = AsyncService(accounts)
+        self._ledger = AsyncService(ledger)
+        self._admin = AsyncService(admin)
+
+    async def account_state(self, acc_no):
+        return await self._accounts.state(acc_no)
+
+    async def deposit(self, acc_no, amount, request_id=None):
+        return await self._ledger.deposit(acc_no, amount, request_id)
+
+    async def withdraw(self, acc_no, amount, request_id=None):
+        return await self._ledger.withdraw(acc_no, amount, request_id)
+
+    async def transfer(self, from_acc, to_acc, amount, request_id=None):
+        return await self._ledger.transfer(from_acc, to_acc, amount, request_id)
+
+    async def history(self, acc_no=None, start=None, inclusive=False, limit=PAGE_SIZE):
+        return await self._ledger.history(acc_no, start, inclusive, limit)
+
+    async def balance_at(self, acc_no, when):
+        return await self._ledger.balance_at(acc_no, when)
+
+    async def list_users(self):
+        return await self._admin.list_users()
+
+    async def find_user(self, acc_no):
+        return await self._admin.find_user(acc_no)
+
+    async def analytics(self, days=31, months=12):
+        return await self._admin.analytics(days, months)
+
+    async def account_analytics(self, acc_no, months=12):
+        return await self._admin.account_analytics(acc_no, months)
@@ -0,0 +1,418 @@
+# bank_server.py
+"""Local banking service: JSON over HTTP, one shared connection pool.
+
+Every teller terminal that runs in client mode talks to this process
+instead of opening its own database connections, so the database sees
+POOL_SIZE connections however many terminals there are.
+
+    BANKMATE_DB_BACKEND=sqlite python bank_server.py [--host 127.0.0.1] [--port 8765] [--group-commit]
+    BANKMATE_SERVICE_URL=http://127.0.0.1:8765 python main.py
+
+Endpoints (request and response bodies are JSON; amounts are integer
+paise, timestamps 'YYYY-MM-DD HH:MM:SS'):
+
+    GET  /health
+    POST /accounts                          {name, account_no, pin}
+    GET  /accounts/<acc>                    -> {name, balance_paise}
+    POST /accounts/<acc>/deposit            {amount_paise, request_id?} -> {transaction_id, balance_paise}
+    POST /accounts/<acc>/withdraw           {amount_paise, request_id?} -> {transaction_id, balance_paise}
+    POST /transfers                         {from_account, to_account, amount_paise, request_id?}
+                                            -> {debit: {transaction_id, balance_paise}, credit: {...}}
+    GET  /accounts/<acc>/transactions       ?limit=&before=&before_id=&inclusive=
+    GET  /accounts/<acc>/balance            ?at=YYYY-MM-DD | timestamp -> {balance_paise}
+    GET  /transactions                      same paging, every account
+    POST /auth/customer                     {account_no, pin} -> {ok: true|false|null}, 429 when locked out
+    POST /admins                            {username, password}
+    POST /auth/admin                        {username, password} -> {ok}, 429 when locked out
+    GET  /admin/users                       -> {users: [[acc, name, balance_paise], ...]}
+    GET  /admin/users/<acc>                 -> {user: [acc, name, balance_paise] | null}
+    GET  /admin/analytics                   ?days=&months= -> {daily, monthly, rolled_up_to, latest}
+    GET  /admin/analytics/accounts/<acc>    ?months= -> {months: [[month, deposits_paise, ...], ...]}
+
+A posting sent again with the request_id of one already made is not
+applied twice: the service answers with the original posting.
+
+There is no authentication between terminal and service: it listens on
+the loopback interface by default and is meant for one branch machine.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs, unquote
+from async_db import AsyncConnectionPool, AsyncBank
+from bank_core import (InsufficientFundsError, AccountNotFoundError, AccountExistsError,
+                       AdminExistsError, RequestIdConflictError)
+from money import Money
+from bank_core.ledger_service import PAGE_SIZE
+from bank_core.ledger_writer import LedgerWriter, GROUP_COMMIT
+from hashing import check_secret
+from login_throttle import LoginThrottle, LockedOutError
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY = 64 * 1024        # bytes; every request body is a handful of fields
+MAX_PAGE = 1000             # largest history page a client may ask for
+MAX_PAISE = 2 ** 63 - 1     # largest amount the BIGINT amount_paise column holds
+IDLE_TIMEOUT = 60           # seconds a kept-alive connection may sit idle
+# bcrypt releases the GIL, so threads are enough to keep it off the event loop
+HASH_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+ROUTES = [
+    ("GET", r"/health", "health"),
+    ("POST", r"/accounts", "register_account"),
+    ("GET", r"/accounts/(?P<acc_no>[^/]+)", "account_state"),
+    ("POST", r"/accounts/(?P<acc_no>[^/]+)/deposit", "deposit"),
+    ("POST", r"/accounts/(?P<acc_no>[^/]+)/withdraw", "withdraw"),
+    ("POST", r"/transfers", "transfer"),
+    ("GET", r"/accounts/(?P<acc_no>[^/]+)/transactions", "history"),
+    ("GET", r"/accounts/(?P<acc_no>[^/]+)/balance", "balance_at"),
+    ("GET", r"/transactions", "history"),
+    ("POST", r"/auth/customer", "check_pin"),
+    ("POST", r"/admins", "register_admin"),
+    ("POST", r"/auth/admin", "check_password"),
+    ("GET", r"/admin/users", "list_users"),
+    ("GET", r"/admin/users/(?P<acc_no>[^/]+)", "find_user"),
+    ("GET", r"/admin/analytics", "analytics"),
+    ("GET", r"/admin/analytics/accounts/(?P<acc_no>[^/]+)", "account_analytics"),
+]
+ROUTES = [(method, re.compile(pattern + r"\Z"), handler) for method, pattern, handler in ROUTES]
+
+
+class HttpError(Exception):
+    """A request the service refuses; becomes a JSON error response"""
+
+    def __init__(self, status, message, kind="invalid", **details):
+        super().__init__(message)
+        self.status = status
+        self.payload = {'error': message, 'kind': kind, **details}
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat(" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def _field(body, name):
+    value = body.get(name)
+    if not isinstance(value, str):
+        raise HttpError(400, f"'{name}' is required")
+    return value
+
+
+def _amount(body):
+    paise = body.get('amount_paise')
+    if isinstance(paise, bool) or not isinstance(paise, int):
+        raise HttpError(400, "'amount_paise' must be a whole number of paise")
+    if paise > MAX_PAISE:
+        # The database would refuse it with an out-of-range error, a 500
+        raise HttpError(400, f"'amount_paise' must be at most {MAX_PAISE}")
+    return Money(paise)
+
+
+def _request_id(body):
+    request_id = body.get('request_id')
+    if request_id is not None and not isinstance(request_id, str):
+        raise HttpError(400, "'request_id' must be a string")
+    return request_id
+
+
+def _posting(posting):
+    return {'transaction_id': posting.transaction_id, 'balance_paise': posting.balance.paise}
+
+
+def _error_response(error):
+    """(status, payload) for an exception raised by a handler"""
+    if isinstance(error, HttpError):
+        return error.status, error.payload
+    if isinstance(error, InsufficientFundsError):
+        return 409, {'error': str(error), 'kind': "insufficient_funds", 'account_no': error.acc_no,
+                     'balance_paise': error.balance.paise, 'amount_paise': error.amount.paise}
+    if isinstance(error, RequestIdConflictError):
+        return 409, {'error': str(error), 'kind': "request_id_conflict", 'request_id': error.request_id}
+    if isinstance(error, AccountNotFoundError):
+        return 404, {'error': str(error), 'kind': "account_not_found", 'account_no': error.acc_no}
+    if isinstance(error, AccountExistsError):
+        return 409, {'error': str(error), 'kind': "account_exists", 'account_no': error.acc_no}
+    if isinstance(error, AdminExistsError):
+        return 409, {'error': str(error), 'kind': "admin_exists", 'username': error.username}
+    if isinstance(error, LockedOutError):
+        return 429, {'error': str(error), 'kind': "locked_out", 'retry_after': error.retry_after}
+    if isinstance(error, ValueError):
+        return 400, {'error': str(error), 'kind': "invalid"}
+    if isinstance(error, ConnectionError):
+        return 503, {'error': str(error), 'kind': "unavailable"}
+    logging.error(f"Bank service request failed: {str(error)}")
+    return 500, {'error': "Internal error", 'kind': "internal"}
+
+
+class BankServer:
+    """asyncio HTTP front for AsyncBank; one instance per branch machine"""
+
+    def __init__(self, pool=None, writer=None, hash_workers=HASH_WORKERS):
+        self.pool = pool or AsyncConnectionPool()
+        self.writer = writer
+        self.bank = AsyncBank(self.pool, writer=writer)
+        self._hashers = ThreadPoolExecutor(max_workers=hash_workers, thread_name_prefix="bank-hash")
+        # Shared by every terminal, so restarting one does not reset the count
+        self._throttle = LoginThrottle()
+        self._server = None
+        self._stats = {'connections': 0, 'requests': 0, 'errors': 0}
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        logging.info(f"Bank service listening on http://{host}:{port}")
+        return host, port
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self.writer is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.writer.close)
+            self.writer.log_stats()
+        await self.pool.close()
+        self._hashers.shutdown(wait=False)
+        logging.info(f"Bank service stats: {self.stats()}")
+
+    def stats(self):
+        stats = {**self._stats, 'pool': self.pool.stats()}
+        if self.writer is not None:
+            stats['writer'] = self.writer.stats()
+        return stats
+
+    # HTTP
+
+    async def _serve_connection(self, reader, writer):
+        self._stats['connections'] += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), IDLE_TIMEOUT)
+                except HttpError as e:
+                    await self._respond(writer, e.status, e.payload, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                status, payload = await self._dispatch(method, target, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        """(method, target, headers, body, keep_alive), or None once the client hangs up"""
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode('latin-1').split()
+        if len(parts) != 3:
+            raise HttpError(400, "Malformed request line")
+        method, target, version = parts
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode('latin-1').partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HttpError(400, "Bad Content-Length")
+        if length > MAX_BODY:
+            raise HttpError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get('connection', "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method, target, headers, body, keep_alive
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = json.dumps(payload, default=_json_default).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+    async def _dispatch(self, method, target, raw_body):
+        self._stats['requests'] += 1
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        try:
+            handler, params = self._route(method, url.path)
+            body = json.loads(raw_body) if raw_body else {}
+            if not isinstance(body, dict):
+                raise HttpError(400, "Request body must be a JSON object")
+            return 200, await handler(query=query, body=body, **params)
+        except json.JSONDecodeError:
+            self._stats['errors'] += 1
+            return 400, {'error': "Request body is not valid JSON", 'kind': "invalid"}
+        except Exception as e:
+            self._stats['errors'] += 1
+            return _error_response(e)
+
+    def _route(self, method, path):
+        allowed = False
+        for route_method, pattern, handler in ROUTES:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if route_method == method:
+                # Account numbers arrive percent-encoded, so split the path first
+                params = {name: unquote(value) for name, value in match.groupdict().items()}
+                return getattr(self, handler), params
+            allowed = True
+        if allowed:
+            raise HttpError(405, f"{method} not allowed on {unquote(path)}")
+        raise HttpError(404, f"No such endpoint: {unquote(path)}", kind="not_found")
+
+    # Endpoints
+
+    async def health(self, query, body):
+        return {'status': "ok", **self.stats()}
+
+    async def register_account(self, query, body):
+        await self.bank.register_account(_field(body, 'name'), _field(body, 'account_no'),
+                                         _field(body, 'pin'))
+        return {'registered': True}
+
+    async def account_state(self, query, body, acc_no):
+        state = await self.bank.account_state(acc_no)
+        return {'name': state['name'], 'balance_paise': state['balance'].paise}
+
+    async def deposit(self, query, body, acc_no):
+        return _posting(await self.bank.deposit(acc_no, _amount(body), _request_id(body)))
+
+    async def withdraw(self, query, body, acc_no):
+        return _posting(await self.bank.withdraw(acc_no, _amount(body), _request_id(body)))
+
+    async def transfer(self, query, body):
+        done = await self.bank.transfer(_field(body, 'from_account'), _field(body, 'to_account'),
+                                        _amount(body), _request_id(body))
+        return {'debit': _posting(done.debit), 'credit': _posting(done.credit)}
+
+    async def history(self, query, body, acc_no=None):
+        try:
+            limit = min(int(query.get('limit', PAGE_SIZE)), MAX_PAGE)
+            start = None
+            if 'before' in query:
+                start = (datetime.fromisoformat(query['before']), int(query['before_id']))
+        except (KeyError, ValueError):
+            raise HttpError(400, "Bad paging parameters")
+        if limit < 1:
+            raise HttpError(400, "'limit' must be at least 1")
+        rows = await self.bank.history(acc_no, start, query.get('inclusive') == "1", limit)
+        return {'rows': rows}
+
+    async def balance_at(self, query, body, acc_no):
+        # ?at=2025-03-31 for the close of that day, or a full timestamp
+        try:
+            at = query['at']
+            when = date.fromisoformat(at) if len(at) == 10 else datetime.fromisoformat(at)
+        except (KeyError, ValueError):
+            raise HttpError(400, "'at' must be a date or an ISO timestamp")
+        balance = await self.bank.balance_at(acc_no, when)
+        return {'balance_paise': balance.paise}
+
+    async def check_pin(self, query, body):
+        acc_no = _field(body, 'account_no')
+        return {'ok': await self._check(("user", acc_no), self.bank.pin_hash, acc_no, _field(body, 'pin'))}
+
+    async def register_admin(self, query, body):
+        await self.bank.register_admin(_field(body, 'username'), _field(body, 'password'))
+        return {'registered': True}
+
+    async def check_password(self, query, body):
+        username = _field(body, 'username')
+        return {'ok': await self._check(("admin", username), self.bank.password_hash, username,
+                                        _field(body, 'password'))}
+
+    async def _check(self, throttle_key, lookup, identity, secret):
+        """None for an unknown identity, else whether the secret matches its stored hash.
+
+        Failures count towards throttle_key's lockout; a locked-out identity
+        gets LockedOutError (429) without its hash being looked up.
+        """
+        self._throttle.check(throttle_key)
+        stored = await lookup(identity)
+        if stored is None:
+            self._throttle.record(throttle_key, False)
+            return None
+        loop = asyncio.get_running_loop()
+        ok = await loop.run_in_executor(self._hashers, check_secret, secret, stored)
+        self._throttle.record(throttle_key, ok)
+        return ok
+
+    async def list_users(self, query, body):
+        return {'users': await self.bank.list_users()}
+
+    async def find_user(self, query, body, acc_no):
+        return {'user': await self.bank.find_user(acc_no)}
+
+    async def analytics(self, query, body):
+        try:
+            days = int(query.get('days', 31))
+            months = int(query.get('months', 12))
+        except ValueError:
+            raise HttpError(400, "'days' and 'months' must be whole numbers")
+        return await self.bank.analytics(days, months)
+
+    async def account_analytics(self, query, body, acc_no):
+        try:
+            months = int(query.get('months', 12))
+        except ValueError:
+            raise HttpError(400, "'months' must be a whole number")
+        return {'months': await self.bank.account_analytics(acc_no, months)}
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, group_commit=GROUP_COMMIT):
+    server = BankServer(writer=LedgerWriter() if group_commit else None)
+    host, port = await server.start(host, port)
+    print(f"Bank service listening on http://{host}:{port} (Ctrl+C to stop)")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bank Mate local banking service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--group-commit", action="store_true", default=GROUP_COMMIT,
+                        help="batch concurrent postings into shared transactions")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.group_commit))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# benchmarks/async_clients.py
+"""Async vs threaded data access under many concurrent clients.
+
+Simulates --clients kiosk clients, each issuing --requests operations
+(balance lookups, history pages and deposits) as fast as it can, once
+with one thread per client on the blocking pool (the path the screens'
+executor uses) and once as coroutines on async_db's pool. Both paths run
+the same bank_core SQL over the same number of connections.
+
+    python -m benchmarks.async_clients [--clients 500] [--requests 20]
+
+Runs on a throwaway SQLite file unless --backend mysql is given.
+"""
+import argparse
+import asyncio
+import random
+import threading
+import time
+from benchmarks.common import (use_sqlite, remove_sqlite, seed_accounts, drop_accounts,
+                               report, percentile)
+
+# Share of each operation in a client's request mix
+MIX = [("state", 0.5), ("history", 0.3), ("deposit", 0.2)]
+
+
+def plan(clients, requests, seed=7):
+    """The same per-client operation sequence for both paths"""
+    rng = random.Random(seed)
+    names = [name for name, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    return [rng.choices(names, weights, k=requests) for _ in range(clients)]
+
+
+def run_threaded(accounts, plans):
+    from bank_core import accounts as account_service, ledger
+
+    calls = {
+        "state": account_service.state,
+        "history": lambda acc_no: ledger.history(acc_no, limit=50),
+        "deposit": lambda acc_no: ledger.deposit(acc_no, 1),
+    }
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    start_gate = threading.Event()
+
+    def client(acc_no, ops):
+        start_gate.wait()
+        mine = []
+        failed = 0
+        for op in ops:
+            started = time.perf_counter()
+            try:
+                calls[op](acc_no)
+            except Exception:
+                failed += 1
+            mine.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(acc_no, ops))
+               for acc_no, ops in zip(accounts, plans)]
+    for t in threads:
+        t.start()
+    peak_threads = threading.active_count()
+    started = time.perf_counter()
+    start_gate.set()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - started, latencies, errors[0], peak_threads
+
+
+def run_async(accounts, plans):
+    from async_db import AsyncConnectionPool, AsyncBank
+
+    async def main():
+        pool = AsyncConnectionPool()
+        bank = AsyncBank(pool)
+        calls = {
+            "state": bank.account_state,
+            "history": lambda acc_no: bank.history(acc_no, limit=50),
+            "deposit": lambda acc_no: bank.deposit(acc_no, 1),
+        }
+        latencies = []
+        errors = 0
+
+        async def client(acc_no, ops):
+            nonlocal errors
+            for op in ops:
+                started = time.perf_counter()
+                try:
+                    await calls[op](acc_no)
+                except Exception:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        # Open the pool before timing, as the threaded pool already is
+        await pool.run(lambda conn, cursor: None)
+        started = time.perf_counter()
+        await asyncio.gather(*(client(acc_no, ops) for acc_no, ops in zip(accounts, plans)))
+        elapsed = time.perf_counter() - started
+        peak_threads = threading.active_count()
+        await pool.close()
+        return elapsed, latencies, errors, peak_threads
+
+    return asyncio.run(main())
+
+
+def summarize(name, result, total):
+    elapsed, latencies, errors, threads = result
+    return [
+        (f"{name} requests/s", f"{total / elapsed:,.0f}"),
+        (f"{name} elapsed", f"{elapsed:.2f}s"),
+        (f"{name} latency p50 / p95 / p99",
+         f"{percentile(latencies, 50) * 1000:.1f} / {percentile(latencies, 95) * 1000:.1f} / "
+         f"{percentile(latencies, 99) * 1000:.1f} ms"),
+        (f"{name} errors", errors),
+        (f"{name} threads", threads),
+    ]
+
+
+def run(args):
+    from db_config import POOL_SIZE
+    accounts = seed_accounts(args.clients, 1000.0)
+    plans = plan(args.clients, args.requests)
+    total = args.clients * args.requests
+
+    threaded = run_threaded(accounts, plans)
+    async_result = run_async(accounts, plans)
+
+    report(f"{args.clients} clients x {args.requests} requests over {POOL_SIZE} connections",
+           summarize("threaded", threaded, total) + summarize("async", async_result, total))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    args = parser.parse_args()
+
+    path = use_sqlite() if args.backend == "sqlite" else None
+    try:
+        run(args)
+    finally:
+        if path:
+            remove_sqlite(path)
+        else:
+            drop_accounts()
+
+
+if __name__ == "__main__":
+    main()
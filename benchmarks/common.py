@@ -0,0 +1,79 @@
+# benchmarks/common.py
+import os
+import sys
+import tempfile
+
+
+def use_sqlite(path=None):
+    """Point db_config at a throwaway SQLite file; call before importing db_config"""
+    if path is None:
+        fd, path = tempfile.mkstemp(prefix="bankmate-bench-", suffix=".sqlite3")
+        os.close(fd)
+        os.remove(path)
+    os.environ["BANKMATE_DB_BACKEND"] = "sqlite"
+    os.environ["BANKMATE_SQLITE_PATH"] = path
+    return path
+
+
+def remove_sqlite(path):
+    for suffix in ("", "-wal", "-shm"):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def seed_accounts(count, balance, prefix="BENCH"):
+    """Create benchmark accounts holding balance (Money or rupees) and return their account numbers"""
+    from db_config import db_connection, transaction
+    from money import to_paise
+    accounts = [f"{prefix}{i:06d}" for i in range(count)]
+    paise = to_paise(balance)
+    with db_connection() as (conn, cursor):
+        with transaction(conn):
+            cursor.executemany(
+                "INSERT INTO users (account_no, name, pin_hash, balance_paise) VALUES (%s, %s, %s, %s)",
+                [(acc, "Benchmark", "-", paise) for acc in accounts]
+            )
+    return accounts
+
+
+def drop_accounts(prefix="BENCH"):
+    """Remove benchmark accounts and their ledger rows"""
+    from db_config import db_connection, transaction
+    with db_connection() as (conn, cursor):
+        with transaction(conn):
+            cursor.execute("DELETE FROM transactions WHERE account_no LIKE %s", (prefix + "%",))
+            cursor.execute("DELETE FROM users WHERE account_no LIKE %s", (prefix + "%",))
+
+
+def report(title, rows):
+    """Print aligned name/value rows"""
+    print(f"\n{title}")
+    print("-" * len(title))
+    width = max(len(name) for name, _ in rows)
+    for name, value in rows:
+        print(f"  {name:<{width}}  {value}")
+
+
+def rss_mb():
+    """Resident memory of this process in MB (peak RSS where current is unavailable)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+        except ImportError:     # Windows
+            return float("nan")
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, KB elsewhere
+        return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
@@ -0,0 +1,142 @@
+# benchmarks/group_commit.py
+"""Salary-day deposit burst: one transaction per posting vs group commit.
+
+Many threads post deposits (and a share of withdrawals) to a pool of
+accounts as fast as they can, once through ledger.py's one-transaction-
+per-posting path and once through a LedgerWriter, then checks that every
+balance still equals its ledger.
+
+    python -m benchmarks.group_commit [--threads 64] [--postings 20000]
+                                      [--max-batch 200] [--max-delay-ms 5]
+
+Runs on a throwaway SQLite file unless --backend mysql is given.
+"""
+import argparse
+import random
+import threading
+import time
+from money import Money
+from benchmarks.common import (use_sqlite, remove_sqlite, seed_accounts, drop_accounts,
+                               report, percentile)
+
+
+def burst(post, accounts, threads, postings, withdraw_share):
+    """Run the burst; (elapsed, latencies, declined, errors)"""
+    per_thread = postings // threads
+    latencies = []
+    counts = {'declined': 0, 'errors': 0}
+    lock = threading.Lock()
+    gate = threading.Event()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        mine = []
+        declined = errors = 0
+        gate.wait()
+        for _ in range(per_thread):
+            acc_no = rng.choice(accounts)
+            txn_type = "Withdrawal" if rng.random() < withdraw_share else "Deposit"
+            started = time.perf_counter()
+            try:
+                post(acc_no, txn_type, Money(rng.randint(1, 50000)))
+            except ValueError:
+                declined += 1
+            except Exception:
+                errors += 1
+            mine.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(mine)
+            counts['declined'] += declined
+            counts['errors'] += errors
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    started = time.perf_counter()
+    gate.set()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - started, latencies, counts['declined'], counts['errors']
+
+
+def ledger_mismatches(accounts, opening):
+    """Accounts whose balance differs from opening balance plus their ledger"""
+    from db_config import db_connection
+    marks = ", ".join(["%s"] * len(accounts))
+    with db_connection() as (conn, cursor):
+        cursor.execute(f"SELECT account_no, balance_paise FROM users WHERE account_no IN ({marks})",
+                       accounts)
+        balances = dict(cursor.fetchall())
+        cursor.execute(
+            f"SELECT account_no, SUM(CASE WHEN type = 'Deposit' THEN amount_paise ELSE -amount_paise END) "
+            f"FROM transactions WHERE account_no IN ({marks}) GROUP BY account_no",
+            accounts
+        )
+        net = dict(cursor.fetchall())
+    return sum(1 for acc_no in accounts if balances[acc_no] != opening.paise + net.get(acc_no, 0))
+
+
+def run(args):
+    from db_config import db_connection
+    from bank_core.ledger_writer import LedgerWriter
+    import ledger
+
+    def direct(acc_no, txn_type, amount):
+        post = ledger.deposit if txn_type == "Deposit" else ledger.withdraw
+        with db_connection() as (conn, cursor):
+            return post(conn, cursor, acc_no, amount)
+
+    writer = LedgerWriter(max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000)
+
+    def grouped(acc_no, txn_type, amount):
+        return writer.submit(acc_no, txn_type, amount).result()
+
+    rows = []
+    for name, post in (("per-posting", direct), ("group commit", grouped)):
+        # Same opening balances for both passes
+        drop_accounts()
+        accounts = seed_accounts(args.accounts, args.balance)
+        elapsed, latencies, declined, errors = burst(post, accounts, args.threads, args.postings,
+                                                     args.withdraw_share)
+        done = len(latencies)
+        rows += [
+            (f"{name} postings/s", f"{done / elapsed:,.0f}"),
+            (f"{name} latency p50 / p95", f"{percentile(latencies, 50) * 1000:.1f} / "
+                                          f"{percentile(latencies, 95) * 1000:.1f} ms"),
+            (f"{name} declined / errors", f"{declined} / {errors}"),
+            (f"{name} balances off ledger", ledger_mismatches(accounts, args.balance)),
+        ]
+    writer.close()
+    stats = writer.stats()
+    rows += [
+        ("writer batches", stats['batches']),
+        ("writer avg / max batch", f"{stats['avg_batch']:.1f} / {stats['max_batch']}"),
+    ]
+    report(f"{args.postings} postings from {args.threads} threads over {args.accounts} accounts "
+           f"(batch <= {args.max_batch}, wait <= {args.max_delay_ms}ms)", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--postings", type=int, default=20000)
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--balance", type=Money.parse, default="1000")
+    parser.add_argument("--withdraw-share", type=float, default=0.2)
+    parser.add_argument("--max-batch", type=int, default=200)
+    parser.add_argument("--max-delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    path = use_sqlite() if args.backend == "sqlite" else None
+    try:
+        run(args)
+    finally:
+        if path:
+            remove_sqlite(path)
+        else:
+            drop_accounts()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/insights.py
+"""Ledger insights over a large ledger, and how long they stall the GUI thread.
+
+Seeds a ledger spread over a year, then runs the Insights screen's job
+(ledger_insights.build_report) on a worker thread while the main thread
+ticks every TICK seconds, as the Qt event loop would. Reports the run
+time, memory, and the longest gap between ticks: the longest the screen
+would have stopped repainting.
+
+    python -m benchmarks.insights [--accounts 100000] [--rows 10000000] [--chunk-size 50000]
+
+Runs on a throwaway SQLite file unless --backend mysql is given.
+"""
+import argparse
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from benchmarks.common import (use_sqlite, remove_sqlite, seed_accounts, drop_accounts, report,
+                               rss_mb, percentile)
+
+SEED_CHUNK = 50000
+TICK = 0.01     # seconds between main-thread ticks
+
+
+def seed_ledger(accounts, rows, max_paise, seed=17):
+    """Random ledger rows for the accounts over the last year"""
+    from db_config import db_connection, transaction
+    rng = random.Random(seed)
+    start = datetime.now().replace(microsecond=0) - timedelta(days=365)
+    with db_connection() as (conn, cursor):
+        for first in range(0, rows, SEED_CHUNK):
+            count = min(SEED_CHUNK, rows - first)
+            batch = [(rng.choice(accounts), "Deposit" if rng.random() < 0.6 else "Withdrawal",
+                      rng.randint(1, max_paise), start + timedelta(seconds=rng.randrange(365 * 86400)))
+                     for _ in range(count)]
+            with transaction(conn):
+                cursor.executemany(
+                    "INSERT INTO transactions (account_no, type, amount_paise, timestamp) VALUES (%s, %s, %s, %s)",
+                    batch
+                )
+
+
+def run(args):
+    from ledger_insights import build_report
+
+    started = time.perf_counter()
+    accounts = seed_accounts(args.accounts, 0)
+    seed_ledger(accounts, args.rows, args.max_paise)
+    seed_time = time.perf_counter() - started
+
+    result = {}
+
+    def job():
+        try:
+            result['report'] = build_report(chunk_size=args.chunk_size)
+        except Exception as e:
+            result['error'] = e
+
+    rss_before = rss_mb()
+    worker = threading.Thread(target=job)
+    worker.start()
+    gaps = []
+    last = time.perf_counter()
+    while worker.is_alive():
+        time.sleep(TICK)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+    worker.join()
+    if 'error' in result:
+        raise result['error']
+    insights, charts = result['report']
+    rss_after = rss_mb()
+    total = time.perf_counter() - started - seed_time
+    ok = insights.rows == args.rows
+
+    report(f"Ledger insights over {args.rows:,} ledger rows and {args.accounts:,} accounts "
+           f"({args.chunk_size:,}-row chunks)", [
+        ("seeding", f"{seed_time:.1f}s"),
+        ("analysis", f"{insights.elapsed:.1f}s ({insights.rows / insights.elapsed:,.0f} rows/s)"),
+        ("analysis + charts", f"{total:.1f}s"),
+        ("memory", f"{rss_before:.0f} MB -> {rss_after:.0f} MB"),
+        ("main-thread gap p50 / p99 / max",
+         f"{percentile(gaps, 50) * 1000:.0f} / {percentile(gaps, 99) * 1000:.0f} / {max(gaps) * 1000:.0f} ms"),
+        ("rows analysed match the ledger", ok),
+    ])
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--accounts", type=int, default=100000)
+    parser.add_argument("--rows", type=int, default=10000000, help="ledger rows to seed")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="ledger rows per chunk")
+    parser.add_argument("--max-paise", type=int, default=50000)
+    args = parser.parse_args()
+
+    path = use_sqlite() if args.backend == "sqlite" else None
+    try:
+        ok = run(args)
+    finally:
+        if path:
+            remove_sqlite(path)
+        else:
+            drop_accounts()
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# benchmarks/navigation.py
+"""Screen-switch benchmark.
+
+Walks a teller's day through the screens - customer dashboard, deposit,
+withdraw, history, logout, admin screens - and reports switch latency and
+resident memory over the run.
+
+    python -m benchmarks.navigation [--navigations 1000] [--warmup-laps 5] [--pixmap-cache-kb 1024] [--legacy]
+
+The live widget count is the leak check: released screens are deleted,
+so it is the same after the run as after warm-up. RSS still climbs about
+9 MB over the first 1,500 or so switches while Qt's QPixmapCache, which
+the style renders into and which is capped at 10 MB by default, fills;
+--pixmap-cache-kb lowers the cap to take it out of the picture. After
+that it creeps by about 0.2 MB per 1,000 switches: Qt-internal heap left
+behind when a logout's screens are rebuilt (QDateEdit's calendar popup
+leaves the most, about 2 KB). The second-half row shows that rate once
+the run is long enough (--navigations 4000).
+
+--legacy rebuilds a fresh window for every switch and keeps the old
+window referenced from the new one, as the screens did before the
+navigation controller. Runs headless (QT_QPA_PLATFORM=offscreen) against
+a throwaway SQLite file.
+"""
+import argparse
+import gc
+import os
+import time
+from benchmarks.common import use_sqlite, remove_sqlite, seed_accounts, report, rss_mb, percentile
+
+ACCOUNT = "BENCH000000"
+
+# One shift's loop of screens; admin_users is left out because it confirms
+# every refresh with a modal message box
+CIRCUIT = [
+    ("main", {}),
+    ("login", {}),
+    ("user_dashboard", {"account_no": ACCOUNT}),
+    ("deposit", {"account_no": ACCOUNT}),
+    ("user_dashboard", {"account_no": ACCOUNT}),
+    ("withdraw", {"account_no": ACCOUNT}),
+    ("user_dashboard", {"account_no": ACCOUNT}),
+    ("history", {"account_no": ACCOUNT}),
+    ("user_dashboard", {"account_no": ACCOUNT}),
+    ("main", {}),
+    ("admin_login", {}),
+    ("admin_dashboard", {"username": "bench"}),
+    ("admin_transactions", {"username": "bench"}),
+    ("admin_dashboard", {"username": "bench"}),
+    ("admin_search", {"username": "bench"}),
+    ("admin_dashboard", {"username": "bench"}),
+]
+
+
+class LegacyNavigator:
+    """The pre-controller behaviour: a new maximized window per switch"""
+
+    def __init__(self):
+        from importlib import import_module
+        from navigation import SCREENS
+        self._import = import_module
+        self.screens = SCREENS
+        self.current = None
+
+    def go(self, name, **params):
+        module, class_name, _ = self.screens[name]
+        window = getattr(self._import(module), class_name)(**params)
+        window.showMaximized()
+        if self.current is not None:
+            # Old screens kept the new window as self.dashboard etc.
+            self.current.next_window = window
+            window.previous_window = self.current
+            self.current.close()
+        self.current = window
+        return window
+
+
+def run(args):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtCore import QCoreApplication, QEvent
+    from theme import apply_theme
+    from PyQt5.QtGui import QPixmapCache
+    app = QApplication.instance() or QApplication([])
+    apply_theme(app)
+    if args.pixmap_cache_kb is not None:
+        QPixmapCache.setCacheLimit(args.pixmap_cache_kb)
+
+    seed_accounts(1, 10000.0)
+    if args.legacy:
+        navigator = LegacyNavigator()
+    else:
+        from navigation import get_navigator
+        navigator = get_navigator()
+        navigator.showMaximized()
+
+    def settle():
+        app.processEvents()
+        # processEvents() never runs DeferredDelete, so without this the
+        # screens a logout releases with deleteLater() would pile up
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    def switch(name, params):
+        started = time.perf_counter()
+        navigator.go(name, **params)
+        settle()
+        return time.perf_counter() - started
+
+    rss_start = rss_mb()
+    # Build every screen, and rebuild the session ones, before measuring steady state
+    for _ in range(args.warmup_laps):
+        for name, params in CIRCUIT:
+            switch(name, params)
+    gc.collect()
+    rss_warm = rss_mb()
+    widgets_warm = len(app.allWidgets())
+
+    latencies = []
+    samples = []
+    half = args.navigations // 2
+    for i in range(args.navigations):
+        name, params = CIRCUIT[i % len(CIRCUIT)]
+        latencies.append(switch(name, params))
+        if (i + 1) % (args.navigations // 10 or 1) == 0:
+            samples.append(f"{rss_mb():.0f}")
+        if i + 1 == half:
+            gc.collect()
+            rss_half = rss_mb()
+    gc.collect()
+    settle()
+    rss_end = rss_mb()
+    widgets_end = len(app.allWidgets())
+    second_half = args.navigations - half
+
+    rows = [
+        ("navigations", args.navigations),
+        ("switch p50", f"{percentile(latencies, 50) * 1000:.2f}ms"),
+        ("switch p95", f"{percentile(latencies, 95) * 1000:.2f}ms"),
+        ("switch max", f"{max(latencies) * 1000:.2f}ms"),
+        ("RSS at start", f"{rss_start:.1f} MB"),
+        (f"RSS after {args.warmup_laps} warm-up laps", f"{rss_warm:.1f} MB"),
+        ("RSS at end", f"{rss_end:.1f} MB"),
+        ("RSS growth after warm-up", f"{rss_end - rss_warm:+.1f} MB"),
+        ("RSS growth per 1,000 switches, second half",
+         f"{(rss_end - rss_half) * 1000 / max(1, second_half):+.2f} MB"),
+        ("RSS every 10%", " ".join(samples)),
+        ("live widgets after warm-up / at end", f"{widgets_warm} / {widgets_end}"),
+        ("Qt pixmap cache limit", f"{QPixmapCache.cacheLimit():,} KB"),
+    ]
+    if not args.legacy:
+        stats = navigator.stats()
+        rows += [
+            ("screens built", stats['created']),
+            ("screens reused", stats['reused']),
+            ("screens released", stats['released']),
+        ]
+    report(f"Navigation ({'legacy new window per switch' if args.legacy else 'stacked, reused screens'})",
+           rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--navigations", type=int, default=1000)
+    parser.add_argument("--warmup-laps", type=int, default=5, help="laps of the circuit before measuring")
+    parser.add_argument("--pixmap-cache-kb", type=int, help="cap Qt's pixmap cache (default 10240)")
+    parser.add_argument("--legacy", action="store_true", help="build a new window for every switch")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    path = use_sqlite()
+    try:
+        run(args)
+    finally:
+        remove_sqlite(path)
+
+
+if __name__ == "__main__":
+    main()
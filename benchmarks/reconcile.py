@@ -0,0 +1,113 @@
+# benchmarks/reconcile.py
+"""Balance reconciliation over a large ledger.
+
+Seeds accounts with a ledger of random deposits and withdrawals, knocks a
+few balances out of step with their ledger, then times a full
+reconciliation and an incremental one after some more activity. Checks
+that each run finds exactly the accounts that were broken.
+
+    python -m benchmarks.reconcile [--accounts 100000] [--rows 5000000] [--workers 8] [--drift 25]
+
+Runs on a throwaway SQLite file unless --backend mysql is given.
+"""
+import argparse
+import random
+import time
+from money import Money
+from benchmarks.common import use_sqlite, remove_sqlite, seed_accounts, drop_accounts, report
+
+SEED_CHUNK = 50000
+
+
+def seed_ledger(accounts, rows, max_paise, seed=11):
+    """Random ledger rows for the accounts, then balances set to match"""
+    from db_config import db_connection, transaction
+    rng = random.Random(seed)
+    with db_connection() as (conn, cursor):
+        for start in range(0, rows, SEED_CHUNK):
+            count = min(SEED_CHUNK, rows - start)
+            batch = [(rng.choice(accounts), "Deposit" if rng.random() < 0.6 else "Withdrawal",
+                      rng.randint(1, max_paise)) for _ in range(count)]
+            with transaction(conn):
+                cursor.executemany(
+                    "INSERT INTO transactions (account_no, type, amount_paise) VALUES (%s, %s, %s)", batch
+                )
+        with transaction(conn):
+            cursor.execute(
+                "UPDATE users SET balance_paise = (SELECT COALESCE(SUM(CASE WHEN type = 'Deposit' "
+                "THEN amount_paise ELSE -amount_paise END), 0) FROM transactions t "
+                "WHERE t.account_no = users.account_no) WHERE account_no LIKE 'BENCH%'"
+            )
+
+
+def drift(accounts, count, rng):
+    """Move some balances without a ledger row, as a half-finished posting would"""
+    from db_config import db_connection
+    broken = sorted(rng.sample(accounts, count))
+    with db_connection() as (conn, cursor):
+        cursor.executemany("UPDATE users SET balance_paise = balance_paise + %s WHERE account_no = %s",
+                           [(rng.randint(1, 10000), acc_no) for acc_no in broken])
+    return broken
+
+
+def run(args):
+    from db_config import db_connection
+    import ledger
+    from reconcile import reconcile
+
+    rng = random.Random(3)
+    started = time.perf_counter()
+    accounts = seed_accounts(args.accounts, 0)
+    seed_ledger(accounts, args.rows, args.max_amount.paise)
+    seed_time = time.perf_counter() - started
+    broken = drift(accounts, args.drift, rng)
+
+    full, found = reconcile(workers=args.workers)
+    full_ok = [row[0] for row in found] == broken
+
+    # More activity: ordinary postings, plus fresh drift on accounts they did not touch
+    with db_connection() as (conn, cursor):
+        for _ in range(args.postings):
+            ledger.deposit(conn, cursor, rng.choice(accounts), Money(rng.randint(1, args.max_amount.paise)))
+    broken_again = drift(accounts, args.drift, rng)
+    incremental, found_again = reconcile(incremental=True, workers=args.workers)
+    expected = sorted(set(broken) | set(broken_again))
+    incremental_ok = [row[0] for row in found_again] == expected
+
+    report(f"Reconciliation of {args.rows:,} ledger rows over {args.accounts:,} accounts "
+           f"({args.workers} workers)", [
+        ("seeding", f"{seed_time:.1f}s"),
+        ("full run", f"{full['elapsed']:.2f}s ({full['ledger_rows'] / full['check_time']:,.0f} rows/s checked, "
+                     f"{full['jobs']} ranges)"),
+        ("full: out of balance", f"{full['discrepancies']} (expected {len(broken)})"),
+        ("incremental run", f"{incremental['elapsed']:.2f}s over {incremental['accounts']:,} accounts"),
+        ("incremental: out of balance", f"{incremental['discrepancies']} (expected {len(expected)})"),
+        ("found exactly the broken accounts", full_ok and incremental_ok),
+    ])
+    return full_ok and incremental_ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--accounts", type=int, default=100000)
+    parser.add_argument("--rows", type=int, default=5000000, help="ledger rows to seed")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--drift", type=int, default=25, help="balances to knock out of step, per round")
+    parser.add_argument("--postings", type=int, default=2000, help="deposits between the two runs")
+    parser.add_argument("--max-amount", type=Money.parse, default="500")
+    args = parser.parse_args()
+
+    path = use_sqlite() if args.backend == "sqlite" else None
+    try:
+        ok = run(args)
+    finally:
+        if path:
+            remove_sqlite(path)
+        else:
+            drop_accounts()
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/screen_build.py
+"""Screen construction benchmark.
+
+Builds and shows each screen repeatedly and reports the average time per
+build, once the way the screens now work (application theme, shared
+pixmap cache) and once the old way: the screen's stylesheet set on the
+widget itself and the logo decoded and scaled again for every build.
+
+    python -m benchmarks.screen_build [--builds 50]
+
+Runs headless (QT_QPA_PLATFORM=offscreen) against a throwaway SQLite file.
+"""
+import argparse
+import os
+import time
+from importlib import import_module
+from benchmarks.common import use_sqlite, remove_sqlite, seed_accounts, report
+
+ACCOUNT = "BENCH000000"
+
+# admin_users is left out: it confirms every load with a modal message box
+SCREENS = [
+    ("main", {}),
+    ("login", {}),
+    ("register", {}),
+    ("admin_login", {}),
+    ("register_admin", {}),
+    ("user_dashboard", {"account_no": ACCOUNT}),
+    ("deposit", {"account_no": ACCOUNT}),
+    ("withdraw", {"account_no": ACCOUNT}),
+    ("history", {"account_no": ACCOUNT}),
+    ("admin_dashboard", {"username": "bench"}),
+    ("admin_transactions", {"username": "bench"}),
+    ("admin_search", {"username": "bench"}),
+]
+
+
+def build_times(app, builds, legacy):
+    import assets
+    from navigation import SCREENS as SCREEN_TABLE
+    from theme import BASE_STYLE, SCREEN_STYLES, STYLESHEET
+
+    app.setStyleSheet("" if legacy else STYLESHEET)
+    times = {}
+    for name, params in SCREENS:
+        module, class_name, _ = SCREEN_TABLE[name]
+        screen_class = getattr(import_module(module), class_name)
+        elapsed = 0.0
+        for _ in range(builds):
+            if legacy:
+                assets.clear_assets()
+            started = time.perf_counter()
+            screen = screen_class(**params)
+            if legacy:
+                screen.setStyleSheet(BASE_STYLE + SCREEN_STYLES[class_name])
+            screen.show()
+            app.processEvents()
+            elapsed += time.perf_counter() - started
+            screen.close()
+            screen.deleteLater()
+            app.processEvents()
+        times[name] = elapsed / builds
+    return times
+
+
+def run(args):
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+    seed_accounts(1, 10000.0)
+
+    # Warm imports and fonts so neither pass pays for them
+    build_times(app, 1, legacy=False)
+    legacy = build_times(app, args.builds, legacy=True)
+    themed = build_times(app, args.builds, legacy=False)
+
+    rows = []
+    for name, _ in SCREENS:
+        before, after = legacy[name], themed[name]
+        rows.append((name, f"{before * 1000:7.2f}ms -> {after * 1000:7.2f}ms "
+                           f"({(1 - after / before) * 100 if before else 0:+.0f}% faster)"))
+    total_before = sum(legacy.values())
+    total_after = sum(themed.values())
+    rows.append(("all screens", f"{total_before * 1000:7.2f}ms -> {total_after * 1000:7.2f}ms "
+                                f"({(1 - total_after / total_before) * 100:+.0f}% faster)"))
+    report(f"Screen build + show, average of {args.builds} (per-screen stylesheet -> app theme)", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--builds", type=int, default=50, help="builds per screen")
+    args = parser.parse_args()
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    path = use_sqlite()
+    try:
+        run(args)
+    finally:
+        remove_sqlite(path)
+
+
+if __name__ == "__main__":
+    main()
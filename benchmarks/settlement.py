@@ -0,0 +1,103 @@
+# benchmarks/settlement.py
+"""Netting settlement at merchant volume.
+
+Builds a batch of small transfers between a pool of merchant accounts,
+settles it in one netted transaction and reports where the time went,
+how much memory the batch took and whether money was conserved. A sample
+of the same traffic is also posted transfer by transfer for comparison.
+
+    python -m benchmarks.settlement [--instructions 1000000] [--accounts 200] [--compare 5000]
+
+Runs on a throwaway SQLite file unless --backend mysql is given.
+"""
+import argparse
+import random
+import time
+from money import Money
+from benchmarks.common import (use_sqlite, remove_sqlite, seed_accounts, drop_accounts,
+                               report, rss_mb)
+
+
+def build_batch(accounts, count, max_paise, seed=7):
+    from settlement import SettlementBatch
+    rng = random.Random(seed)
+    batch = SettlementBatch()
+    for _ in range(count):
+        from_acc, to_acc = rng.sample(accounts, 2)
+        batch.add(from_acc, to_acc, Money(rng.randint(1, max_paise)))
+    return batch
+
+
+def total_balance(accounts):
+    from db_config import db_connection
+    marks = ", ".join(["%s"] * len(accounts))
+    with db_connection() as (conn, cursor):
+        cursor.execute(f"SELECT SUM(balance_paise) FROM users WHERE account_no IN ({marks})", accounts)
+        return cursor.fetchone()[0]
+
+
+def run(args):
+    from db_config import db_connection
+    import ledger
+    from settlement import settle
+
+    accounts = seed_accounts(args.accounts, args.balance)
+    opening = total_balance(accounts)
+
+    # Per-transfer baseline on a sample of the traffic
+    sample = build_batch(accounts, args.compare, args.max_amount.paise, seed=1)
+    started = time.perf_counter()
+    with db_connection() as (conn, cursor):
+        for source, target, paise in zip(sample.sources, sample.targets, sample.amounts):
+            ledger.transfer(conn, cursor, sample.accounts[source], sample.accounts[target], Money(paise))
+    per_transfer = (time.perf_counter() - started) / max(1, args.compare)
+
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    batch = build_batch(accounts, args.instructions, args.max_amount.paise)
+    build_time = time.perf_counter() - started
+    grown = rss_mb() - rss_before
+    batch_mb = sum(a.itemsize * len(a) for a in (batch.sources, batch.targets, batch.amounts)) / 1024 ** 2
+
+    with db_connection() as (conn, cursor):
+        stats = settle(conn, cursor, batch)
+    closing = total_balance(accounts)
+
+    report(f"Settlement of {args.instructions:,} transfers over {args.accounts} accounts", [
+        ("batch build", f"{build_time:.2f}s"),
+        ("batch arrays", f"{batch_mb:.1f} MB (process grew {grown:.0f} MB building it)"),
+        ("netting", f"{stats['net_time']:.3f}s"),
+        ("lock + check", f"{stats['lock_time']:.3f}s"),
+        ("balance updates", f"{stats['balance_updates']} in {stats['update_time']:.3f}s"),
+        ("ledger rows", f"{stats['rows']:,} in {stats['insert_time']:.2f}s"),
+        ("settlement time", f"{stats['elapsed']:.2f}s ({args.instructions / stats['elapsed']:,.0f} transfers/s)"),
+        ("one by one (sampled)", f"{per_transfer * 1000:.2f} ms/transfer "
+                                 f"(~{per_transfer * args.instructions:,.0f}s for the batch)"),
+        ("total balance conserved", closing == opening),
+    ])
+    return closing == opening
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--instructions", type=int, default=1000000)
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--balance", type=Money.parse, default="1000000")
+    parser.add_argument("--max-amount", type=Money.parse, default="50")
+    parser.add_argument("--compare", type=int, default=5000, help="transfers to post one by one for comparison")
+    args = parser.parse_args()
+
+    path = use_sqlite() if args.backend == "sqlite" else None
+    try:
+        conserved = run(args)
+    finally:
+        if path:
+            remove_sqlite(path)
+        else:
+            drop_accounts()
+    raise SystemExit(0 if conserved else 1)
+
+
+if __name__ == "__main__":
+    main()
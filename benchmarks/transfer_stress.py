@@ -0,0 +1,141 @@
+# benchmarks/transfer_stress.py
+"""Transfer stress test.
+
+Many threads move random amounts between a small pool of accounts, so the
+same pairs are constantly transferred in both directions at once, then
+checks that money was neither created nor lost: the total across the
+accounts is unchanged and every balance still equals its ledger.
+
+    python -m benchmarks.transfer_stress [--threads 16] [--transfers 20000] [--accounts 20] [--legacy]
+
+--legacy runs the old two-window workflow instead: a withdrawal and then a
+deposit, each in its own transaction.
+
+Runs on a throwaway SQLite file unless --backend mysql is given.
+"""
+import argparse
+import random
+import threading
+import time
+from money import Money
+from benchmarks.common import (use_sqlite, remove_sqlite, seed_accounts, drop_accounts,
+                               report, percentile)
+
+
+def legacy_transfer(conn, cursor, from_acc, to_acc, amount):
+    """Withdraw then deposit, as staff did through two windows; not atomic"""
+    import ledger
+    ledger.withdraw(conn, cursor, from_acc, amount)
+    ledger.deposit(conn, cursor, to_acc, amount)
+
+
+def totals(accounts):
+    """({account: balance_paise}, {account: net ledger paise}) for the accounts"""
+    from db_config import db_connection
+    marks = ", ".join(["%s"] * len(accounts))
+    with db_connection() as (conn, cursor):
+        cursor.execute(f"SELECT account_no, balance_paise FROM users WHERE account_no IN ({marks})",
+                       accounts)
+        balances = dict(cursor.fetchall())
+        cursor.execute(
+            f"SELECT account_no, SUM(CASE WHEN type = 'Deposit' THEN amount_paise ELSE -amount_paise END) "
+            f"FROM transactions WHERE account_no IN ({marks}) GROUP BY account_no",
+            accounts
+        )
+        net = dict(cursor.fetchall())
+    return balances, net
+
+
+def run(args):
+    from db_config import db_connection, pool_stats
+    import ledger
+
+    post = legacy_transfer if args.legacy else ledger.transfer
+    accounts = seed_accounts(args.accounts, args.balance)
+    opening = args.balance.paise
+    per_thread = args.transfers // args.threads
+    latencies = []
+    counts = {'ok': 0, 'declined': 0, 'errors': 0}
+    lock = threading.Lock()
+    gate = threading.Event()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        mine = []
+        ok = declined = errors = 0
+        gate.wait()
+        for _ in range(per_thread):
+            from_acc, to_acc = rng.sample(accounts, 2)
+            amount = Money(rng.randint(1, args.max_amount.paise))
+            started = time.perf_counter()
+            try:
+                with db_connection() as (conn, cursor):
+                    post(conn, cursor, from_acc, to_acc, amount)
+                ok += 1
+            except ValueError:
+                declined += 1
+            except Exception:
+                errors += 1
+            mine.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(mine)
+            counts['ok'] += ok
+            counts['declined'] += declined
+            counts['errors'] += errors
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    for t in threads:
+        t.start()
+    started = time.perf_counter()
+    gate.set()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    balances, net = totals(accounts)
+    expected = opening * len(accounts)
+    total = sum(balances.values())
+    off_ledger = sum(1 for acc_no in accounts if balances[acc_no] != opening + net.get(acc_no, 0))
+    stats = pool_stats()
+    report(f"Transfers ({'legacy withdraw + deposit' if args.legacy else 'one transaction, ordered locks'}) "
+           f"- {args.threads} threads over {args.accounts} accounts", [
+        ("attempted", len(latencies)),
+        ("transferred", counts['ok']),
+        ("declined (insufficient)", counts['declined']),
+        ("errors", counts['errors']),
+        ("elapsed", f"{elapsed:.3f}s"),
+        ("throughput", f"{len(latencies) / elapsed:,.0f} transfers/s"),
+        ("latency p50 / p95", f"{percentile(latencies, 50) * 1000:.1f} / "
+                              f"{percentile(latencies, 95) * 1000:.1f} ms"),
+        ("total balance before / after", f"{Money(expected)} / {Money(total)}"),
+        ("total balance conserved", total == expected),
+        ("balances off ledger", off_ledger),
+        ("pool waits", f"{stats['waits']} ({stats['wait_time']:.3f}s)"),
+    ])
+    return total == expected and off_ledger == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--transfers", type=int, default=20000, help="total transfer attempts")
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--balance", type=Money.parse, default="1000")
+    parser.add_argument("--max-amount", type=Money.parse, default="500")
+    parser.add_argument("--legacy", action="store_true", help="withdraw, then deposit, in two transactions")
+    args = parser.parse_args()
+
+    path = use_sqlite() if args.backend == "sqlite" else None
+    try:
+        conserved = run(args)
+    finally:
+        if path:
+            remove_sqlite(path)
+        else:
+            drop_accounts()
+    raise SystemExit(0 if conserved else 1)
+
+
+if __name__ == "__main__":
+    main()
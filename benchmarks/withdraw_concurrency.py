@@ -0,0 +1,123 @@
+# benchmarks/withdraw_concurrency.py
+"""Concurrent withdrawal benchmark.
+
+Hammers a few accounts from many threads with more withdrawals than the
+balances can cover, then checks that no account went negative and that
+the ledger agrees with the balances.
+
+    python -m benchmarks.withdraw_concurrency [--threads 8] [--ops 2000] [--legacy]
+
+Runs on a throwaway SQLite file unless --backend mysql is given, in which
+case BENCH* accounts are created in the configured database and removed.
+"""
+import argparse
+import random
+from money import Money
+import threading
+import time
+from benchmarks.common import use_sqlite, remove_sqlite, seed_accounts, drop_accounts, report
+
+
+def legacy_withdraw(conn, cursor, acc_no, amount):
+    """The pre-ledger read-check-write path, kept for comparison"""
+    cursor.execute("SELECT balance_paise FROM users WHERE account_no = %s", (acc_no,))
+    balance = cursor.fetchone()[0]
+    if balance < amount.paise:
+        raise ValueError("Insufficient balance")
+    time.sleep(0)  # yield between the check and the write, as a network hop would
+    cursor.execute("UPDATE users SET balance_paise = balance_paise - %s WHERE account_no = %s",
+                   (amount.paise, acc_no))
+    cursor.execute("INSERT INTO transactions (account_no, type, amount_paise) VALUES (%s, 'Withdrawal', %s)",
+                   (acc_no, amount.paise))
+
+
+def run(args):
+    from db_config import db_connection, pool_stats
+    from ledger import withdraw
+
+    post = legacy_withdraw if args.legacy else withdraw
+    accounts = seed_accounts(args.accounts, args.balance)
+    ops_per_thread = args.ops // args.threads
+    counts = {"ok": 0, "declined": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def worker(seed):
+        rng = random.Random(seed)
+        ok = declined = errors = 0
+        for _ in range(ops_per_thread):
+            acc_no = rng.choice(accounts)
+            try:
+                with db_connection() as (conn, cursor):
+                    post(conn, cursor, acc_no, args.amount)
+                ok += 1
+            except ValueError:
+                declined += 1
+            except Exception:
+                errors += 1
+        with lock:
+            counts["ok"] += ok
+            counts["declined"] += declined
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    with db_connection() as (conn, cursor):
+        cursor.execute("SELECT COUNT(*), MIN(balance_paise), SUM(balance_paise) FROM users "
+                       "WHERE account_no LIKE 'BENCH%'")
+        _, min_balance, total_balance = cursor.fetchone()
+        cursor.execute("SELECT COUNT(*) FROM users WHERE account_no LIKE 'BENCH%' AND balance_paise < 0")
+        overdrawn = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*), COALESCE(SUM(amount_paise), 0) FROM transactions "
+                       "WHERE account_no LIKE 'BENCH%'")
+        ledger_rows, ledger_total = cursor.fetchone()
+
+    expected_total = args.balance * args.accounts - args.amount * counts["ok"]
+    attempted = ops_per_thread * args.threads
+    stats = pool_stats()
+    report(f"Withdrawals ({'legacy read-check-write' if args.legacy else 'atomic conditional UPDATE'})", [
+        ("threads", args.threads),
+        ("attempted", attempted),
+        ("posted", counts["ok"]),
+        ("declined (insufficient)", counts["declined"]),
+        ("errors", counts["errors"]),
+        ("elapsed", f"{elapsed:.3f}s"),
+        ("throughput", f"{attempted / elapsed:,.0f} withdrawals/s"),
+        ("lowest balance", str(Money(min_balance))),
+        ("overdrawn accounts", overdrawn),
+        ("balances match ledger", Money(total_balance) == expected_total
+         and ledger_rows == counts["ok"] and Money(ledger_total) == args.amount * counts["ok"]),
+        ("pool waits", f"{stats['waits']} ({stats['wait_time']:.3f}s)"),
+    ])
+    return overdrawn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backend", choices=("sqlite", "mysql"), default="sqlite")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=2000, help="total withdrawal attempts")
+    parser.add_argument("--accounts", type=int, default=4)
+    parser.add_argument("--balance", type=Money.parse, default="10000")
+    parser.add_argument("--amount", type=Money.parse, default="50")
+    parser.add_argument("--legacy", action="store_true", help="benchmark the old read-check-write path")
+    args = parser.parse_args()
+
+    path = use_sqlite() if args.backend == "sqlite" else None
+    try:
+        overdrawn = run(args)
+    finally:
+        if path:
+            remove_sqlite(path)
+        else:
+            drop_accounts()
+    raise SystemExit(1 if overdrawn and not args.legacy else 0)
+
+
+if __name__ == "__main__":
+    main()
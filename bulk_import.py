@@ -0,0 +1,252 @@
+# bulk_import.py
+"""Bulk import of ledger rows from a CSV file.
+
+    python bulk_import.py branch_ledger.csv [--batch-size 5000] [--rejects rejects.csv] [--dry-run]
+
+The file needs a header naming the account_no, type, amount and timestamp
+columns, in any order; other columns are ignored. type is Deposit or
+Withdrawal (any case; Withdraw is accepted). A blank timestamp means "now";
+one with a UTC offset is converted to local time.
+An account's rows must not go back in time: a row dated before the
+account's latest posting is rejected, so the balance each row carries is
+the account's balance at that moment. Sort a historical file by
+timestamp before importing it.
+
+Rows are read one batch at a time, so memory stays flat however large
+the file is. Each batch is one transaction:
+- the batch's accounts are locked in account order;
+- its rows are checked against the running balances: unknown accounts,
+  rows older than the account's latest posting and withdrawals that
+  would overdraw are rejected;
+- the rest go in with one executemany INSERT, each row carrying the
+  balance it leaves;
+- each account's balance moves once, by its net delta for the batch.
+
+Rejected rows are written to --rejects with the reason, and the import
+carries on. --dry-run validates everything and rolls each batch back.
+
+Running terminals keep balances in their own account cache, which an
+import cannot reach; their dashboards may show an imported account's old
+balance until the entry expires (account_cache.CACHE_TTL, a minute).
+"""
+import argparse
+import csv
+import logging
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+from money import parse_paise, format_paise
+
+BATCH_SIZE = 5000           # rows per transaction
+LOOKUP_CHUNK = 500          # accounts per IN (...) lookup
+PROGRESS_EVERY = 5.0        # seconds between progress lines
+
+COLUMNS = ("account_no", "type", "amount", "timestamp")
+TYPES = {"deposit": "Deposit", "withdrawal": "Withdrawal", "withdraw": "Withdrawal"}
+
+
+class ImportFormatError(ValueError):
+    """Raised when the file as a whole cannot be imported (e.g. missing columns)"""
+
+
+def parse_row(row):
+    """(account_no, type, amount_paise, timestamp) for one CSV record; ValueError says what is wrong"""
+    acc_no = (row.get("account_no") or "").strip()
+    if not acc_no:
+        raise ValueError("missing account number")
+
+    txn_type = TYPES.get((row.get("type") or "").strip().lower())
+    if txn_type is None:
+        raise ValueError(f"unknown type {row.get('type')!r}")
+
+    try:
+        amount = parse_paise(row.get("amount") or "")
+    except ValueError:
+        raise ValueError(f"bad amount {row.get('amount')!r} (rupees, at most 2 decimal places)")
+    if amount <= 0:
+        raise ValueError(f"amount must be positive, got {row.get('amount')!r}")
+
+    stamp = (row.get("timestamp") or "").strip()
+    try:
+        timestamp = datetime.fromisoformat(stamp) if stamp else datetime.now().replace(microsecond=0)
+    except ValueError:
+        raise ValueError(f"bad timestamp {stamp!r}")
+    if timestamp.tzinfo is not None:
+        # The ledger keeps naive local time, like every other writer
+        timestamp = timestamp.astimezone().replace(tzinfo=None)
+    return acc_no, txn_type, amount, timestamp
+
+
+def read_batches(reader, batch_size):
+    """Yield lists of (line_no, record) from a csv.DictReader"""
+    numbered = ((reader.line_num, record) for record in reader)
+    while True:
+        batch = list(islice(numbered, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _lock_balances(cursor, backend, accounts):
+    balances = {}
+    for i in range(0, len(accounts), LOOKUP_CHUNK):
+        chunk = accounts[i:i + LOOKUP_CHUNK]
+        marks = ", ".join(["%s"] * len(chunk))
+        cursor.execute(
+            f"SELECT account_no, balance_paise FROM users WHERE account_no IN ({marks}) "
+            f"ORDER BY account_no{backend.lock_rows}",
+            chunk
+        )
+        balances.update(cursor.fetchall())
+    return balances
+
+
+def _latest_postings(cursor, accounts):
+    """Timestamp of each account's latest posting, one grouped query per LOOKUP_CHUNK accounts"""
+    latest = {}
+    for i in range(0, len(accounts), LOOKUP_CHUNK):
+        chunk = accounts[i:i + LOOKUP_CHUNK]
+        marks = ", ".join(["%s"] * len(chunk))
+        cursor.execute(
+            f"SELECT account_no, MAX(timestamp) FROM transactions WHERE account_no IN ({marks}) "
+            f"GROUP BY account_no",
+            chunk
+        )
+        for acc_no, timestamp in cursor.fetchall():
+            # SQLite does not type an aggregate, so its MAX comes back as text
+            latest[acc_no] = timestamp if isinstance(timestamp, datetime) else datetime.fromisoformat(timestamp)
+    return latest
+
+
+def post_batch(cursor, backend, batch):
+    """Post one batch inside the caller's transaction.
+
+    Returns (posted, rejects), where rejects are (line_no, record, reason).
+    """
+    rejects = []
+    parsed = []
+    for line_no, record in batch:
+        try:
+            parsed.append((line_no, record, parse_row(record)))
+        except ValueError as e:
+            rejects.append((line_no, record, str(e)))
+    if not parsed:
+        return 0, rejects
+
+    balances = _lock_balances(cursor, backend, sorted({row[0] for _, _, row in parsed}))
+    latest = _latest_postings(cursor, sorted(balances))
+    rows = []
+    deltas = {}
+    for line_no, record, (acc_no, txn_type, amount, timestamp) in parsed:
+        balance = balances.get(acc_no)
+        if balance is None:
+            rejects.append((line_no, record, f"account {acc_no} not found"))
+            continue
+        if acc_no in latest and timestamp < latest[acc_no]:
+            # Would land before postings whose balance_after_paise already counts on it
+            rejects.append((line_no, record, f"older than account {acc_no}'s latest posting ({latest[acc_no]})"))
+            continue
+        delta = amount if txn_type == "Deposit" else -amount
+        if balance + delta < 0:
+            rejects.append((line_no, record, f"would overdraw account {acc_no} (balance {format_paise(balance)})"))
+            continue
+        balances[acc_no] = balance + delta
+        latest[acc_no] = timestamp
+        deltas[acc_no] = deltas.get(acc_no, 0) + delta
+        rows.append((acc_no, txn_type, amount, timestamp, balances[acc_no]))
+
+    if rows:
+        cursor.executemany(
+            "INSERT INTO transactions (account_no, type, amount_paise, timestamp, balance_after_paise) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            rows
+        )
+        cursor.executemany(
+            "UPDATE users SET balance_paise = balance_paise + %s WHERE account_no = %s",
+            [(delta, acc_no) for acc_no, delta in deltas.items() if delta]
+        )
+    return len(rows), rejects
+
+
+def import_csv(source, batch_size=BATCH_SIZE, rejects_file=None, dry_run=False, progress=None):
+    """Stream an open CSV file into the ledger; returns the run's counters"""
+    from db_config import db_connection, get_backend
+
+    reader = csv.DictReader(source)
+    header = [name.strip().lower() for name in (reader.fieldnames or [])]
+    missing = [name for name in COLUMNS if name not in header]
+    if missing:
+        raise ImportFormatError(f"CSV header is missing column(s): {', '.join(missing)}")
+    reader.fieldnames = header
+
+    reject_writer = None
+    if rejects_file is not None:
+        reject_writer = csv.writer(rejects_file)
+        reject_writer.writerow(["line"] + header + ["reason"])
+
+    backend = get_backend()
+    stats = {'read': 0, 'posted': 0, 'rejected': 0, 'batches': 0}
+    started = last_report = time.monotonic()
+    with db_connection() as (conn, cursor):
+        for batch in read_batches(reader, batch_size):
+            backend.begin(conn)
+            try:
+                posted, rejects = post_batch(cursor, backend, batch)
+            except BaseException:
+                conn.rollback()
+                raise
+            if dry_run:
+                conn.rollback()
+            else:
+                conn.commit()
+
+            stats['read'] += len(batch)
+            stats['posted'] += posted
+            stats['rejected'] += len(rejects)
+            stats['batches'] += 1
+            if reject_writer is not None:
+                for line_no, record, reason in rejects:
+                    reject_writer.writerow([line_no] + [record.get(name, "") for name in header] + [reason])
+
+            now = time.monotonic()
+            if progress is not None and now - last_report >= PROGRESS_EVERY:
+                progress(stats, now - started)
+                last_report = now
+
+    stats['elapsed'] = time.monotonic() - started
+    stats['rows_per_second'] = stats['read'] / stats['elapsed'] if stats['elapsed'] else 0.0
+    logging.info(f"Bulk import{' (dry run)' if dry_run else ''}: {stats}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import ledger rows from a CSV file")
+    parser.add_argument("csv_file", help="CSV with account_no, type, amount, timestamp columns")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per transaction")
+    parser.add_argument("--rejects", help="write rejected rows and the reason to this CSV")
+    parser.add_argument("--dry-run", action="store_true", help="validate only; roll every batch back")
+    args = parser.parse_args()
+
+    def progress(stats, elapsed):
+        print(f"  {stats['read']:,} rows ({stats['read'] / elapsed:,.0f} rows/s), "
+              f"{stats['rejected']:,} rejected", flush=True)
+
+    rejects_file = open(args.rejects, "w", newline="", encoding="utf-8") if args.rejects else None
+    try:
+        with open(args.csv_file, newline="", encoding="utf-8-sig") as source:
+            stats = import_csv(source, args.batch_size, rejects_file, args.dry_run, progress)
+    except ImportFormatError as e:
+        print(f"Cannot import {args.csv_file}: {e}", file=sys.stderr)
+        sys.exit(2)
+    finally:
+        if rejects_file is not None:
+            rejects_file.close()
+
+    verb = "Validated" if args.dry_run else "Posted"
+    print(f"{verb} {stats['posted']:,} of {stats['read']:,} rows in {stats['batches']:,} batches, "
+          f"{stats['rejected']:,} rejected, {stats['elapsed']:.1f}s ({stats['rows_per_second']:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,26 +4,91 @@ USE pybank;
 
 -- Create users table
 CREATE TABLE IF NOT EXISTS users (
-    account_number VARCHAR(20) PRIMARY KEY,
-    username VARCHAR(100) NOT NULL,
-    password VARCHAR(100) NOT NULL,
-    pin VARCHAR(10) NOT NULL,
-    balance DECIMAL(15, 2) DEFAULT 0.00
+    account_no VARCHAR(20) PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    pin_hash VARCHAR(100) NOT NULL,
+    -- Money is stored as integer paise (1 rupee = 100 paise)
+    balance_paise BIGINT NOT NULL DEFAULT 0
 );
 
 -- Create transactions table
 CREATE TABLE IF NOT EXISTS transactions (
     transaction_id INT AUTO_INCREMENT PRIMARY KEY,
-    account_number VARCHAR(20),
+    account_no VARCHAR(20),
     type ENUM('Deposit', 'Withdrawal') NOT NULL,
-    amount DECIMAL(15, 2) NOT NULL,
+    amount_paise BIGINT NOT NULL,
     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-    FOREIGN KEY (account_number) REFERENCES users(account_number)
+    request_id VARCHAR(64) NULL,
+    counterparty VARCHAR(20) NULL,
+    -- The account's balance just after this row was posted
+    balance_after_paise BIGINT NULL,
+    FOREIGN KEY (account_no) REFERENCES users(account_no),
+    -- Covering indexes for customer history and the admin ledger view
+    INDEX idx_transactions_account_page (account_no, timestamp, transaction_id, type, amount_paise),
+    INDEX idx_transactions_ledger_page (timestamp, transaction_id, account_no, type, amount_paise),
+    UNIQUE INDEX uq_transactions_request_id (request_id)
 );
 
 -- Create admins table
 CREATE TABLE IF NOT EXISTS admins (
     admin_id INT AUTO_INCREMENT PRIMARY KEY,
     username VARCHAR(100) NOT NULL UNIQUE,
-    password VARCHAR(100) NOT NULL
-);
\ No newline at end of file
+    password_hash VARCHAR(100) NOT NULL
+);
+
+-- Balance reconciliation (reconcile.py): each account as last checked, and past runs
+CREATE TABLE IF NOT EXISTS reconcile_state (
+    account_no VARCHAR(20) PRIMARY KEY,
+    balance_paise BIGINT NOT NULL,
+    ledger_paise BIGINT NOT NULL,
+    ledger_rows INT NOT NULL,
+    checked_at DATETIME NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reconcile_runs (
+    run_id INT PRIMARY KEY,
+    mode VARCHAR(12) NOT NULL,
+    watermark BIGINT NOT NULL,
+    accounts_checked INT NOT NULL,
+    discrepancies INT NOT NULL,
+    finished_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Ledger totals per day, per month and per account per month (rollups.py keeps them up to date)
+CREATE TABLE IF NOT EXISTS ledger_daily (
+    day DATE PRIMARY KEY,
+    deposits_paise BIGINT NOT NULL,
+    deposit_count INT NOT NULL,
+    withdrawals_paise BIGINT NOT NULL,
+    withdrawal_count INT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS ledger_monthly (
+    month DATE PRIMARY KEY,
+    deposits_paise BIGINT NOT NULL,
+    deposit_count INT NOT NULL,
+    withdrawals_paise BIGINT NOT NULL,
+    withdrawal_count INT NOT NULL,
+    active_accounts INT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS account_monthly (
+    account_no VARCHAR(20) NOT NULL,
+    month DATE NOT NULL,
+    deposits_paise BIGINT NOT NULL,
+    deposit_count INT NOT NULL,
+    withdrawals_paise BIGINT NOT NULL,
+    withdrawal_count INT NOT NULL,
+    PRIMARY KEY (account_no, month)
+);
+
+CREATE TABLE IF NOT EXISTS rollup_state (
+    name VARCHAR(20) PRIMARY KEY,
+    watermark BIGINT NOT NULL,
+    mark BIGINT NULL,
+    marked_at DATETIME NULL
+);
+
+INSERT IGNORE INTO rollup_state (name, watermark) VALUES ('ledger', 0);
+
+-- Existing databases: run `python migrations.py` instead of this script
@@ -0,0 +1,396 @@
+# db_backends.py
+import logging
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    account_no VARCHAR(20) PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    pin_hash VARCHAR(100) NOT NULL,
+    balance DECIMAL(15, 2) DEFAULT 0.00
+);
+
+CREATE TABLE IF NOT EXISTS transactions (
+    transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_no VARCHAR(20) REFERENCES users(account_no),
+    type VARCHAR(20) NOT NULL,
+    amount DECIMAL(15, 2) NOT NULL,
+    -- Local time, like MySQL's CURRENT_TIMESTAMP; SQLite's own is UTC
+    timestamp DATETIME DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS admins (
+    admin_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username VARCHAR(100) NOT NULL UNIQUE,
+    password_hash VARCHAR(100) NOT NULL
+);
+"""
+
+# Tuned for a single-box branch: WAL lets readers run alongside the writer,
+# NORMAL sync is durable across app crashes and only fsyncs on checkpoint
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+)
+
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("DECIMAL", lambda raw: Decimal(raw.decode()))
+sqlite3.register_converter("DATETIME", lambda raw: datetime.fromisoformat(raw.decode()))
+sqlite3.register_converter("DATE", lambda raw: date.fromisoformat(raw.decode()))
+
+
+class StorageBackend:
+    """Interface every database engine implements for the connection pool"""
+
+    name = None
+    # Suffix that takes a row lock inside a transaction ('' where the
+    # engine locks the whole database on BEGIN instead)
+    lock_rows = ""
+
+    def connect(self):
+        """Open a new DB-API connection exposing the mysql.connector API subset we use"""
+        raise NotImplementedError
+
+    def begin(self, conn):
+        """Start an explicit transaction on an autocommit connection"""
+        raise NotImplementedError
+
+    def interrupt(self, conn):
+        """Abort the statement conn is running; called from another thread"""
+        raise NotImplementedError
+
+    def is_transient(self, error):
+        """Whether error aborted a transaction that can simply be run again (deadlock, lock wait)"""
+        return False
+
+    def is_duplicate_key(self, error):
+        """Whether error is a unique index refusing a row"""
+        return False
+
+    def accumulate(self, cursor, table, keys, columns, rows):
+        """Insert rows of keys + columns; where the key exists already, add the columns to it"""
+        raise NotImplementedError
+
+    def oldest_writer_age(self, cursor):
+        """Seconds since the oldest other open transaction that has written began, or None.
+
+        None where no other connection can be part-way through writing, as
+        when the engine lets one writer in at a time and cursor holds it.
+        """
+        return None
+
+    # Schema introspection and DDL used by migrations.py
+
+    def columns(self, cursor, table):
+        """Map of column name to declared type"""
+        raise NotImplementedError
+
+    def indexes(self, cursor, table):
+        """Names of the indexes on a table"""
+        raise NotImplementedError
+
+    def add_index(self, cursor, table, name, columns, unique=False):
+        raise NotImplementedError
+
+    def add_column(self, cursor, table, column, definition):
+        raise NotImplementedError
+
+    def drop_column(self, cursor, table, column, rebuild_indexes=()):
+        """Drop a column, rebuilding the (name, columns) indexes that covered it"""
+        raise NotImplementedError
+
+    def rename_column(self, cursor, table, old, new, definition=None):
+        """Rename a column; definition (where supported) also retypes it"""
+        raise NotImplementedError
+
+
+class MySQLBackend(StorageBackend):
+    name = "mysql"
+    lock_rows = " FOR UPDATE"
+
+    def __init__(self, **settings):
+        self.settings = settings
+
+    def connect(self):
+        import mysql.connector
+        from mysql.connector import Error
+        try:
+            conn = mysql.connector.connect(**self.settings)
+            if conn.is_connected():
+                return conn
+            raise ConnectionError("Failed to connect to database")
+        except Error as e:
+            logging.error(f"Database error: {str(e)}")
+            raise ConnectionError(f"Database connection failed: {str(e)}")
+
+    def begin(self, conn):
+        conn.start_transaction()
+
+    def interrupt(self, conn):
+        # The busy connection cannot take another command; kill from a second one
+        killer = self.connect()
+        try:
+            cursor = killer.cursor()
+            cursor.execute(f"KILL QUERY {int(conn.connection_id)}")
+            cursor.close()
+        finally:
+            killer.close()
+
+    def is_transient(self, error):
+        # ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT: InnoDB rolled the transaction back
+        return getattr(error, "errno", None) in (1213, 1205)
+
+    def is_duplicate_key(self, error):
+        return getattr(error, "errno", None) == 1062
+
+    def accumulate(self, cursor, table, keys, columns, rows):
+        names = ", ".join(keys + columns)
+        marks = ", ".join(["%s"] * (len(keys) + len(columns)))
+        additions = ", ".join(f"{column} = {column} + VALUES({column})" for column in columns)
+        cursor.executemany(
+            f"INSERT INTO {table} ({names}) VALUES ({marks}) ON DUPLICATE KEY UPDATE {additions}", rows
+        )
+
+    def oldest_writer_age(self, cursor):
+        from mysql.connector import Error
+        try:
+            cursor.execute(
+                "SELECT TIMESTAMPDIFF(SECOND, MIN(trx_started), NOW()) FROM information_schema.innodb_trx "
+                "WHERE trx_rows_modified > 0 AND trx_mysql_thread_id <> CONNECTION_ID()"
+            )
+        except Error as e:
+            # innodb_trx needs the PROCESS privilege
+            logging.warning(f"Cannot see open transactions, relying on elapsed time alone: {str(e)}")
+            return None
+        return cursor.fetchone()[0]
+
+    def columns(self, cursor, table):
+        cursor.execute(
+            "SELECT COLUMN_NAME, COLUMN_TYPE FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table,)
+        )
+        return {name: str(col_type) for name, col_type in cursor.fetchall()}
+
+    def indexes(self, cursor, table):
+        cursor.execute(
+            "SELECT DISTINCT INDEX_NAME FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+            (table,)
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def add_index(self, cursor, table, name, columns, unique=False):
+        # In-place build: tellers keep reading and writing while it runs
+        cursor.execute(
+            f"ALTER TABLE {table} ADD {'UNIQUE ' if unique else ''}INDEX {name} ({', '.join(columns)}), "
+            f"ALGORITHM=INPLACE, LOCK=NONE"
+        )
+
+    def add_column(self, cursor, table, column, definition):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def drop_column(self, cursor, table, column, rebuild_indexes=()):
+        # One statement, so a foreign key never loses the index it relies on
+        existing = self.indexes(cursor, table)
+        changes = [f"DROP INDEX {name}" for name, _ in rebuild_indexes if name in existing]
+        changes.append(f"DROP COLUMN {column}")
+        changes += [f"ADD INDEX {name} ({', '.join(columns)})" for name, columns in rebuild_indexes]
+        cursor.execute(f"ALTER TABLE {table} {', '.join(changes)}")
+
+    def rename_column(self, cursor, table, old, new, definition=None):
+        if definition:
+            cursor.execute(f"ALTER TABLE {table} CHANGE COLUMN {old} {new} {definition}")
+        else:
+            cursor.execute(f"ALTER TABLE {table} RENAME COLUMN {old} TO {new}")
+
+
+class SQLiteCursor:
+    """Cursor wrapper that accepts the %s placeholders used across the app"""
+
+    _translated = {}
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    @classmethod
+    def _translate(cls, sql):
+        query = cls._translated.get(sql)
+        if query is None:
+            query = sql.replace("%s", "?")
+            cls._translated[sql] = query
+        return query
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(self._translate(sql), params)
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        self._cursor.executemany(self._translate(sql), seq_of_params)
+        return self
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size or self._cursor.arraysize)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    """Adapts sqlite3.Connection to the mysql.connector calls the app makes"""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self._open = True
+
+    def cursor(self, buffered=True, **kwargs):
+        return SQLiteCursor(self._conn.cursor())
+
+    def start_transaction(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    @property
+    def in_transaction(self):
+        return self._conn.in_transaction
+
+    def is_connected(self):
+        return self._open
+
+    def interrupt(self):
+        self._conn.interrupt()
+
+    def close(self):
+        self._open = False
+        self._conn.close()
+
+
+class SQLiteBackend(StorageBackend):
+    """Embedded engine so the app, benchmarks and load tests run without a server"""
+
+    name = "sqlite"
+
+    def __init__(self, path, timeout=5):
+        self.path = path
+        self.timeout = timeout
+        self._initialized = False
+        self._init_lock = threading.Lock()
+
+    def connect(self):
+        try:
+            raw = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+                detect_types=sqlite3.PARSE_DECLTYPES
+            )
+            for pragma in SQLITE_PRAGMAS:
+                raw.execute(pragma)
+        except sqlite3.Error as e:
+            logging.error(f"Database error: {str(e)}")
+            raise ConnectionError(f"Database connection failed: {str(e)}")
+
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    raw.executescript(SQLITE_SCHEMA)
+                    self._initialized = True
+                    logging.info(f"SQLite database ready at {self.path}")
+        return SQLiteConnection(raw)
+
+    def begin(self, conn):
+        conn.start_transaction()
+
+    def interrupt(self, conn):
+        conn.interrupt()
+
+    def is_transient(self, error):
+        # Another connection held the write lock past busy_timeout
+        return isinstance(error, sqlite3.OperationalError) and (
+            "locked" in str(error) or "busy" in str(error))
+
+    def is_duplicate_key(self, error):
+        return isinstance(error, sqlite3.IntegrityError) and "UNIQUE" in str(error)
+
+    def accumulate(self, cursor, table, keys, columns, rows):
+        names = ", ".join(keys + columns)
+        marks = ", ".join(["%s"] * (len(keys) + len(columns)))
+        additions = ", ".join(f"{column} = {column} + excluded.{column}" for column in columns)
+        cursor.executemany(
+            f"INSERT INTO {table} ({names}) VALUES ({marks}) "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {additions}", rows
+        )
+
+    def columns(self, cursor, table):
+        cursor.execute(f"PRAGMA table_info({table})")
+        return {row[1]: row[2] for row in cursor.fetchall()}
+
+    def indexes(self, cursor, table):
+        cursor.execute(f"PRAGMA index_list({table})")
+        return {row[1] for row in cursor.fetchall()}
+
+    def add_index(self, cursor, table, name, columns, unique=False):
+        cursor.execute(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+        )
+
+    def add_column(self, cursor, table, column, definition):
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+    def drop_column(self, cursor, table, column, rebuild_indexes=()):
+        # SQLite refuses to drop an indexed column, so the indexes go first
+        for name, _ in rebuild_indexes:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+        cursor.execute(f"ALTER TABLE {table} DROP COLUMN {column}")
+        for name, columns in rebuild_indexes:
+            self.add_index(cursor, table, name, columns)
+
+    def rename_column(self, cursor, table, old, new, definition=None):
+        # Column types are advisory in SQLite, so only the name changes
+        cursor.execute(f"ALTER TABLE {table} RENAME COLUMN {old} TO {new}")
+
+
+def create_backend(name, **settings):
+    """Build the backend selected in db_config"""
+    if name == "mysql":
+        return MySQLBackend(**settings)
+    if name == "sqlite":
+        return SQLiteBackend(settings["path"])
+    raise ValueError(f"Unknown database backend: {name}")
@@ -1,7 +1,12 @@
 # db_config.py
-import mysql.connector
-from mysql.connector import Error
 import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from db_backends import create_backend
 
 logging.basicConfig(
     level=logging.INFO,
@@ -9,21 +14,304 @@ logging.basicConfig(
     filename='bank_system.log'
 )
 
+# Storage engine: 'mysql' (default) or 'sqlite' for a serverless single-box setup
+DB_BACKEND = os.environ.get('BANKMATE_DB_BACKEND', 'mysql')
+SQLITE_PATH = os.environ.get('BANKMATE_SQLITE_PATH', 'pybank.sqlite3')
+# The embedded database migrates itself on first use; MySQL is migrated by
+# an operator with `python migrations.py`
+AUTO_MIGRATE = os.environ.get('BANKMATE_AUTO_MIGRATE', '1' if DB_BACKEND == 'sqlite' else '0') == '1'
+
+MYSQL_SETTINGS = {
+    'host': 'localhost',
+    'database': 'pybank',
+    'user': 'root',
+    'password': 'Enter the pass',
+    'connect_timeout': 5,
+    'autocommit': True,
+}
+
+# Pool tuning - one pool is shared by every window and worker thread
+POOL_SIZE = 8               # maximum open connections
+POOL_TIMEOUT = 10           # seconds to wait for a free connection
+MAX_CONNECTION_AGE = 1800   # seconds before a connection is recycled
+
+# Transactions the engine aborts on a deadlock or lock-wait timeout are run again
+RETRY_ATTEMPTS = 5          # attempts in all, the first included
+RETRY_BACKOFF = 0.02        # seconds; the cap on the random wait doubles per attempt
+
+
+class PooledConnection:
+    """Connection handed out by the pool; close() returns it instead of disconnecting"""
+
+    def __init__(self, pool, conn, created_at):
+        self._pool = pool
+        self._conn = conn
+        self._created_at = created_at
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def close(self):
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn, self._created_at)
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of database connections.
+
+    Connections are health-checked on checkout and recycled once they
+    exceed max_age. Callers block (up to timeout) when all connections
+    are checked out.
+    """
+
+    def __init__(self, connect, max_size=POOL_SIZE, timeout=POOL_TIMEOUT,
+                 max_age=MAX_CONNECTION_AGE):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_age = max_age
+        self._idle = deque()
+        self._open = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time': 0.0,
+            'created': 0,
+            'recycled': 0,
+        }
+
+    def acquire(self):
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+        conn = None
+        with self._cond:
+            while True:
+                if self._idle:
+                    conn, created_at = self._idle.pop()
+                    break
+                if self._open < self.max_size:
+                    self._open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ConnectionError("Timed out waiting for a free database connection")
+                waited = True
+                self._cond.wait(remaining)
+            self._stats['checkouts'] += 1
+            if waited:
+                self._stats['waits'] += 1
+                self._stats['wait_time'] += time.monotonic() - start
+
+        if conn is not None and not self._is_usable(conn, created_at):
+            self._close_quietly(conn)
+            conn = None
+            with self._cond:
+                self._stats['recycled'] += 1
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._open -= 1
+                    self._cond.notify()
+                raise
+            created_at = time.monotonic()
+            with self._cond:
+                self._stats['created'] += 1
+
+        return PooledConnection(self, conn, created_at)
+
+    def release(self, conn, created_at):
+        healthy = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except Exception as e:
+            logging.warning(f"Discarding pooled connection: {str(e)}")
+            healthy = False
+
+        with self._cond:
+            if healthy:
+                self._idle.append((conn, created_at))
+            else:
+                self._open -= 1
+            self._cond.notify()
+        if not healthy:
+            self._close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats['open'] = self._open
+            stats['idle'] = len(self._idle)
+        stats['avg_wait'] = stats['wait_time'] / stats['waits'] if stats['waits'] else 0.0
+        return stats
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = list(self._idle), deque()
+            self._open -= len(idle)
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def _is_usable(self, conn, created_at):
+        if time.monotonic() - created_at > self.max_age:
+            return False
+        try:
+            return conn.is_connected()
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+if DB_BACKEND == 'sqlite':
+    _backend = create_backend('sqlite', path=SQLITE_PATH)
+else:
+    _backend = create_backend('mysql', **MYSQL_SETTINGS)
+_pool = ConnectionPool(_backend.connect)
+
+
+_schema_ready = not AUTO_MIGRATE
+_schema_lock = threading.Lock()
+
+
+def get_backend():
+    """The storage backend behind the shared pool"""
+    return _backend
+
+
+def ensure_schema():
+    """Migrate the database before first use, if this process is set to"""
+    if not _schema_ready:
+        _ensure_schema()
+
+
+def _ensure_schema():
+    """Run pending migrations once, on a dedicated connection, before the pool is used"""
+    global _schema_ready
+    with _schema_lock:
+        if _schema_ready:
+            return
+        from migrations import migrate
+        conn = _backend.connect()
+        try:
+            applied = migrate(conn, _backend)
+            if applied:
+                logging.info(f"Applied schema migrations {applied}")
+        finally:
+            conn.close()
+        _schema_ready = True
+
+
+@contextmanager
+def db_connection():
+    """Borrow a pooled connection and buffered cursor for the duration of a with-block"""
+    conn, cursor = get_db_connection()
+    try:
+        yield conn, cursor
+    finally:
+        try:
+            cursor.close()
+        except Exception:
+            pass
+        conn.close()
+
+
+@contextmanager
+def streaming_cursor():
+    """A dedicated connection and unbuffered cursor for reading large results.
+
+    Rows come off the server as fetchmany() asks for them, so memory does
+    not grow with the result. The connection is opened outside the pool
+    and closed afterwards: a long export must not hold a connection the
+    screens need.
+    """
+    ensure_schema()
+    conn = _backend.connect()
+    try:
+        cursor = conn.cursor(buffered=False)
+        try:
+            yield conn, cursor
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                # An abandoned unbuffered result; closing the connection discards it
+                pass
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+@contextmanager
+def transaction(conn):
+    """Run the with-block as one explicit transaction on an autocommit connection"""
+    _backend.begin(conn)
+    try:
+        yield
+    except BaseException:
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+
+
+def retry_transient(fn, *args):
+    """Call fn(*args) - which must run whole transactions - again while the engine aborts it transiently.
+
+    Waits a random time below an exponentially growing cap between
+    attempts ("full jitter"), so the transactions that collided do not
+    collide again in lockstep.
+    """
+    for attempt in range(1, RETRY_ATTEMPTS + 1):
+        try:
+            return fn(*args)
+        except Exception as e:
+            if attempt == RETRY_ATTEMPTS or not _backend.is_transient(e):
+                raise
+            delay = random.uniform(0, RETRY_BACKOFF * 2 ** (attempt - 1))
+            logging.warning(f"Transient database error, retry {attempt} in {delay * 1000:.0f}ms: {str(e)}")
+            time.sleep(delay)
+
+
 def get_db_connection():
-    """Safe database connection with timeout and automatic reconnection"""
+    """Safe database connection with timeout and automatic reconnection.
+
+    The connection comes from the shared pool; close() hands it back.
+    Prefer the db_connection() context manager in new code.
+    """
+    ensure_schema()
+    conn = _pool.acquire()
     try:
-        conn = mysql.connector.connect(
-            host='localhost',
-            database='pybank',
-            user='root',
-            password='Enter the pass',
-            connect_timeout=5,
-            autocommit=True
-        )
-        if conn.is_connected():
-            cursor = conn.cursor(buffered=True)
-            return conn, cursor
-        raise ConnectionError("Failed to connect to database")
-    except Error as e:
-        logging.error(f"Database error: {str(e)}")
-        raise ConnectionError(f"Database connection failed: {str(e)}")
+        cursor = conn.cursor(buffered=True)
+    except Exception:
+        conn.close()
+        raise
+    return conn, cursor
+
+
+def pool_stats():
+    """Checkout, wait and wait-time counters for the shared pool"""
+    return _pool.stats()
+
+
+def log_pool_stats():
+    stats = pool_stats()
+    logging.info(
+        f"DB pool: {stats['checkouts']} checkouts, {stats['waits']} waits, "
+        f"{stats['wait_time']:.3f}s waited (avg {stats['avg_wait'] * 1000:.1f}ms), "
+        f"{stats['open']} open / {stats['idle']} idle, "
+        f"{stats['created']} created, {stats['recycled']} recycled"
+    )
@@ -0,0 +1,202 @@
+# db_executor.py
+import itertools
+import logging
+import queue
+import threading
+import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from db_config import POOL_SIZE
+
+# Lower runs first: what the user is waiting on beats background refreshes
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+MAX_QUEUED_JOBS = 64
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when the job queue is full"""
+
+
+class DbJob(QObject):
+    """Handle for a queued database job.
+
+    Create it on the GUI thread (submit() does) so its signals are delivered
+    there, whichever worker thread runs the job.
+    """
+    succeeded = pyqtSignal(object)
+    failed = pyqtSignal(object)
+
+    def __init__(self, fn, args, kwargs, priority, key):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.submitted_at = time.monotonic()
+
+
+class DbExecutor:
+    """Application-wide pool of database worker threads fed by a bounded priority queue"""
+
+    def __init__(self, workers=POOL_SIZE, max_queued=MAX_QUEUED_JOBS):
+        self._queue = queue.PriorityQueue(max_queued)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._pending_keys = set()
+        self._reserved = 0      # jobs accepted by submit() but not yet on the queue
+        self._running = 0
+        self._stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'duplicates': 0,
+            'queue_time': 0.0,
+            'run_time': 0.0,
+            'max_latency': 0.0,
+        }
+        self._threads = [
+            threading.Thread(target=self._work, name=f"db-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn, *args, priority=PRIORITY_INTERACTIVE, key=None, **kwargs):
+        """Accept fn(*args, **kwargs) and return its DbJob.
+
+        The job is queued from the GUI event loop once the caller returns,
+        so signals connected straight after submit() see even a job that
+        finishes at once. Returns None when a job with the same key is
+        still queued or running, so a double click does not post twice.
+        """
+        job = DbJob(fn, args, kwargs, priority, key)
+        with self._lock:
+            if key is not None and key in self._pending_keys:
+                self._stats['duplicates'] += 1
+                return None
+            if self._queue.qsize() + self._reserved >= self._queue.maxsize:
+                self._stats['rejected'] += 1
+                raise ExecutorBusyError("The bank is busy right now, please try again")
+            self._reserved += 1
+            if key is not None:
+                self._pending_keys.add(key)
+            self._stats['submitted'] += 1
+        QTimer.singleShot(0, lambda: self._enqueue(job))
+        return job
+
+    def _enqueue(self, job):
+        with self._lock:
+            self._reserved -= 1
+            # Cannot block: submit() reserved the slot
+            self._queue.put_nowait((job.priority, next(self._seq), job))
+
+    def _work(self):
+        while True:
+            _, _, job = self._queue.get()
+            if job is None:
+                break
+            started = time.monotonic()
+            with self._lock:
+                self._running += 1
+            try:
+                result, error = job.fn(*job.args, **job.kwargs), None
+            except Exception as e:
+                logging.error(f"Database job {getattr(job.fn, '__name__', job.fn)} failed: {str(e)}")
+                result, error = None, e
+            finished = time.monotonic()
+
+            with self._lock:
+                self._running -= 1
+                self._pending_keys.discard(job.key)
+                self._stats['failed' if error else 'completed'] += 1
+                self._stats['queue_time'] += started - job.submitted_at
+                self._stats['run_time'] += finished - started
+                self._stats['max_latency'] = max(self._stats['max_latency'], finished - job.submitted_at)
+
+            if error is None:
+                job.succeeded.emit(result)
+            else:
+                job.failed.emit(error)
+
+    def stats(self):
+        """Queue depth and job latency counters for monitoring"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['running'] = self._running
+            stats['queue_depth'] = self._queue.qsize() + self._reserved
+        done = stats['completed'] + stats['failed']
+        stats['avg_queue_time'] = stats['queue_time'] / done if done else 0.0
+        stats['avg_latency'] = (stats['queue_time'] + stats['run_time']) / done if done else 0.0
+        return stats
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._queue.put((float('inf'), next(self._seq), None))
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_long_job_keys = set()
+
+
+def start_long_job(fn, *args, key=None, **kwargs):
+    """Run fn(*args, **kwargs) on a thread of its own and return its DbJob.
+
+    For jobs that take minutes, like exports and ledger scans. The shared
+    pool orders jobs by priority but a job that has started keeps its
+    worker until it ends, so a long one would leave interactive jobs
+    fewer workers. fn must open its own connection. Call from the GUI
+    thread; returns None when a job with the same key is still running.
+    """
+    job = DbJob(fn, args, kwargs, PRIORITY_BACKGROUND, key)
+    with _executor_lock:
+        if key is not None:
+            if key in _long_job_keys:
+                return None
+            _long_job_keys.add(key)
+
+    def run():
+        try:
+            result, error = fn(*args, **kwargs), None
+        except Exception as e:
+            logging.error(f"Long job {getattr(fn, '__name__', fn)} failed: {str(e)}")
+            result, error = None, e
+        with _executor_lock:
+            _long_job_keys.discard(key)
+        if error is None:
+            job.succeeded.emit(result)
+        else:
+            job.failed.emit(error)
+
+    thread = threading.Thread(target=run, name=f"long-job-{getattr(fn, '__name__', 'job')}", daemon=True)
+    # Start once the caller has had a chance to connect
+    QTimer.singleShot(0, thread.start)
+    return job
+
+
+def get_executor():
+    """The shared executor, started on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = DbExecutor()
+        return _executor
+
+
+def log_executor_stats():
+    if _executor is None:
+        return
+    stats = _executor.stats()
+    logging.info(
+        f"DB executor: {stats['queue_depth']} queued, {stats['running']} running, "
+        f"{stats['completed']} completed, {stats['failed']} failed, "
+        f"{stats['rejected']} rejected, {stats['duplicates']} duplicates, "
+        f"avg latency {stats['avg_latency'] * 1000:.1f}ms "
+        f"(queue {stats['avg_queue_time'] * 1000:.1f}ms), "
+        f"max {stats['max_latency'] * 1000:.1f}ms"
+    )
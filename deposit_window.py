@@ -1,9 +1,15 @@
 #deposit_window
 from PyQt5.QtWidgets import (QWidget, QLabel, QLineEdit, QPushButton, 
                             QVBoxLayout, QMessageBox)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from PyQt5.QtGui import QPixmap, QDoubleValidator
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QDoubleValidator
 import logging
+import uuid
+from db_executor import get_executor, ExecutorBusyError
+from navigation import get_navigator
+from assets import logo_pixmap
+from bank_core import ledger
+from money import Money
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -11,83 +17,31 @@ logging.basicConfig(
     filename='bank_deposit.log'
 )
 
-class DepositWorker(QThread):
-    finished = pyqtSignal(bool, str)
-    
-    def __init__(self, acc_no, amount):
-        super().__init__()
-        self.acc_no = acc_no
-        self.amount = amount
-
-    def run(self):
-        try:
-            from db_config import get_db_connection
-            conn, cursor = get_db_connection()
-            
-            cursor.execute("UPDATE users SET balance = balance + %s WHERE account_no = %s",
-                         (self.amount, self.acc_no))
-            
-            cursor.execute("INSERT INTO transactions (account_no, type, amount) VALUES (%s, 'Deposit', %s)",
-                         (self.acc_no, self.amount))
-            
-            conn.commit()
-            self.finished.emit(True, f"Deposited ₹{self.amount:,.2f} successfully")
-        except Exception as e:
-            self.finished.emit(False, f"Error: {str(e)}")
-        finally:
-            if 'conn' in locals():
-                conn.close()
+def post_deposit(acc_no, amount, request_id):
+    """Database job: credit the account and record the deposit"""
+    ledger.deposit(acc_no, amount, request_id)
+    return f"Deposited {amount} successfully"
 
 class DepositWindow(QWidget):
     def __init__(self, account_no):
         super().__init__()
         self.account_no = account_no
         self.setWindowTitle("Deposit - Bank Mate")
-        self.showMaximized()
         self.init_ui()
 
+    def activate(self, account_no):
+        self.account_no = account_no
+        self.acc_input.clear()
+        self.amount_input.clear()
+        self.new_request()
+
+    def new_request(self):
+        """Start a new posting. Until it succeeds, every attempt sends the same
+        request id, so retrying after a timeout can never post it twice."""
+        self.request_id = uuid.uuid4().hex
+
     def init_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #FFF1D0;
-                font-family: 'Verdana';
-            }
-            QLabel {
-                color: #333333;
-                font-size: 16px;
-            }
-            QLineEdit {
-                padding: 10px;
-                border: 2px solid #FFB347;
-                border-radius: 5px;
-                font-size: 14px;
-                min-width: 250px;
-            }
-            QPushButton {
-                padding: 12px;
-                font-weight: bold;
-                font-size: 16px;
-                min-width: 250px;
-                border-radius: 6px;
-                margin: 5px;
-            }
-            #title {
-                font-size: 24px;
-                font-weight: bold;
-                color: #2C3E50;
-            }
-            #logo {
-                margin-bottom: 20px;
-            }
-            #deposit_btn {
-                background-color: #4CAF50;
-                color: white;
-            }
-            #back_btn {
-                background-color: #FFB347;
-                color: #000;
-            }
-        """)
+        self.setObjectName("DepositWindow")
 
         layout = QVBoxLayout()
         layout.setContentsMargins(50, 30, 50, 30)
@@ -96,8 +50,7 @@ class DepositWindow(QWidget):
         # Logo
         logo = QLabel()
         logo.setObjectName("logo")
-        logo.setPixmap(QPixmap("logo.png").scaled(120, 120, 
-                    Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        logo.setPixmap(logo_pixmap(120))
         logo.setAlignment(Qt.AlignCenter)
 
         # Title
@@ -115,6 +68,8 @@ class DepositWindow(QWidget):
         self.amount_input = QLineEdit()
         self.amount_input.setPlaceholderText("₹0.00")
         self.amount_input.setValidator(QDoubleValidator(0, 1000000, 2))
+        self.amount_input.textEdited.connect(lambda _text: self.new_request())
+        self.new_request()
 
         # Buttons
         btn_deposit = QPushButton("CONFIRM DEPOSIT")
@@ -127,12 +82,7 @@ class DepositWindow(QWidget):
 
         # Footer
         footer = QLabel("© Chirag")
-        footer.setStyleSheet("""
-            color: #555;
-            font-size: 12px;
-            font-weight: bold;
-            padding-top: 20px;
-        """)
+        footer.setObjectName("footer")
         footer.setAlignment(Qt.AlignRight)
 
         # Assembly
@@ -161,27 +111,35 @@ class DepositWindow(QWidget):
             return
             
         try:
-            amount = float(amount_text)
-            if amount <= 0:
+            amount = Money.parse(amount_text)
+            if amount.paise <= 0:
                 raise ValueError
-                
-            self.worker = DepositWorker(self.account_no, amount)
-            self.worker.finished.connect(self.handle_result)
-            self.worker.start()
-            
-            QMessageBox.information(self, "Processing", "Your deposit is being processed...")
         except ValueError:
             QMessageBox.warning(self, "Invalid Amount", "Please enter a positive number")
+            return
+
+        try:
+            job = get_executor().submit(post_deposit, self.account_no, amount, self.request_id,
+                                        key=("posting", self.account_no))
+        except ExecutorBusyError as e:
+            QMessageBox.warning(self, "Busy", str(e))
+            return
+        if job is None:
+            QMessageBox.information(self, "Processing", "A transaction on this account is already being processed")
+            return
+
+        self.job = job
+        self.job.succeeded.connect(lambda message: self.handle_result(True, message))
+        self.job.failed.connect(lambda error: self.handle_result(False, f"Error: {str(error)}"))
+        QMessageBox.information(self, "Processing", "Your deposit is being processed...")
 
     def handle_result(self, success, message):
         if success:
+            self.new_request()
             QMessageBox.information(self, "Success", message)
             self.close_and_return()
         else:
             QMessageBox.critical(self, "Error", message)
 
     def close_and_return(self):
-        from user_dashboard import UserDashboard
-        self.dashboard = UserDashboard(self.account_no)
-        self.dashboard.show()
-        self.close()
+        get_navigator().go("user_dashboard", account_no=self.account_no)
@@ -0,0 +1,13 @@
+# hashing.py
+# Kept free of Qt and database imports: auth_service runs these in worker processes
+import bcrypt
+
+
+def check_secret(secret, stored_hash):
+    """bcrypt comparison of a PIN or password against its stored hash"""
+    return bcrypt.checkpw(secret.encode('utf-8'), stored_hash.encode('utf-8'))
+
+
+def hash_secret(secret):
+    """bcrypt hash of a new PIN or password, as stored in the database"""
+    return bcrypt.hashpw(secret.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
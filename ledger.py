@@ -0,0 +1,219 @@
+# ledger.py
+from collections import namedtuple
+from datetime import datetime
+from db_config import transaction, retry_transient, get_backend
+from money import Money
+
+# What a committed posting reports back: its ledger row and the new balance (Money)
+Posting = namedtuple("Posting", "transaction_id balance")
+# A transfer's two legs, each a Posting on its own account
+Transfer = namedtuple("Transfer", "debit credit")
+
+
+class InsufficientFundsError(ValueError):
+    """Raised when a withdrawal would take an account below zero; balance and amount are Money"""
+
+    def __init__(self, acc_no, balance, amount):
+        super().__init__(
+            f"Insufficient balance: account {acc_no} has {balance}, cannot withdraw {amount}"
+        )
+        self.acc_no = acc_no
+        self.balance = balance
+        self.amount = amount
+
+
+class RequestIdConflictError(ValueError):
+    """Raised when a request id already posted is reused for a different posting"""
+
+    def __init__(self, request_id):
+        super().__init__(f"Request {request_id} was already used for a different posting")
+        self.request_id = request_id
+
+
+class AccountNotFoundError(LookupError):
+    """Raised when a posting targets an account that does not exist"""
+
+    def __init__(self, acc_no):
+        super().__init__(f"Account {acc_no} not found")
+        self.acc_no = acc_no
+
+
+REQUEST_ID_MAX = 64     # characters, as wide as transactions.request_id
+
+
+def check_request_id(request_id):
+    """ValueError unless request_id is None or fits the request_id column"""
+    if request_id is not None and not (isinstance(request_id, str) and 0 < len(request_id) <= REQUEST_ID_MAX):
+        raise ValueError(f"Request ids are strings of 1 to {REQUEST_ID_MAX} characters")
+
+
+def local_now():
+    """Timestamp for a new ledger row: local time to the second.
+
+    Writers pass it explicitly rather than lean on the column default,
+    which is UTC on SQLite databases created before the default was fixed.
+    """
+    return datetime.now().replace(microsecond=0)
+
+
+def _record(cursor, acc_no, txn_type, amount, request_id=None, counterparty=None):
+    """Insert the ledger row, with the balance it leaves, inside the posting's transaction"""
+    cursor.execute("SELECT balance_paise FROM users WHERE account_no = %s", (acc_no,))
+    balance = cursor.fetchone()[0]
+    cursor.execute(
+        "INSERT INTO transactions (account_no, type, amount_paise, request_id, counterparty, balance_after_paise, "
+        "timestamp) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+        (acc_no, txn_type, amount.paise, request_id, counterparty, balance, local_now())
+    )
+    return Posting(cursor.lastrowid, Money(balance))
+
+
+def replay(cursor, request_id, acc_no, txn_type, amount, counterparty=None):
+    """The Posting already made under request_id, or None.
+
+    Its balance is the account's balance now. A request id reused for a
+    different posting raises RequestIdConflictError.
+    """
+    cursor.execute(
+        "SELECT transaction_id, account_no, type, amount_paise, counterparty FROM transactions "
+        "WHERE request_id = %s",
+        (request_id,)
+    )
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    if tuple(row[1:]) != (acc_no, txn_type, amount.paise, counterparty):
+        raise RequestIdConflictError(request_id)
+    cursor.execute("SELECT balance_paise FROM users WHERE account_no = %s", (acc_no,))
+    return Posting(row[0], Money(cursor.fetchone()[0]))
+
+
+def _credit(cursor, acc_no, amount):
+    cursor.execute(
+        "UPDATE users SET balance_paise = balance_paise + %s WHERE account_no = %s",
+        (amount.paise, acc_no)
+    )
+    if cursor.rowcount != 1:
+        raise AccountNotFoundError(acc_no)
+
+
+def _debit(cursor, acc_no, amount):
+    cursor.execute(
+        "UPDATE users SET balance_paise = balance_paise - %s "
+        "WHERE account_no = %s AND balance_paise >= %s",
+        (amount.paise, acc_no, amount.paise)
+    )
+    if cursor.rowcount != 1:
+        cursor.execute("SELECT balance_paise FROM users WHERE account_no = %s", (acc_no,))
+        row = cursor.fetchone()
+        if row is None:
+            raise AccountNotFoundError(acc_no)
+        raise InsufficientFundsError(acc_no, Money(row[0]), amount)
+
+
+def _post(conn, cursor, acc_no, txn_type, amount, request_id):
+    change = _credit if txn_type == "Deposit" else _debit
+
+    def attempt():
+        try:
+            with transaction(conn):
+                if request_id is not None:
+                    posting = replay(cursor, request_id, acc_no, txn_type, amount)
+                    if posting is not None:
+                        return posting
+                change(cursor, acc_no, amount)
+                return _record(cursor, acc_no, txn_type, amount, request_id)
+        except Exception as e:
+            if request_id is None or not get_backend().is_duplicate_key(e):
+                raise
+        # A retry of the same request committed between our check and our insert
+        with transaction(conn):
+            return replay(cursor, request_id, acc_no, txn_type, amount)
+
+    return retry_transient(attempt)
+
+
+def deposit(conn, cursor, acc_no, amount, request_id=None):
+    """Credit an account by amount (Money) and record the deposit in one transaction.
+
+    With a request_id, repeating the call returns the first call's Posting
+    instead of crediting the account again.
+    """
+    return _post(conn, cursor, acc_no, "Deposit", amount, request_id)
+
+
+def withdraw(conn, cursor, acc_no, amount, request_id=None):
+    """Debit an account by amount (Money) and record the withdrawal in one transaction.
+
+    The balance check and the debit are a single conditional UPDATE, so the
+    row lock it takes serialises concurrent withdrawals on the same account
+    and none of them can overdraw it. request_id works as for deposit().
+    """
+    return _post(conn, cursor, acc_no, "Withdrawal", amount, request_id)
+
+
+def _replay_transfer(cursor, request_id, from_acc, to_acc, amount):
+    """The Transfer already made under request_id, or None"""
+    debit = replay(cursor, request_id, from_acc, "Withdrawal", amount, to_acc)
+    if debit is None:
+        return None
+    # The credit leg carries no request id; it is the first matching row after the debit
+    cursor.execute(
+        "SELECT MIN(transaction_id) FROM transactions WHERE account_no = %s AND counterparty = %s "
+        "AND type = 'Deposit' AND transaction_id > %s",
+        (to_acc, from_acc, debit.transaction_id)
+    )
+    credit_id = cursor.fetchone()[0]
+    cursor.execute("SELECT balance_paise FROM users WHERE account_no = %s", (to_acc,))
+    return Transfer(debit, Posting(credit_id, Money(cursor.fetchone()[0])))
+
+
+def transfer(conn, cursor, from_acc, to_acc, amount, request_id=None):
+    """Move amount (Money) from one account to another in one transaction; returns the Transfer.
+
+    Both accounts are locked up front in account-number order - the order
+    every multi-account writer uses - so two transfers running in opposite
+    directions between the same accounts queue behind each other instead
+    of deadlocking. The legs are a Withdrawal and a Deposit naming each
+    other's account as counterparty; the request id goes on the debit leg.
+    """
+    if from_acc == to_acc:
+        raise ValueError("Cannot transfer to the same account")
+
+    def attempt():
+        try:
+            with transaction(conn):
+                if request_id is not None:
+                    done = _replay_transfer(cursor, request_id, from_acc, to_acc, amount)
+                    if done is not None:
+                        return done
+                cursor.execute(
+                    f"SELECT account_no, balance_paise FROM users WHERE account_no IN (%s, %s) "
+                    f"ORDER BY account_no{get_backend().lock_rows}",
+                    sorted((from_acc, to_acc))
+                )
+                balances = dict(cursor.fetchall())
+                for acc_no in (from_acc, to_acc):
+                    if acc_no not in balances:
+                        raise AccountNotFoundError(acc_no)
+                if balances[from_acc] < amount.paise:
+                    raise InsufficientFundsError(from_acc, Money(balances[from_acc]), amount)
+
+                cursor.execute(
+                    "UPDATE users SET balance_paise = balance_paise - %s WHERE account_no = %s",
+                    (amount.paise, from_acc)
+                )
+                cursor.execute(
+                    "UPDATE users SET balance_paise = balance_paise + %s WHERE account_no = %s",
+                    (amount.paise, to_acc)
+                )
+                debit = _record(cursor, from_acc, "Withdrawal", amount, request_id, to_acc)
+                credit = _record(cursor, to_acc, "Deposit", amount, None, from_acc)
+                return Transfer(debit, credit)
+        except Exception as e:
+            if request_id is None or not get_backend().is_duplicate_key(e):
+                raise
+        with transaction(conn):
+            return _replay_transfer(cursor, request_id, from_acc, to_acc, amount)
+
+    return retry_transient(attempt)
@@ -0,0 +1,185 @@
+# ledger_export.py
+"""Export the transactions ledger to CSV or Parquet.
+
+    python ledger_export.py ledger.csv [--from 2025-04-01] [--to 2025-05-01] [--account 1001]
+    python ledger_export.py ledger.parquet [--chunk-size 10000]
+
+The format follows the file extension unless --format is given. Rows are
+read through an unbuffered cursor on a dedicated connection and written
+chunk by chunk (one Parquet row group per chunk), so memory depends on
+--chunk-size, not on the size of the ledger. --to is exclusive.
+
+The CSV amount column is in rupees ('1234.50'); Parquet stores the exact
+integer amount_paise. Parquet output needs pyarrow (pip install pyarrow).
+"""
+import argparse
+import csv
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from money import plain_rupees
+
+CHUNK_SIZE = 10000
+COLUMNS = ("transaction_id", "account_no", "type", "amount_paise", "timestamp")
+FORMATS = ("csv", "parquet")
+
+
+class ExportCancelled(Exception):
+    """Raised when should_stop() asks a running export to stop"""
+
+
+def export_query(start=None, end=None, acc_no=None):
+    """(sql, params) for the ledger rows to export, oldest first"""
+    sql = f"SELECT {', '.join(COLUMNS)} FROM transactions"
+    conditions = []
+    params = []
+    if acc_no is not None:
+        conditions.append("account_no = %s")
+        params.append(acc_no)
+    if start is not None:
+        conditions.append("timestamp >= %s")
+        params.append(start)
+    if end is not None:
+        conditions.append("timestamp < %s")
+        params.append(end)
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    # Both orderings are covered by the history indexes, so the server
+    # streams straight off an index instead of sorting the ledger first
+    sql += " ORDER BY timestamp, transaction_id"
+    return sql, params
+
+
+def iter_chunks(start=None, end=None, acc_no=None, chunk_size=CHUNK_SIZE):
+    """Yield lists of up to chunk_size ledger rows"""
+    from db_config import streaming_cursor
+    sql, params = export_query(start, end, acc_no)
+    with streaming_cursor() as (conn, cursor):
+        cursor.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+
+
+class CsvSink:
+    def __init__(self, path):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        # Same header bulk_import.py reads, so an export can be imported elsewhere
+        self._writer.writerow(("transaction_id", "account_no", "type", "amount", "timestamp"))
+
+    def write(self, rows):
+        self._writer.writerows(
+            (txn_id, acc_no, txn_type, plain_rupees(amount_paise), timestamp.isoformat(" "))
+            for txn_id, acc_no, txn_type, amount_paise, timestamp in rows
+        )
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+        self._pa = pa
+        self._schema = pa.schema([
+            ("transaction_id", pa.int64()),
+            ("account_no", pa.string()),
+            ("type", pa.string()),
+            ("amount_paise", pa.int64()),
+            ("timestamp", pa.timestamp("s")),
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema, compression="snappy")
+
+    def write(self, rows):
+        pa = self._pa
+        txn_ids, accounts, types, amounts, timestamps = zip(*rows)
+        table = pa.Table.from_arrays([
+            pa.array(txn_ids, pa.int64()),
+            pa.array(accounts, pa.string()),
+            pa.array(types, pa.string()),
+            pa.array(amounts, pa.int64()),
+            pa.array(timestamps, pa.timestamp("s")),
+        ], schema=self._schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        self._writer.close()
+
+
+SINKS = {"csv": CsvSink, "parquet": ParquetSink}
+
+
+def format_for(path):
+    """Export format implied by the file extension (CSV unless .parquet)"""
+    return "parquet" if path.lower().endswith((".parquet", ".pq")) else "csv"
+
+
+def export_ledger(path, fmt=None, start=None, end=None, acc_no=None, chunk_size=CHUNK_SIZE,
+                  progress=None, should_stop=None):
+    """Write the selected ledger rows to path; returns {'rows', 'chunks', 'elapsed'}.
+
+    A failed or cancelled export removes its partial file.
+    """
+    sink = SINKS[fmt or format_for(path)](path)
+    stats = {'rows': 0, 'chunks': 0}
+    started = time.monotonic()
+    try:
+        for rows in iter_chunks(start, end, acc_no, chunk_size):
+            if should_stop is not None and should_stop():
+                raise ExportCancelled(f"Export to {path} cancelled")
+            sink.write(rows)
+            stats['rows'] += len(rows)
+            stats['chunks'] += 1
+            if progress is not None:
+                progress(stats['rows'])
+    except BaseException:
+        sink.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+    sink.close()
+    stats['elapsed'] = time.monotonic() - started
+    logging.info(f"Exported {stats['rows']} ledger rows to {path} in {stats['elapsed']:.1f}s")
+    return stats
+
+
+def _date(text):
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a date: {text!r} (use YYYY-MM-DD[ HH:MM:SS])")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the transactions ledger")
+    parser.add_argument("output", help="file to write (.csv or .parquet)")
+    parser.add_argument("--format", choices=FORMATS, help="override the format implied by the extension")
+    parser.add_argument("--from", dest="start", type=_date, help="first timestamp to include")
+    parser.add_argument("--to", dest="end", type=_date, help="timestamp to stop before")
+    parser.add_argument("--account", help="only this account's transactions")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows fetched and written at a time")
+    args = parser.parse_args()
+
+    try:
+        stats = export_ledger(args.output, args.format, args.start, args.end, args.account,
+                              args.chunk_size)
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(2)
+    rate = stats['rows'] / stats['elapsed'] if stats['elapsed'] else 0.0
+    print(f"Exported {stats['rows']:,} rows to {args.output} in {stats['elapsed']:.1f}s ({rate:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
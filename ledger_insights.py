@@ -0,0 +1,265 @@
+# ledger_insights.py
+"""Ledger insights for the admin Insights screen: volume, average ticket,
+top accounts and an hour-of-week heatmap.
+
+    python ledger_insights.py [--days 30] [--top 10] [--charts DIR]
+
+The ledger is streamed with ledger_export.iter_chunks on a dedicated
+connection. Each chunk is turned into numpy columns and reduced with
+vectorised pandas group-bys to small partial totals, merged as the run
+goes, so memory depends on the chunk size and the number of accounts,
+not on the length of the ledger.
+
+Charts are drawn on matplotlib's Agg canvas without pyplot, so they can
+be rendered on a worker thread and handed to the GUI as PNG bytes.
+"""
+import argparse
+import io
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from ledger_export import iter_chunks
+from money import format_paise
+
+CHUNK_SIZE = 50000
+TOP_ACCOUNTS = 10
+MERGE_EVERY = 20            # chunks of per-account totals held before they are merged
+FLOW = ["deposits_paise", "deposit_count", "withdrawals_paise", "withdrawal_count"]
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+DEPOSIT_COLOR = "#2ecc71"
+WITHDRAW_COLOR = "#e74c3c"
+NET_COLOR = "#2C3E50"
+CHARTS = ("volume", "ticket", "heatmap", "accounts")
+
+
+class InsightsCancelled(Exception):
+    """Raised when should_stop() asks a running analysis to stop"""
+
+
+def chunk_columns(rows):
+    """A chunk of ledger rows as numpy columns: account_no, deposit flag, amount_paise, timestamp"""
+    _, accounts, types, amounts, timestamps = zip(*rows)
+    return (np.array(accounts, dtype=object),
+            np.array(types, dtype=object) == "Deposit",
+            np.array(amounts, dtype=np.int64),
+            # pandas parses datetimes in C, many times faster than np.array() over them
+            pd.DatetimeIndex(timestamps).values.astype("datetime64[s]"))
+
+
+def _merge(total, parts):
+    """Sum partial totals that share an index into total (None before the first chunk)"""
+    if total is not None:
+        parts = [total] + parts
+    return pd.concat(parts).groupby(level=0).sum()
+
+
+def _avg(volume, count):
+    """Average ticket in whole paise"""
+    return (volume / count.where(count > 0)).round().fillna(0).astype(np.int64)
+
+
+class LedgerInsights:
+    """Running totals over ledger chunks: add() each chunk, then read the results"""
+
+    def __init__(self):
+        self.rows = 0
+        self.elapsed = 0.0
+        self._daily = None
+        self._accounts = None
+        self._account_parts = []
+        # Postings by weekday (Monday first) and hour of day
+        self.heatmap = np.zeros((7, 24), dtype=np.int64)
+
+    def add(self, rows):
+        accounts, deposit, amount, timestamp = chunk_columns(rows)
+        day = timestamp.astype("datetime64[D]")
+        hour = (timestamp - day).astype("timedelta64[h]").astype(np.int64)
+        # 1970-01-01 was a Thursday
+        weekday = (day.astype(np.int64) + 3) % 7
+        self.heatmap += np.bincount(weekday * 24 + hour, minlength=7 * 24).reshape(7, 24)
+
+        frame = pd.DataFrame({
+            "day": day,
+            "account_no": accounts,
+            "amount_paise": amount,
+            "deposits_paise": np.where(deposit, amount, 0),
+            "deposit_count": deposit.astype(np.int64),
+            "withdrawals_paise": np.where(deposit, 0, amount),
+            "withdrawal_count": (~deposit).astype(np.int64),
+        })
+        self._daily = _merge(self._daily, [frame.groupby("day", sort=False)[FLOW].sum()])
+        self._account_parts.append(frame.groupby("account_no", sort=False).agg(
+            volume_paise=("amount_paise", "sum"), postings=("amount_paise", "size")))
+        if len(self._account_parts) >= MERGE_EVERY:
+            self._merge_accounts()
+        self.rows += len(rows)
+
+    def _merge_accounts(self):
+        if self._account_parts:
+            self._accounts = _merge(self._accounts, self._account_parts)
+            self._account_parts = []
+
+    def daily(self):
+        """Flow per day, oldest first: FLOW columns plus net_paise and avg_ticket_paise"""
+        if self._daily is None:
+            daily = pd.DataFrame({name: pd.Series(dtype=np.int64) for name in FLOW},
+                                 index=pd.DatetimeIndex([], name="day"))
+        else:
+            daily = self._daily.sort_index()
+        daily["net_paise"] = daily["deposits_paise"] - daily["withdrawals_paise"]
+        daily["avg_ticket_paise"] = _avg(daily["deposits_paise"] + daily["withdrawals_paise"],
+                                         daily["deposit_count"] + daily["withdrawal_count"])
+        return daily
+
+    def top_accounts(self, n=TOP_ACCOUNTS):
+        """The n accounts with the most volume: volume_paise, postings, avg_ticket_paise"""
+        self._merge_accounts()
+        if self._accounts is None:
+            return pd.DataFrame({name: pd.Series(dtype=np.int64)
+                                 for name in ("volume_paise", "postings", "avg_ticket_paise")})
+        top = self._accounts.nlargest(n, "volume_paise")
+        top["avg_ticket_paise"] = _avg(top["volume_paise"], top["postings"])
+        return top
+
+    def totals(self):
+        """Whole-period totals as a dict of ints"""
+        daily = self.daily()
+        totals = {name: int(daily[name].sum()) for name in FLOW}
+        totals['volume_paise'] = totals['deposits_paise'] + totals['withdrawals_paise']
+        postings = totals['deposit_count'] + totals['withdrawal_count']
+        totals['avg_ticket_paise'] = round(totals['volume_paise'] / postings) if postings else 0
+        self._merge_accounts()
+        totals['accounts'] = 0 if self._accounts is None else len(self._accounts)
+        return totals
+
+
+def analyze(start=None, end=None, chunk_size=CHUNK_SIZE, progress=None, should_stop=None):
+    """Stream the ledger rows from start (inclusive) to end (exclusive) into a LedgerInsights"""
+    insights = LedgerInsights()
+    started = time.monotonic()
+    for rows in iter_chunks(start, end, chunk_size=chunk_size):
+        if should_stop is not None and should_stop():
+            raise InsightsCancelled("Ledger analysis cancelled")
+        insights.add(rows)
+        if progress is not None:
+            progress(insights.rows)
+    insights.elapsed = time.monotonic() - started
+    logging.info(f"Analysed {insights.rows} ledger rows in {insights.elapsed:.1f}s")
+    return insights
+
+
+# Charts
+
+def _figure(size):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    figure = Figure(figsize=size, tight_layout=True)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _png(figure, dpi):
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=dpi)
+    return buffer.getvalue()
+
+
+def _rupees(paise):
+    return np.asarray(paise, dtype=np.float64) / 100
+
+
+def _volume_chart(figure, insights, top):
+    daily = insights.daily()
+    ax = figure.add_subplot()
+    days = daily.index
+    ax.bar(days, _rupees(daily["deposits_paise"]), color=DEPOSIT_COLOR, label="Deposits")
+    ax.bar(days, -_rupees(daily["withdrawals_paise"]), color=WITHDRAW_COLOR, label="Withdrawals")
+    ax.plot(days, _rupees(daily["net_paise"]), color=NET_COLOR, linewidth=1.5, label="Net flow")
+    ax.axhline(0, color="#7f8c8d", linewidth=0.8)
+    ax.set_title("Daily volume (₹)")
+    ax.legend(loc="upper left")
+    figure.autofmt_xdate()
+
+
+def _ticket_chart(figure, insights, top):
+    daily = insights.daily()
+    ax = figure.add_subplot()
+    ax.plot(daily.index, _rupees(daily["avg_ticket_paise"]), color="#3498db", marker=".")
+    ax.set_title("Average ticket per day (₹)")
+    ax.grid(alpha=0.3)
+    figure.autofmt_xdate()
+
+
+def _heatmap_chart(figure, insights, top):
+    ax = figure.add_subplot()
+    image = ax.imshow(insights.heatmap, aspect="auto", cmap="YlOrRd")
+    ax.set_yticks(range(7), WEEKDAYS)
+    ax.set_xticks(range(0, 24, 2), [f"{hour:02d}:00" for hour in range(0, 24, 2)])
+    ax.set_title("Postings by hour of the week")
+    figure.colorbar(image, ax=ax, label="Postings")
+
+
+def _accounts_chart(figure, insights, top):
+    accounts = insights.top_accounts(top).iloc[::-1]
+    ax = figure.add_subplot()
+    ax.barh(accounts.index.astype(str), _rupees(accounts["volume_paise"]), color="#9b59b6")
+    ax.set_title(f"Top {len(accounts)} accounts by volume (₹)")
+    ax.grid(axis="x", alpha=0.3)
+
+
+CHART_DRAWERS = {"volume": _volume_chart, "ticket": _ticket_chart,
+                 "heatmap": _heatmap_chart, "accounts": _accounts_chart}
+
+
+def render_charts(insights, top=TOP_ACCOUNTS, size=(9, 4.5), dpi=100):
+    """PNG bytes for each chart in CHARTS; safe to call off the GUI thread"""
+    charts = {}
+    for name in CHARTS:
+        figure = _figure(size)
+        if insights.rows:
+            CHART_DRAWERS[name](figure, insights, top)
+        else:
+            figure.text(0.5, 0.5, "No postings in this period", ha="center", va="center")
+        charts[name] = _png(figure, dpi)
+    return charts
+
+
+def build_report(start=None, end=None, top=TOP_ACCOUNTS, chunk_size=CHUNK_SIZE, progress=None,
+                 should_stop=None):
+    """analyze() and render_charts() for a background job; returns (insights, charts)"""
+    insights = analyze(start, end, chunk_size, progress, should_stop)
+    if should_stop is not None and should_stop():
+        raise InsightsCancelled("Ledger analysis cancelled")
+    return insights, render_charts(insights, top)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise the ledger: volume, average ticket, top accounts")
+    parser.add_argument("--days", type=int, help="only the last DAYS days (default: the whole ledger)")
+    parser.add_argument("--top", type=int, default=TOP_ACCOUNTS, help="how many top accounts to list")
+    parser.add_argument("--charts", metavar="DIR", help="also write the charts as PNG files to DIR")
+    args = parser.parse_args()
+
+    start = None if args.days is None else datetime.now() - timedelta(days=args.days)
+    insights = analyze(start)
+    totals = insights.totals()
+    print(f"{insights.rows:,} postings on {totals['accounts']:,} accounts in {insights.elapsed:.1f}s")
+    print(f"  deposits     {format_paise(totals['deposits_paise'])} ({totals['deposit_count']:,})")
+    print(f"  withdrawals  {format_paise(totals['withdrawals_paise'])} ({totals['withdrawal_count']:,})")
+    print(f"  avg ticket   {format_paise(totals['avg_ticket_paise'])}")
+    print(f"Top {args.top} accounts by volume:")
+    for acc_no, row in insights.top_accounts(args.top).iterrows():
+        print(f"  {acc_no:<20} {format_paise(int(row['volume_paise'])):>18} in {int(row['postings']):,} postings")
+    if args.charts:
+        os.makedirs(args.charts, exist_ok=True)
+        for name, png in render_charts(insights, args.top).items():
+            with open(os.path.join(args.charts, f"{name}.png"), "wb") as f:
+                f.write(png)
+        print(f"Charts written to {args.charts}")
+
+
+if __name__ == "__main__":
+    main()
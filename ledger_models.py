@@ -0,0 +1,229 @@
+# ledger_models.py
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from PyQt5.QtGui import QColor, QFont
+from db_executor import get_executor, ExecutorBusyError
+from bank_core import ledger
+from bank_core.ledger_service import PAGE_SIZE
+from money import format_paise
+
+MAX_CACHED_PAGES = 10
+
+
+class LedgerTableModel(QAbstractTableModel):
+    """Lazily paged view of the transactions table, optionally for one account.
+
+    Pages are fetched on the DB executor as the view scrolls; once the view
+    shows rows from the last loaded page, the next one is prefetched. Only
+    the MAX_CACHED_PAGES most recently used pages keep their rows; for the
+    rest just the keyset cursor is kept, so scrolling back re-fetches the page.
+    """
+
+    HEADERS = ["Account No", "Type", "Amount", "Timestamp"]
+    TYPE_COLORS = {
+        "deposit": QColor('#2ecc71'),   # Green for deposits
+        "withdraw": QColor('#e74c3c'),  # Red for withdrawals
+        "transfer": QColor('#3498db'),  # Blue for transfers
+    }
+
+    def __init__(self, account_no=None, page_size=PAGE_SIZE, max_cached_pages=MAX_CACHED_PAGES,
+                 parent=None):
+        super().__init__(parent)
+        self.account_no = account_no
+        self.page_size = page_size
+        self.max_cached_pages = max_cached_pages
+        self._reset_state()
+
+    def _reset_state(self):
+        self._pages = OrderedDict()     # page number -> rows, in LRU order
+        self._page_starts = []          # page number -> (key, inclusive) cursor
+        self._row_count = 0
+        self._last_key = None
+        self._exhausted = False
+        self._loading_next = False
+        self._pending_pages = set()
+        self._jobs = {}
+        self._generation = 0
+        self._started = False
+
+    def clear(self):
+        """Drop every row and stop loading until refresh() is called"""
+        self.beginResetModel()
+        generation = self._generation + 1
+        self._reset_state()
+        self._generation = generation
+        self.endResetModel()
+
+    def refresh(self):
+        """Drop everything and start again from the newest transaction"""
+        self.clear()
+        self._started = True
+        self.fetchMore(QModelIndex())
+
+    # Qt model API
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return QVariant()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return (self._started and not parent.isValid()
+                and not self._exhausted and not self._loading_next)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        page = len(self._page_starts)
+        if page == 0:
+            start = (None, False)
+        else:
+            # Continue after the last row of the previous page
+            start = (self._last_key, False)
+        self._loading_next = True
+        self._request_page(page, start)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        if index.row() >= self._row_count - self.page_size and self.canFetchMore():
+            self.fetchMore()
+        row = self._row(index.row())
+        if row is None:
+            return "…" if role == Qt.DisplayRole else QVariant()
+        value = self.cell_data(row, index.column(), role)
+        return QVariant() if value is None else value
+
+    def cell_data(self, row, col, role):
+        """Presentation of one LedgerService.history() row"""
+        _, account_no, txn_type, amount_paise, timestamp, _ = row
+        if role == Qt.DisplayRole:
+            return str((account_no, txn_type, format_paise(amount_paise), timestamp)[col])
+        if role == Qt.TextAlignmentRole:
+            if col == 2:  # Amount column
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+            return int(Qt.AlignCenter)
+        if role == Qt.ForegroundRole and col == 1:
+            txn_type = str(txn_type).lower()
+            for keyword, color in self.TYPE_COLORS.items():
+                if keyword in txn_type:
+                    return color
+        return None
+
+    # Paging
+
+    def _row(self, row_number):
+        page, offset = divmod(row_number, self.page_size)
+        rows = self._pages.get(page)
+        if rows is None:
+            # Evicted earlier: re-fetch it from its saved cursor
+            if page not in self._pending_pages:
+                self._request_page(page, self._page_starts[page])
+            return None
+        self._pages.move_to_end(page)
+        return rows[offset] if offset < len(rows) else None
+
+    def _request_page(self, page, start):
+        key, inclusive = start
+        try:
+            job = get_executor().submit(
+                ledger.history, self.account_no, key, inclusive, self.page_size,
+                key=("ledger-page", id(self), self._generation, page)
+            )
+        except ExecutorBusyError:
+            if page == len(self._page_starts):
+                self._loading_next = False
+            return
+        if job is None:
+            return
+        generation = self._generation
+        self._pending_pages.add(page)
+        self._jobs[page] = job
+        job.succeeded.connect(lambda rows: self._page_loaded(generation, page, start, rows))
+        job.failed.connect(lambda error: self._page_failed(generation, page))
+
+    def _page_loaded(self, generation, page, start, rows):
+        if generation != self._generation:
+            return
+        self._pending_pages.discard(page)
+        self._jobs.pop(page, None)
+
+        if page == len(self._page_starts):
+            # Next page at the bottom: grow the model
+            self._loading_next = False
+            if page == 0 and rows:
+                # Pin page 0 to what was newest at open, so pages never shift
+                # when tellers post while the admin scrolls
+                top = rows[0]
+                start = ((top[4], top[0]), True)
+            self._page_starts.append(start)
+            if len(rows) < self.page_size:
+                self._exhausted = True
+            if rows:
+                self._last_key = (rows[-1][4], rows[-1][0])
+                self._store_page(page, rows)
+                first = page * self.page_size
+                self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+                self._row_count += len(rows)
+                self.endInsertRows()
+        elif rows:
+            # Re-fetched page that had been evicted
+            self._store_page(page, rows)
+            first = page * self.page_size
+            self.dataChanged.emit(
+                self.index(first, 0),
+                self.index(first + len(rows) - 1, self.columnCount() - 1)
+            )
+
+    def _page_failed(self, generation, page):
+        if generation != self._generation:
+            return
+        self._pending_pages.discard(page)
+        self._jobs.pop(page, None)
+        if page == len(self._page_starts):
+            self._loading_next = False
+
+    def _store_page(self, page, rows):
+        self._pages[page] = rows
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.max_cached_pages:
+            self._pages.popitem(last=False)
+
+
+class AccountHistoryModel(LedgerTableModel):
+    """One customer's history, styled for the TransactionHistory screen"""
+
+    HEADERS = ["Type", "Amount", "Balance", "Date & Time"]
+    DEPOSIT_COLOR = QColor(46, 204, 113)    # Green
+    WITHDRAW_COLOR = QColor(231, 76, 60)    # Red
+    AMOUNT_FONT = QFont("Verdana", 12, QFont.Bold)
+
+    def __init__(self, account_no, parent=None):
+        super().__init__(account_no=account_no, parent=parent)
+
+    def cell_data(self, row, col, role):
+        _, _, txn_type, amount_paise, timestamp, balance_after_paise = row
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return txn_type.upper()
+            if col == 1:
+                return format_paise(amount_paise)
+            if col == 2:
+                # Rows from before the running balance was recorded and not yet backfilled
+                return "—" if balance_after_paise is None else format_paise(balance_after_paise)
+            return timestamp.strftime("%d %b %Y, %I:%M %p")
+        if role == Qt.TextAlignmentRole:
+            if col in (1, 2):
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+            return int(Qt.AlignCenter)
+        if role == Qt.ForegroundRole and col in (0, 1):
+            return self.DEPOSIT_COLOR if txn_type == "Deposit" else self.WITHDRAW_COLOR
+        if role == Qt.FontRole and col == 1:
+            return self.AMOUNT_FONT
+        return None
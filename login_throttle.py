@@ -0,0 +1,85 @@
+# login_throttle.py
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+
+MAX_FAILURES = 5                        # failed attempts per account/username ...
+FAILURE_WINDOW = 300                    # ... within this many seconds ...
+LOCKOUT_SECONDS = 300                   # ... lock it out for this long
+MAX_TRACKED = 10000                     # identities with recent failures kept at once
+
+
+class LockedOutError(Exception):
+    """Login refused because the identity is locked out after too many failures"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Too many failed attempts. Try again in {retry_after // 60 + 1} minute(s).")
+        self.retry_after = retry_after
+
+
+class LoginThrottle:
+    """Failed login attempts per identity, and the lockouts they earn.
+
+    Identities are whatever was typed, so the tables are pruned as they
+    go: failures older than the window and expired lockouts are dropped,
+    and past max_tracked identities the one that failed longest ago is
+    forgotten. A burst of random account numbers cannot grow them
+    without limit. Safe to share between threads.
+    """
+
+    def __init__(self, max_failures=MAX_FAILURES, window=FAILURE_WINDOW, lockout=LOCKOUT_SECONDS,
+                 max_tracked=MAX_TRACKED):
+        self.max_failures = max_failures
+        self.window = window
+        self.lockout = lockout
+        self.max_tracked = max_tracked
+        self._lock = threading.Lock()
+        self._failures = OrderedDict()      # key -> deque of failure times, most recent failure last
+        self._locked_until = OrderedDict()  # key -> monotonic time, earliest expiry first
+
+    def lockout_remaining(self, key):
+        """Whole seconds key stays locked out, 0 if it may try"""
+        with self._lock:
+            self._prune(time.monotonic())
+            until = self._locked_until.get(key)
+            return 0 if until is None else int(until - time.monotonic())
+
+    def check(self, key):
+        """Raise LockedOutError if key is locked out"""
+        remaining = self.lockout_remaining(key)
+        if remaining:
+            raise LockedOutError(remaining)
+
+    def record(self, key, ok):
+        """Count a login attempt; the max_failures-th failure in the window locks key out"""
+        now = time.monotonic()
+        with self._lock:
+            if ok:
+                self._failures.pop(key, None)
+                return
+            failures = self._failures.pop(key, None) or deque()
+            failures.append(now)
+            while failures[0] < now - self.window:
+                failures.popleft()
+            if len(failures) >= self.max_failures:
+                self._locked_until.pop(key, None)
+                self._locked_until[key] = now + self.lockout
+                logging.warning(f"Locked out {key[0]} {key[1]} after {self.max_failures} failed logins")
+            else:
+                self._failures[key] = failures
+            self._prune(now)
+
+    def _prune(self, now):
+        # Both tables are in time order, so only their heads can be stale
+        while self._failures and next(iter(self._failures.values()))[-1] < now - self.window:
+            self._failures.popitem(last=False)
+        while len(self._failures) > self.max_tracked:
+            self._failures.popitem(last=False)
+        while self._locked_until and next(iter(self._locked_until.values())) <= now:
+            self._locked_until.popitem(last=False)
+
+    def tracked(self):
+        """(identities with recent failures, identities locked out)"""
+        with self._lock:
+            return len(self._failures), len(self._locked_until)
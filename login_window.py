@@ -2,11 +2,12 @@
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QMessageBox
 )
-from PyQt5.QtGui import QPixmap, QDoubleValidator, QFont
+from PyQt5.QtGui import QDoubleValidator, QFont
 from PyQt5.QtCore import Qt
-import bcrypt
 from exception_handler import install_exception_handler
-import logging
+from auth_service import auth_service
+from navigation import get_navigator
+from assets import logo_pixmap
 
 
 install_exception_handler()
@@ -21,66 +22,20 @@ class LoginWindow(QWidget):
         self.resize(600, 500)
         self.init_ui()
 
+    def activate(self):
+        """
+        Clears what the previous visitor typed.
+        """
+        self.account_input.clear()
+        self.pin_input.clear()
+        self.btn_login.setEnabled(True)
+
     def init_ui(self):
         """
         Initializes the user interface of the login window with a styled layout.
         """
         
-        self.setStyleSheet("""
-            QWidget { 
-                background-color: #FFF1D0; 
-                font-family: 'Verdana'; 
-            }
-            QLabel { 
-                color: #333333; 
-                font-size: 16px; 
-            }
-            QLineEdit {
-                padding: 12px; 
-                border: 2px solid #FFB347; 
-                border-radius: 8px;
-                font-size: 14px; 
-                min-width: 280px; 
-                background: white;
-            }
-            QPushButton {
-                padding: 14px; 
-                font-weight: bold; 
-                font-size: 16px;
-                min-width: 280px; 
-                border-radius: 8px; 
-                margin: 8px 0; 
-                border: none;
-                /* Add a subtle shadow to make the buttons pop out */
-                box-shadow: 2px 2px 5px rgba(0, 0, 0, 0.2);
-            }
-            #title { 
-                font-size: 28px; 
-                font-weight: bold; 
-                color: #2C3E50; 
-            }
-            #login_btn { 
-                background-color: #3498DB; 
-                color: white; 
-            }
-            #login_btn:hover { 
-                background-color: #2980B9; 
-            }
-            #register_btn { 
-                background-color: #2ECC71; 
-                color: white; 
-            }
-            #register_btn:hover { 
-                background-color: #27AE60; 
-            }
-            #back_btn { 
-                background-color: #FFB347; 
-                color: #000; 
-            }
-            #back_btn:hover { 
-                background-color: #FFA500; 
-            }
-        """)
+        self.setObjectName("LoginWindow")
 
         layout = QVBoxLayout()
         layout.setContentsMargins(60, 40, 60, 40)
@@ -88,7 +43,7 @@ class LoginWindow(QWidget):
 
         # Logo and Title
         logo = QLabel()
-        logo.setPixmap(QPixmap("logo.png").scaled(100, 100, Qt.KeepAspectRatio))
+        logo.setPixmap(logo_pixmap(100))
         logo.setAlignment(Qt.AlignCenter)
         
         title = QLabel("Bank Mate Login")
@@ -109,9 +64,9 @@ class LoginWindow(QWidget):
         self.pin_input.setValidator(QDoubleValidator(0, 9999, 0))
 
         # Buttons 
-        btn_login = QPushButton("LOGIN")
-        btn_login.setObjectName("login_btn")
-        btn_login.clicked.connect(self.login)
+        self.btn_login = QPushButton("LOGIN")
+        self.btn_login.setObjectName("login_btn")
+        self.btn_login.clicked.connect(self.login)
 
         btn_register = QPushButton("CREATE NEW ACCOUNT")
         btn_register.setObjectName("register_btn")
@@ -132,7 +87,7 @@ class LoginWindow(QWidget):
         layout.addWidget(self.account_input)
         layout.addWidget(lbl_pin)
         layout.addWidget(self.pin_input)
-        layout.addWidget(btn_login)
+        layout.addWidget(self.btn_login)
         layout.addWidget(btn_register)
         layout.addWidget(btn_back)
         layout.addStretch()
@@ -151,47 +106,31 @@ class LoginWindow(QWidget):
             QMessageBox.warning(self, "Error", "Please fill in all fields")
             return
 
-        try:
-            from db_config import get_db_connection
-            conn, cursor = get_db_connection()
-            
-            cursor.execute("SELECT pin_hash FROM users WHERE account_no = %s", (acc_no,))
-            result = cursor.fetchone()
-
-            if result:
-                stored_hash = result[0].encode('utf-8')
-                if bcrypt.checkpw(pin.encode('utf-8'), stored_hash):
-                    QMessageBox.information(self, "Success", "Login Successful!")
-                    from user_dashboard import UserDashboard
-                    self.dashboard = UserDashboard(acc_no)
-                    self.dashboard.show()
-                    self.close()
-                else:
-                    QMessageBox.warning(self, "Error", "Incorrect PIN")
-            else:
-                QMessageBox.warning(self, "Error", "Account not found")
-
-        except Exception as e:
-            logging.error(f"Login error: {str(e)}")
-            QMessageBox.critical(self, "Error", f"An unexpected error occurred: {str(e)}")
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        # The PIN is checked off the GUI thread; the window stays responsive
+        self.btn_login.setEnabled(False)
+        self.auth_request = auth_service.verify_customer(acc_no, pin)
+        self.auth_request.finished.connect(
+            lambda ok, message: self.handle_login(acc_no, ok, message))
+
+    def handle_login(self, acc_no, ok, message):
+        """
+        Opens the dashboard on success, otherwise reports why the login failed.
+        """
+        self.btn_login.setEnabled(True)
+        if ok:
+            QMessageBox.information(self, "Success", "Login Successful!")
+            get_navigator().go("user_dashboard", account_no=acc_no)
+        else:
+            QMessageBox.warning(self, "Error", message)
 
     def open_register_window(self):
         """
-        Opens the registration window and closes the current one.
+        Switches to the registration screen.
         """
-        from register_window import RegisterWindow
-        self.register_window = RegisterWindow()
-        self.register_window.show()
-        self.close()
+        get_navigator().go("register")
 
     def go_back(self):
         """
-        Returns to the main menu and closes the current window.
+        Returns to the main menu.
         """
-        from main import MainWindow
-        self.main_window = MainWindow()
-        self.main_window.show()
-        self.close()
+        get_navigator().go("main")
@@ -1,48 +1,35 @@
 # main
 import sys
+import multiprocessing
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QHBoxLayout
-from PyQt5.QtGui import QPixmap
 from PyQt5.QtCore import Qt
 from exception_handler import install_exception_handler
+from db_config import log_pool_stats
+from db_executor import log_executor_stats
+from account_cache import account_cache
+from auth_service import auth_service
+from navigation import get_navigator
+from assets import logo_pixmap
+from theme import apply_theme
+from async_bridge import shutdown_bridge
+from bank_core import ledger_writer
 
 class MainWindow(QWidget):
     def __init__(self):
         super().__init__()
         install_exception_handler()
         self.setWindowTitle("Welcome to Bank Mate")
-        self.showMaximized()
         self.init_ui()
 
     def init_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #FFF1D0;
-                font-family: 'Verdana';
-            }
-            .login-option {
-                background-color: white;
-                border-radius: 10px;
-                padding: 30px;
-                margin: 20px;
-                min-width: 250px;
-                border: 3px solid;
-            }
-            .login-option:hover {
-                background-color: #f5f5f5;
-            }
-            #title {
-                font-size: 28px;
-                font-weight: bold;
-                color: #2C3E50;
-            }
-        """)
+        self.setObjectName("MainWindow")
 
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(50, 30, 50, 30)
         main_layout.setSpacing(20)
 
         logo = QLabel()
-        logo.setPixmap(QPixmap("logo.png").scaledToWidth(650))
+        logo.setPixmap(logo_pixmap(650))
         logo.setAlignment(Qt.AlignCenter)
 
         title = QLabel("🏦 Welcome to Bank Mate")
@@ -61,7 +48,7 @@ class MainWindow(QWidget):
         options_layout.addWidget(admin_option)
 
         footer = QLabel("© Chirag")
-        footer.setStyleSheet("color: #555; font-size: 12px; font-weight: bold;")
+        footer.setObjectName("footer")
         footer.setAlignment(Qt.AlignRight)
 
         main_layout.addStretch()
@@ -94,19 +81,27 @@ class MainWindow(QWidget):
         return box
 
     def open_user_login(self):
-        from login_window import LoginWindow
-        self.login_window = LoginWindow()
-        self.login_window.show()
-        self.close()
+        get_navigator().go("login")
 
     def open_admin_login(self):
-        from admin_login import AdminLoginWindow
-        self.admin_login = AdminLoginWindow()
-        self.admin_login.show()
-        self.close()
+        get_navigator().go("admin_login")
 
 if __name__ == "__main__":
+    # bcrypt workers are separate processes; needed for the packaged build
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
+    apply_theme(app)
+    app.aboutToQuit.connect(log_executor_stats)
+    app.aboutToQuit.connect(log_pool_stats)
+    app.aboutToQuit.connect(account_cache.log_stats)
+    app.aboutToQuit.connect(auth_service.shutdown)
+    app.aboutToQuit.connect(shutdown_bridge)
+    if ledger_writer is not None:
+        app.aboutToQuit.connect(ledger_writer.close)
+        app.aboutToQuit.connect(ledger_writer.log_stats)
+    # One window for the whole session; screens are swapped inside it
+    navigator = get_navigator()
+    app.aboutToQuit.connect(navigator.log_stats)
+    navigator.go("main")
+    navigator.showMaximized()
     sys.exit(app.exec_())
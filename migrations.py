@@ -0,0 +1,438 @@
+# migrations.py
+"""Versioned schema migrations.
+
+Brings any pybank database - one created from an older database_setup.sql
+or one built to match the application's queries - to the canonical schema
+in database_setup.sql. Applied versions are recorded in schema_migrations.
+
+    python migrations.py            apply pending migrations
+    python migrations.py --status   list applied and pending migrations
+
+Every migration checks the live schema before changing it, so a run that
+was interrupted can simply be started again.
+"""
+import argparse
+import logging
+import time
+
+BATCH_SIZE = 5000       # rows per batch for data migrations
+BATCH_PAUSE = 0.05      # seconds between batches, so tellers' postings get the locks
+
+MIGRATIONS = []
+
+
+def migration(version, description):
+    """Register a migration step; steps run in version order"""
+    def register(fn):
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda step: step[0])
+        return fn
+    return register
+
+
+def batched_update(cursor, table, assignments, where, params=(), key="transaction_id",
+                   batch_size=None):
+    """UPDATE a large table in primary-key ranges, one short autocommit transaction each.
+
+    Walking key ranges keeps every batch to a bounded number of row locks
+    and works the same on MySQL and SQLite (neither allows LIMIT here portably).
+    """
+    cursor.execute(f"SELECT MIN({key}), MAX({key}) FROM {table}")
+    low, high = cursor.fetchone()
+    if low is None:
+        return 0
+
+    batch_size = batch_size or BATCH_SIZE
+    updated = 0
+    start = low - 1
+    while start < high:
+        end = start + batch_size
+        cursor.execute(
+            f"UPDATE {table} SET {assignments} WHERE ({where}) AND {key} > %s AND {key} <= %s",
+            (*params, start, end)
+        )
+        updated += max(cursor.rowcount, 0)
+        start = end
+        if start < high:
+            time.sleep(BATCH_PAUSE)
+    return updated
+
+
+# Legacy column -> canonical column, with the MySQL definition when the type changes too
+COLUMN_RENAMES = [
+    ("users", "account_number", "account_no", None),
+    ("users", "username", "name", None),
+    ("users", "pin", "pin_hash", "VARCHAR(100) NOT NULL"),
+    ("transactions", "account_number", "account_no", None),
+    ("admins", "password", "password_hash", None),
+]
+
+
+@migration(1, "Reconcile column names with the application")
+def reconcile_column_names(conn, cursor, backend):
+    for table, old, new, definition in COLUMN_RENAMES:
+        columns = backend.columns(cursor, table)
+        if old in columns and new not in columns:
+            logging.info(f"Migration: renaming {table}.{old} to {new}")
+            backend.rename_column(cursor, table, old, new, definition)
+
+    # users.password came from the original script but nothing reads or
+    # writes it; relax it so account creation no longer fails on it
+    if backend.name == "mysql" and "password" in backend.columns(cursor, "users"):
+        cursor.execute("ALTER TABLE users MODIFY password VARCHAR(100) NULL")
+
+
+@migration(2, "Normalise legacy 'Withdraw' ledger rows to 'Withdrawal'")
+def normalize_withdrawal_type(conn, cursor, backend):
+    # '' is what a non-strict MySQL stored for 'Withdraw' in the ENUM column
+    legacy = ("Withdraw",) if backend.name == "sqlite" else ("Withdraw", "")
+    placeholders = ", ".join(["%s"] * len(legacy))
+    if backend.name == "mysql":
+        column_type = backend.columns(cursor, "transactions")["type"]
+        if not column_type.lower().startswith("enum"):
+            updated = batched_update(cursor, "transactions", "type = 'Withdrawal'",
+                                     f"type IN ({placeholders})", legacy)
+            cursor.execute("ALTER TABLE transactions MODIFY type ENUM('Deposit', 'Withdrawal') NOT NULL")
+            logging.info(f"Migration: {updated} withdrawal rows normalised")
+            return
+
+    updated = batched_update(cursor, "transactions", "type = 'Withdrawal'",
+                             f"type IN ({placeholders})", legacy)
+    logging.info(f"Migration: {updated} withdrawal rows normalised")
+
+
+HOT_PATH_INDEXES = [
+    # Customer history: WHERE account_no = ? ORDER BY timestamp, transaction_id
+    ("transactions", "idx_transactions_account_page",
+     ("account_no", "timestamp", "transaction_id", "type", "amount")),
+    # Admin ledger view: ORDER BY timestamp, transaction_id over all accounts
+    ("transactions", "idx_transactions_ledger_page",
+     ("timestamp", "transaction_id", "account_no", "type", "amount")),
+]
+
+
+@migration(3, "Covering indexes for history and admin ledger paging")
+def hot_path_indexes(conn, cursor, backend):
+    for table, name, columns in HOT_PATH_INDEXES:
+        if name not in backend.indexes(cursor, table):
+            logging.info(f"Migration: building index {name}")
+            backend.add_index(cursor, table, name, columns)
+
+
+# Old DECIMAL rupee column -> BIGINT paise column, its final MySQL definition
+# and the integer key to backfill by (None: small enough for one UPDATE)
+MONEY_COLUMNS = [
+    ("users", "balance", "balance_paise", "BIGINT NOT NULL DEFAULT 0", None),
+    ("transactions", "amount", "amount_paise", "BIGINT NOT NULL", "transaction_id"),
+]
+
+PAISE_INDEXES = {
+    "transactions": [
+        ("idx_transactions_account_page",
+         ("account_no", "timestamp", "transaction_id", "type", "amount_paise")),
+        ("idx_transactions_ledger_page",
+         ("timestamp", "transaction_id", "account_no", "type", "amount_paise")),
+    ],
+}
+
+
+@migration(4, "Store money as integer paise")
+def money_as_paise(conn, cursor, backend):
+    # Stop every terminal on the previous release first: it still writes
+    # the rupee columns this step removes.
+    # The new column is filled before the old one is dropped, so a run that
+    # stops part way picks up where it left off.
+    for table, old, new, definition, key in MONEY_COLUMNS:
+        columns = backend.columns(cursor, table)
+        if new not in columns:
+            logging.info(f"Migration: adding {table}.{new}")
+            backend.add_column(cursor, table, new, "BIGINT NULL")
+        if old in columns:
+            if key is not None:
+                filled = batched_update(cursor, table, f"{new} = ROUND({old} * 100)", f"{new} IS NULL",
+                                        key=key)
+            else:
+                cursor.execute(f"UPDATE {table} SET {new} = ROUND({old} * 100) WHERE {new} IS NULL")
+                filled = max(cursor.rowcount, 0)
+            logging.info(f"Migration: {filled} {table} rows converted to paise")
+            backend.drop_column(cursor, table, old, PAISE_INDEXES.get(table, ()))
+        if backend.name == "mysql":
+            cursor.execute(
+                "SELECT IS_NULLABLE FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+                (table, new)
+            )
+            if cursor.fetchone()[0] == "YES":
+                cursor.execute(f"ALTER TABLE {table} MODIFY {new} {definition}")
+
+    for table, indexes in PAISE_INDEXES.items():
+        existing = backend.indexes(cursor, table)
+        for name, columns in indexes:
+            if name not in existing:
+                backend.add_index(cursor, table, name, columns)
+
+
+@migration(5, "Client request ids for idempotent postings")
+def posting_request_ids(conn, cursor, backend):
+    # NULL for postings made without one; unique indexes allow any number of NULLs
+    if "request_id" not in backend.columns(cursor, "transactions"):
+        logging.info("Migration: adding transactions.request_id")
+        backend.add_column(cursor, "transactions", "request_id", "VARCHAR(64) NULL")
+    if "uq_transactions_request_id" not in backend.indexes(cursor, "transactions"):
+        backend.add_index(cursor, "transactions", "uq_transactions_request_id", ("request_id",), unique=True)
+
+
+@migration(6, "Counterparty account on transfer legs")
+def transfer_counterparty(conn, cursor, backend):
+    # NULL on deposits and withdrawals; each transfer leg names the other account
+    if "counterparty" not in backend.columns(cursor, "transactions"):
+        logging.info("Migration: adding transactions.counterparty")
+        backend.add_column(cursor, "transactions", "counterparty", "VARCHAR(20) NULL")
+
+
+RECONCILE_TABLES = [
+    # Each account's balance and ledger total as last reconciled
+    """CREATE TABLE IF NOT EXISTS reconcile_state (
+        account_no VARCHAR(20) PRIMARY KEY,
+        balance_paise BIGINT NOT NULL,
+        ledger_paise BIGINT NOT NULL,
+        ledger_rows INT NOT NULL,
+        checked_at DATETIME NOT NULL
+    )""",
+    # One row per finished run; the newest watermark starts the next incremental run
+    """CREATE TABLE IF NOT EXISTS reconcile_runs (
+        run_id INT PRIMARY KEY,
+        mode VARCHAR(12) NOT NULL,
+        watermark BIGINT NOT NULL,
+        accounts_checked INT NOT NULL,
+        discrepancies INT NOT NULL,
+        finished_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )""",
+]
+
+
+@migration(7, "Balance reconciliation state")
+def reconcile_state(conn, cursor, backend):
+    for statement in RECONCILE_TABLES:
+        cursor.execute(statement)
+
+
+def backfill_running_balances(conn, cursor, backend, batch_size=None):
+    """Fill balance_after_paise on ledger rows written before it existed.
+
+    Each account's rows are walked backwards through its history -
+    (timestamp, transaction_id) descending, the order the history index
+    keeps - starting from its current balance_paise, so an opening balance
+    that never went through the ledger is still counted. Each page of rows
+    is one short transaction holding the account's lock, so postings to
+    it wait for at most a page; the first page reads the balance under the
+    same lock. Rows that already have a value keep it, and the walk
+    restarts from each account's latest row, so an interrupted run can
+    simply be started again. Accounts whose ledger does not add up to
+    their balance are logged with the amount the ledger leaves unexplained.
+    """
+    batch_size = batch_size or BATCH_SIZE
+    cursor.execute("SELECT DISTINCT account_no FROM transactions WHERE balance_after_paise IS NULL")
+    accounts = sorted(row[0] for row in cursor.fetchall())
+    filled = 0
+    for acc_no in accounts:
+        running = None
+        key = None
+        while True:
+            sql = ("SELECT transaction_id, timestamp, type, amount_paise, balance_after_paise "
+                   "FROM transactions WHERE account_no = %s")
+            params = [acc_no]
+            if key is not None:
+                sql += " AND (timestamp < %s OR (timestamp = %s AND transaction_id < %s))"
+                params += [key[0], key[0], key[1]]
+            sql += " ORDER BY timestamp DESC, transaction_id DESC LIMIT %s"
+            params.append(batch_size)
+
+            backend.begin(conn)
+            try:
+                cursor.execute(f"SELECT balance_paise FROM users WHERE account_no = %s{backend.lock_rows}",
+                               (acc_no,))
+                balance = cursor.fetchall()
+                if running is None:
+                    # Rows of a deleted account have nothing to anchor on; leave them
+                    if not balance:
+                        conn.commit()
+                        logging.warning(f"Running balances: account {acc_no} no longer exists, skipped")
+                        break
+                    running = balance[0][0]
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+                updates = []
+                for txn_id, timestamp, txn_type, amount, balance_after in rows:
+                    if balance_after is None:
+                        updates.append((running, txn_id))
+                    running -= amount if txn_type == "Deposit" else -amount
+                if updates:
+                    cursor.executemany(
+                        "UPDATE transactions SET balance_after_paise = %s "
+                        "WHERE transaction_id = %s AND balance_after_paise IS NULL",
+                        updates
+                    )
+                    filled += len(updates)
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+            if len(rows) < batch_size:
+                if running:
+                    logging.warning(f"Running balances: the ledger of account {acc_no} leaves {running} paise "
+                                    f"of its balance unexplained (an opening balance, or drift)")
+                break
+            key = (rows[-1][1], rows[-1][0])
+            time.sleep(BATCH_PAUSE)
+    return filled
+
+
+@migration(8, "Running balance on every ledger row")
+def running_balances(conn, cursor, backend):
+    # Postings fill it from now on; rows written before this are backfilled
+    if "balance_after_paise" not in backend.columns(cursor, "transactions"):
+        logging.info("Migration: adding transactions.balance_after_paise")
+        backend.add_column(cursor, "transactions", "balance_after_paise", "BIGINT NULL")
+    filled = backfill_running_balances(conn, cursor, backend)
+    logging.info(f"Migration: {filled} ledger rows given their running balance")
+
+
+ROLLUP_TABLES = [
+    # Ledger totals per day, per month and per account per month; rollups.py keeps them up to date
+    """CREATE TABLE IF NOT EXISTS ledger_daily (
+        day DATE PRIMARY KEY,
+        deposits_paise BIGINT NOT NULL,
+        deposit_count INT NOT NULL,
+        withdrawals_paise BIGINT NOT NULL,
+        withdrawal_count INT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS ledger_monthly (
+        month DATE PRIMARY KEY,
+        deposits_paise BIGINT NOT NULL,
+        deposit_count INT NOT NULL,
+        withdrawals_paise BIGINT NOT NULL,
+        withdrawal_count INT NOT NULL,
+        active_accounts INT NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS account_monthly (
+        account_no VARCHAR(20) NOT NULL,
+        month DATE NOT NULL,
+        deposits_paise BIGINT NOT NULL,
+        deposit_count INT NOT NULL,
+        withdrawals_paise BIGINT NOT NULL,
+        withdrawal_count INT NOT NULL,
+        PRIMARY KEY (account_no, month)
+    )""",
+    # How far through the ledger the rollups are, and the next stopping point
+    """CREATE TABLE IF NOT EXISTS rollup_state (
+        name VARCHAR(20) PRIMARY KEY,
+        watermark BIGINT NOT NULL,
+        mark BIGINT NULL,
+        marked_at DATETIME NULL
+    )""",
+]
+
+
+@migration(9, "Daily and monthly ledger rollups")
+def ledger_rollups(conn, cursor, backend):
+    for statement in ROLLUP_TABLES:
+        cursor.execute(statement)
+    cursor.execute("SELECT 1 FROM rollup_state WHERE name = 'ledger'")
+    if cursor.fetchone() is None:
+        cursor.execute("INSERT INTO rollup_state (name, watermark) VALUES ('ledger', 0)")
+
+
+def _ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(200) NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def applied_versions(cursor):
+    _ensure_version_table(cursor)
+    cursor.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def migrate(conn, backend, target=None):
+    """Apply pending migrations up to target (default: all) on an autocommit connection"""
+    cursor = conn.cursor(buffered=True)
+    locked = False
+    try:
+        if backend.name == "mysql":
+            # Only one terminal migrates at a time
+            cursor.execute("SELECT GET_LOCK('bankmate_migrations', 300)")
+            locked = cursor.fetchone()[0] == 1
+            if not locked:
+                raise RuntimeError("Another process is migrating the database")
+
+        done = applied_versions(cursor)
+        applied = []
+        for version, description, step in MIGRATIONS:
+            if version in done or (target is not None and version > target):
+                continue
+            logging.info(f"Applying migration {version}: {description}")
+            started = time.perf_counter()
+            step(conn, cursor, backend)
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (version, description)
+            )
+            logging.info(f"Migration {version} done in {time.perf_counter() - started:.1f}s")
+            applied.append(version)
+        return applied
+    finally:
+        if locked:
+            cursor.execute("SELECT RELEASE_LOCK('bankmate_migrations')")
+            cursor.fetchone()
+        cursor.close()
+
+
+def main():
+    global BATCH_SIZE
+    parser = argparse.ArgumentParser(description="Bring the pybank database to the current schema")
+    parser.add_argument("--status", action="store_true", help="show applied and pending migrations")
+    parser.add_argument("--target", type=int, help="stop after this version")
+    parser.add_argument("--backfill-balances", action="store_true",
+                        help="fill in running balances missing from ledger rows (needs migration 8)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="rows per batch for data migrations")
+    args = parser.parse_args()
+    BATCH_SIZE = args.batch_size
+
+    from db_config import get_backend
+    backend = get_backend()
+    conn = backend.connect()
+    try:
+        if args.status:
+            cursor = conn.cursor(buffered=True)
+            done = applied_versions(cursor)
+            cursor.close()
+            for version, description, _ in MIGRATIONS:
+                state = "applied" if version in done else "pending"
+                print(f"{version:>4}  {state:<8} {description}")
+            return
+        if args.backfill_balances:
+            # Rows written after migration 8 by a terminal that predates it have none
+            cursor = conn.cursor(buffered=True)
+            try:
+                if 8 not in applied_versions(cursor):
+                    parser.error("migration 8 adds the running balance column; run the migrations first")
+                filled = backfill_running_balances(conn, cursor, backend)
+            finally:
+                cursor.close()
+            print(f"Filled the running balance on {filled:,} ledger rows")
+            return
+        applied = migrate(conn, backend, args.target)
+        print(f"Applied migrations: {applied}" if applied else "Database is up to date")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
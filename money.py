@@ -0,0 +1,161 @@
+# money.py
+"""Money as a whole number of paise.
+
+Amounts typed into the screens or read from files are parsed straight to
+integer paise, bound to SQL as integers (the money columns are BIGINT
+paise) and summed as integers; they become rupees again only for display.
+No float ever holds an amount. Rows read in bulk (history pages, exports,
+user lists) keep their plain int paise, so nothing is allocated per row;
+single values - a balance, a posting - travel as Money.
+"""
+import re
+from decimal import Decimal, ROUND_HALF_UP
+from functools import total_ordering
+
+PAISE_PER_RUPEE = 100
+
+_AMOUNT = re.compile(r"([+-]?)(\d*)(?:\.(\d*))?\Z")
+
+
+def parse_paise(text):
+    """Paise for a rupee amount written as text: '1,250.5' -> 125050.
+
+    Accepts an optional sign, ₹ and thousands separators, and at most two
+    decimal places; anything else raises ValueError.
+    """
+    cleaned = text.strip().replace("₹", "").replace(",", "").strip()
+    match = _AMOUNT.match(cleaned)
+    if match is None or not (match.group(2) or match.group(3)):
+        raise ValueError(f"Not an amount: {text!r}")
+    sign, whole, fraction = match.groups()
+    fraction = fraction or ""
+    if len(fraction) > 2:
+        raise ValueError(f"Amounts have at most 2 decimal places: {text!r}")
+    paise = int(whole or 0) * PAISE_PER_RUPEE + int(fraction.ljust(2, "0"))
+    return -paise if sign == "-" else paise
+
+
+def to_paise(value):
+    """Paise for a rupee amount given as Money, int, Decimal, str or float.
+
+    Decimals and strings must be exact to the paisa. Floats - only ever
+    from old callers - are rounded half up from their shortest repr.
+    """
+    if isinstance(value, Money):
+        return value.paise
+    if isinstance(value, bool):
+        raise TypeError("Not an amount: bool")
+    if isinstance(value, int):
+        return value * PAISE_PER_RUPEE
+    if isinstance(value, str):
+        return parse_paise(value)
+    if isinstance(value, float):
+        value = Decimal(repr(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    if isinstance(value, Decimal):
+        if not value.is_finite():
+            raise ValueError(f"Not an amount: {value}")
+        paise = value * PAISE_PER_RUPEE
+        if paise != paise.to_integral_value():
+            raise ValueError(f"Amounts have at most 2 decimal places: {value}")
+        return int(paise)
+    raise TypeError(f"Not an amount: {type(value).__name__}")
+
+
+def plain_rupees(paise):
+    """'-1234.50' style text for files and the wire"""
+    sign = "-" if paise < 0 else ""
+    whole, fraction = divmod(abs(paise), PAISE_PER_RUPEE)
+    return f"{sign}{whole}.{fraction:02d}"
+
+
+def format_paise(paise):
+    """'₹1,234.50' style text for the screens"""
+    sign = "-" if paise < 0 else ""
+    whole, fraction = divmod(abs(paise), PAISE_PER_RUPEE)
+    return f"{sign}₹{whole:,}.{fraction:02d}"
+
+
+@total_ordering
+class Money:
+    """An exact, immutable amount of money held as integer paise.
+
+        Money.parse("1,250.50")     # from what a teller typed
+        Money.of(500)               # from rupees (int, Decimal, str)
+        Money(125050)               # from paise, e.g. a database value
+    """
+    __slots__ = ("paise",)
+
+    def __init__(self, paise=0):
+        if isinstance(paise, bool) or not isinstance(paise, int):
+            raise TypeError("Money() takes whole paise; use Money.of() for rupee amounts")
+        object.__setattr__(self, "paise", paise)
+
+    @classmethod
+    def of(cls, value):
+        return value if isinstance(value, cls) else cls(to_paise(value))
+
+    @classmethod
+    def parse(cls, text):
+        return cls(parse_paise(text))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Money is immutable")
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.paise + other.paise)
+        return NotImplemented
+
+    def __radd__(self, other):
+        # So sum() can start from 0
+        if other == 0:
+            return self
+        return NotImplemented
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.paise - other.paise)
+        return NotImplemented
+
+    def __neg__(self):
+        return Money(-self.paise)
+
+    def __mul__(self, factor):
+        if isinstance(factor, int) and not isinstance(factor, bool):
+            return Money(self.paise * factor)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.paise == other.paise
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Money):
+            return self.paise < other.paise
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.paise)
+
+    def __bool__(self):
+        return self.paise != 0
+
+    def rupees(self):
+        """Plain '1234.50' text"""
+        return plain_rupees(self.paise)
+
+    def to_decimal(self):
+        return Decimal(self.paise).scaleb(-2)
+
+    def __str__(self):
+        return format_paise(self.paise)
+
+    def __repr__(self):
+        return f"Money({self.paise})"
+
+    def __reduce__(self):
+        # Immutable, so rebuild through __init__ when pickled to a worker process
+        return (Money, (self.paise,))
@@ -0,0 +1,113 @@
+# navigation.py
+import logging
+import time
+from importlib import import_module
+from PyQt5.QtWidgets import QStackedWidget
+
+# Screens that belong to a signed-in customer or admin are only reachable
+# while that session lasts; public screens live for the whole run
+PUBLIC = "public"
+CUSTOMER = "customer"
+ADMIN = "admin"
+
+# name -> (module, class, scope); modules are imported on first visit
+SCREENS = {
+    "main": ("main", "MainWindow", PUBLIC),
+    "login": ("login_window", "LoginWindow", PUBLIC),
+    "register": ("register_window", "RegisterWindow", PUBLIC),
+    "admin_login": ("admin_login", "AdminLoginWindow", PUBLIC),
+    "register_admin": ("register_admin", "AdminRegisterWindow", PUBLIC),
+    "user_dashboard": ("user_dashboard", "UserDashboard", CUSTOMER),
+    "deposit": ("deposit_window", "DepositWindow", CUSTOMER),
+    "withdraw": ("withdraw_window", "WithdrawWindow", CUSTOMER),
+    "transfer": ("transfer_window", "TransferWindow", CUSTOMER),
+    "history": ("transaction_history", "TransactionHistory", CUSTOMER),
+    "admin_dashboard": ("admin_dashboard", "AdminDashboard", ADMIN),
+    "admin_users": ("admin_view_users", "AdminViewUsersWindow", ADMIN),
+    "admin_transactions": ("admin_view_transactions", "AdminViewTransactionsWindow", ADMIN),
+    "admin_search": ("admin_search_user", "AdminSearchUserWindow", ADMIN),
+    "admin_analytics": ("admin_analytics", "AdminAnalyticsWindow", ADMIN),
+    "admin_insights": ("admin_insights", "AdminInsightsWindow", ADMIN),
+}
+
+
+class NavigationController(QStackedWidget):
+    """The application's one top-level window.
+
+    Each screen is built the first time it is visited and kept in the stack;
+    later visits call its activate(**params) to load the new account or
+    admin and clear what the last visit left behind. Leaving a session's
+    scope (logging out) deletes that session's screens.
+    """
+
+    def __init__(self, screens=SCREENS):
+        super().__init__()
+        self.screens = screens
+        self._live = {}     # name -> screen widget
+        self._stats = {'navigations': 0, 'created': 0, 'reused': 0, 'released': 0,
+                       'switch_time': 0.0, 'max_switch': 0.0}
+
+    def go(self, name, **params):
+        """Show the named screen, building it on first use"""
+        started = time.perf_counter()
+        module, class_name, scope = self.screens[name]
+        self._release_out_of_scope(scope)
+
+        screen = self._live.get(name)
+        if screen is None:
+            screen_class = getattr(import_module(module), class_name)
+            screen = screen_class(**params)
+            self._live[name] = screen
+            self.addWidget(screen)
+            self._stats['created'] += 1
+        else:
+            if hasattr(screen, "activate"):
+                screen.activate(**params)
+            self._stats['reused'] += 1
+
+        self.setCurrentWidget(screen)
+        self.setWindowTitle(screen.windowTitle())
+
+        elapsed = time.perf_counter() - started
+        self._stats['navigations'] += 1
+        self._stats['switch_time'] += elapsed
+        self._stats['max_switch'] = max(self._stats['max_switch'], elapsed)
+        return screen
+
+    def _release_out_of_scope(self, scope):
+        for name in list(self._live):
+            screen_scope = self.screens[name][2]
+            if screen_scope not in (PUBLIC, scope):
+                screen = self._live.pop(name)
+                self.removeWidget(screen)
+                screen.deleteLater()
+                self._stats['released'] += 1
+
+    def live_screens(self):
+        return list(self._live)
+
+    def stats(self):
+        stats = dict(self._stats)
+        stats['live'] = len(self._live)
+        count = stats['navigations']
+        stats['avg_switch'] = stats['switch_time'] / count if count else 0.0
+        return stats
+
+    def log_stats(self):
+        stats = self.stats()
+        logging.info(
+            f"Navigation: {stats['navigations']} switches, avg {stats['avg_switch'] * 1000:.1f}ms, "
+            f"max {stats['max_switch'] * 1000:.1f}ms; {stats['created']} screens built, "
+            f"{stats['reused']} reused, {stats['released']} released, {stats['live']} live"
+        )
+
+
+_navigator = None
+
+
+def get_navigator():
+    """The application window; create it only once a QApplication exists"""
+    global _navigator
+    if _navigator is None:
+        _navigator = NavigationController()
+    return _navigator
@@ -0,0 +1,286 @@
+# reconcile.py
+"""Balance reconciliation: does every users.balance_paise equal its ledger?
+
+    python reconcile.py [--report discrepancies.csv] [--workers 8]
+    python reconcile.py --incremental [--report discrepancies.csv]
+
+A full run splits the account space into account-number ranges and sums
+each range's ledger in a pool of worker processes, one aggregate query
+per range joining users to transactions. Each query reads one consistent
+snapshot, so postings made while it runs do not show up as drift.
+
+The results come back column-wise (account numbers, then numpy int64
+balances and ledger totals) and are compared column against column in
+one vectorised pass. Each account's balance
+and ledger total are recorded in reconcile_state, and the highest
+transaction_id seen is recorded as the run's watermark.
+
+--incremental rechecks only the accounts with activity since the last
+run:
+- accounts with ledger rows past the watermark;
+- accounts whose balance no longer matches the one recorded, so a
+  balance updated without a ledger row is still found;
+- new accounts;
+- accounts that were out of balance last time.
+
+It falls back to a full run if there has not been one yet.
+
+Accounts out of balance go to --report as CSV (rupees). The command
+exits with status 1 when there are any.
+"""
+import argparse
+import csv
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+from money import format_paise, plain_rupees
+
+WORKERS = min(8, os.cpu_count() or 1)
+RANGES_PER_WORKER = 4       # smaller ranges even out accounts with very long ledgers
+LOOKUP_CHUNK = 500          # accounts per IN (...) lookup
+STATE_CHUNK = 10000         # reconcile_state rows per transaction
+
+# One row per account: its balance and the net of its ledger, from the same snapshot
+CHECK_SQL = """
+    SELECT u.account_no, u.balance_paise,
+           COALESCE(SUM(CASE WHEN t.type = 'Deposit' THEN t.amount_paise ELSE -t.amount_paise END), 0),
+           COUNT(t.transaction_id)
+    FROM users u LEFT JOIN transactions t ON t.account_no = u.account_no
+    WHERE {where}
+    GROUP BY u.account_no, u.balance_paise
+    ORDER BY u.account_no
+"""
+
+
+class Columns:
+    """Per-account results as parallel columns, in account order.
+
+    accounts is a list of account numbers; balances, ledger totals and
+    ledger row counts are int64 arrays.
+    """
+
+    def __init__(self, accounts=(), balances=(), ledger=(), rows=()):
+        self.accounts = list(accounts)
+        self.balances = np.asarray(balances, dtype=np.int64)
+        self.ledger = np.asarray(ledger, dtype=np.int64)
+        self.rows = np.asarray(rows, dtype=np.int64)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Columns from (account_no, balance_paise, ledger_paise, ledger_rows) rows"""
+        if not rows:
+            return cls()
+        return cls(*zip(*rows))
+
+    @classmethod
+    def concat(cls, parts):
+        """One Columns holding parts one after another"""
+        parts = list(parts)
+        if not parts:
+            return cls()
+        result = cls()
+        result.accounts = [acc_no for part in parts for acc_no in part.accounts]
+        result.balances = np.concatenate([part.balances for part in parts])
+        result.ledger = np.concatenate([part.ledger for part in parts])
+        result.rows = np.concatenate([part.rows for part in parts])
+        return result
+
+    def __len__(self):
+        return len(self.accounts)
+
+    def differences(self):
+        """Balance minus ledger for every account"""
+        return self.balances - self.ledger
+
+    def out_of_balance(self):
+        """Indexes of the accounts whose balance differs from their ledger"""
+        return np.flatnonzero(self.balances != self.ledger)
+
+
+def check_job(job):
+    """Worker: balances and ledger totals for one ("range", low, high) or ("accounts", [...]) job"""
+    from db_config import get_backend
+    kind, *args = job
+    rows = []
+    conn = get_backend().connect()
+    try:
+        cursor = conn.cursor(buffered=True)
+        if kind == "range":
+            low, high = args
+            where, params = "u.account_no >= %s", [low]
+            if high is not None:
+                where += " AND u.account_no < %s"
+                params.append(high)
+            cursor.execute(CHECK_SQL.format(where=where), params)
+            rows = cursor.fetchall()
+        else:
+            accounts = args[0]
+            for i in range(0, len(accounts), LOOKUP_CHUNK):
+                chunk = accounts[i:i + LOOKUP_CHUNK]
+                marks = ", ".join(["%s"] * len(chunk))
+                cursor.execute(CHECK_SQL.format(where=f"u.account_no IN ({marks})"), chunk)
+                rows.extend(cursor.fetchall())
+        cursor.close()
+    finally:
+        conn.close()
+    return Columns.from_rows(rows)
+
+
+def range_jobs(cursor, count):
+    """Split the account space into up to count ranges of about as many accounts each"""
+    cursor.execute("SELECT account_no FROM users ORDER BY account_no")
+    accounts = [row[0] for row in cursor.fetchall()]
+    if not accounts:
+        return []
+    step = max(1, -(-len(accounts) // count))
+    bounds = accounts[::step] + [None]
+    return [("range", low, high) for low, high in zip(bounds, bounds[1:])]
+
+
+def incremental_accounts(cursor, watermark):
+    """Accounts with activity since the run that recorded watermark"""
+    cursor.execute("SELECT DISTINCT account_no FROM transactions WHERE transaction_id > %s", (watermark,))
+    accounts = {row[0] for row in cursor.fetchall()}
+    # A posting that committed after the last run under a lower transaction_id
+    # still moved its balance, so it is caught here
+    cursor.execute(
+        "SELECT u.account_no FROM users u LEFT JOIN reconcile_state s ON s.account_no = u.account_no "
+        "WHERE s.account_no IS NULL OR s.balance_paise <> u.balance_paise "
+        "OR s.ledger_paise <> s.balance_paise"
+    )
+    accounts.update(row[0] for row in cursor.fetchall())
+    return sorted(accounts)
+
+
+def account_jobs(accounts, count):
+    size = max(LOOKUP_CHUNK, -(-len(accounts) // count))
+    return [("accounts", accounts[i:i + size]) for i in range(0, len(accounts), size)]
+
+
+def run_jobs(jobs, workers):
+    """Results of all jobs in account order; one job runs in-process"""
+    if len(jobs) == 1 or workers <= 1:
+        return Columns.concat(check_job(job) for job in jobs)
+    # spawn: a forked child would inherit the parent's pooled connections
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), mp_context=context) as pool:
+        return Columns.concat(pool.map(check_job, jobs))
+
+
+def save_state(conn, cursor, results):
+    from db_config import transaction
+    checked_at = datetime.now().replace(microsecond=0)
+    for i in range(0, len(results), STATE_CHUNK):
+        # tolist() gives the drivers plain ints to bind
+        rows = [(acc_no, balance, ledger, count, checked_at)
+                for acc_no, balance, ledger, count in zip(results.accounts[i:i + STATE_CHUNK],
+                                                          results.balances[i:i + STATE_CHUNK].tolist(),
+                                                          results.ledger[i:i + STATE_CHUNK].tolist(),
+                                                          results.rows[i:i + STATE_CHUNK].tolist())]
+        with transaction(conn):
+            cursor.executemany(
+                "REPLACE INTO reconcile_state (account_no, balance_paise, ledger_paise, ledger_rows, checked_at) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                rows
+            )
+
+
+def last_watermark(cursor):
+    """Watermark of the newest finished run, or None before the first"""
+    cursor.execute("SELECT watermark FROM reconcile_runs ORDER BY run_id DESC LIMIT 1")
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def reconcile(incremental=False, workers=WORKERS):
+    """Check balances against the ledger; returns (stats, discrepancies).
+
+    discrepancies are (account_no, balance_paise, ledger_paise, ledger_rows)
+    for every account found out of balance.
+    """
+    from db_config import db_connection
+    started = time.monotonic()
+    with db_connection() as (conn, cursor):
+        # Read before any account is checked: rows past it are picked up next time
+        cursor.execute("SELECT COALESCE(MAX(transaction_id), 0) FROM transactions")
+        watermark = cursor.fetchone()[0]
+        previous = last_watermark(cursor) if incremental else None
+        mode = "incremental" if previous is not None else "full"
+        if mode == "full":
+            jobs = range_jobs(cursor, workers * RANGES_PER_WORKER)
+        else:
+            jobs = account_jobs(incremental_accounts(cursor, previous), workers * RANGES_PER_WORKER)
+
+    results = run_jobs(jobs, workers)
+    checked = time.monotonic()
+    discrepancies = [(results.accounts[i], int(results.balances[i]), int(results.ledger[i]), int(results.rows[i]))
+                     for i in results.out_of_balance()]
+
+    with db_connection() as (conn, cursor):
+        save_state(conn, cursor, results)
+        if mode == "full":
+            cursor.execute("DELETE FROM reconcile_state WHERE account_no NOT IN (SELECT account_no FROM users)")
+        cursor.execute("SELECT COALESCE(MAX(run_id), 0) + 1 FROM reconcile_runs")
+        run_id = cursor.fetchone()[0]
+        cursor.execute(
+            "INSERT INTO reconcile_runs (run_id, mode, watermark, accounts_checked, discrepancies) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            (run_id, mode, watermark, len(results), len(discrepancies))
+        )
+
+    stats = {
+        'mode': mode,
+        'jobs': len(jobs),
+        'accounts': len(results),
+        'ledger_rows': int(results.rows.sum()),
+        'discrepancies': len(discrepancies),
+        'watermark': watermark,
+        'check_time': checked - started,
+        'elapsed': time.monotonic() - started,
+    }
+    logging.info(f"Reconciliation: {stats}")
+    for acc_no, balance, ledger, _ in discrepancies:
+        logging.warning(f"Reconciliation: account {acc_no} balance {format_paise(balance)} "
+                        f"but ledger {format_paise(ledger)}")
+    return stats, discrepancies
+
+
+def write_report(target, discrepancies):
+    writer = csv.writer(target)
+    writer.writerow(["account_no", "balance", "ledger", "difference", "ledger_rows"])
+    for acc_no, balance, ledger, count in discrepancies:
+        writer.writerow([acc_no, plain_rupees(balance), plain_rupees(ledger), plain_rupees(balance - ledger), count])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every account balance against its ledger")
+    parser.add_argument("--incremental", action="store_true",
+                        help="only recheck accounts with activity since the last run")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="worker processes")
+    parser.add_argument("--report", help="write accounts out of balance to this CSV")
+    args = parser.parse_args()
+
+    stats, discrepancies = reconcile(args.incremental, args.workers)
+    if args.report:
+        with open(args.report, "w", newline="", encoding="utf-8") as target:
+            write_report(target, discrepancies)
+
+    print(f"{stats['mode'].capitalize()} reconciliation: {stats['accounts']:,} accounts, "
+          f"{stats['ledger_rows']:,} ledger rows in {stats['jobs']} jobs, {stats['elapsed']:.1f}s")
+    if discrepancies:
+        print(f"{len(discrepancies):,} account(s) out of balance", file=sys.stderr)
+        for acc_no, balance, ledger, _ in discrepancies[:20]:
+            print(f"  {acc_no}: balance {format_paise(balance)}, ledger {format_paise(ledger)}", file=sys.stderr)
+        if len(discrepancies) > 20:
+            print(f"  ... and {len(discrepancies) - 20:,} more", file=sys.stderr)
+        sys.exit(1)
+    print("Every balance matches its ledger")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 # register_admin.py
 from PyQt5.QtWidgets import (QWidget, QLabel, QLineEdit, QPushButton, 
                             QVBoxLayout, QMessageBox)
-from PyQt5.QtGui import QPixmap, QFont
+from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
-import bcrypt
+from db_executor import get_executor, ExecutorBusyError
+from navigation import get_navigator
+from assets import logo_pixmap
+from bank_core import admin
 
 class AdminRegisterWindow(QWidget):
     def __init__(self):
@@ -12,60 +15,12 @@ class AdminRegisterWindow(QWidget):
         self.resize(500, 500)
         self.init_ui()
 
+    def activate(self):
+        self.user_input.clear()
+        self.pass_input.clear()
+
     def init_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #FFF1D0;
-                font-family: 'Verdana';
-            }
-            QLabel {
-                color: #2d3436;
-                font-size: 14px;
-            }
-            QLineEdit {
-                padding: 12px;
-                border: 1px solid #74b9ff;
-                border-radius: 5px;
-                font-size: 14px;
-                min-width: 250px;
-                background: white;
-            }
-            QPushButton {
-                padding: 12px;
-                font-size: 14px;
-                min-width: 250px;
-                border-radius: 5px;
-                margin: 8px 0;
-                border: none;
-            }
-            #title {
-                font-size: 24px;
-                font-weight: bold;
-                color: #2C3E50;
-            }
-            #logo {
-                margin-bottom: 10px;
-            }
-            #register_btn {
-                background: #2ecc71;
-                color: white;
-            }
-            #register_btn:hover {
-                background: #27ae60;
-            }
-            #back_btn {
-                background: #636e72;
-                color: white;
-            }
-            #back_btn:hover {
-                background: #2d3436;
-            }
-            #footer {
-                color: #555;
-                font-size: 12px;
-                font-weight: bold;
-            }
-        """)
+        self.setObjectName("AdminRegisterWindow")
 
         layout = QVBoxLayout()
         layout.setContentsMargins(50, 30, 50, 30)
@@ -74,8 +29,7 @@ class AdminRegisterWindow(QWidget):
         # Logo
         logo = QLabel()
         logo.setObjectName("logo")
-        logo.setPixmap(QPixmap("logo.png").scaled(100, 100, 
-                    Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        logo.setPixmap(logo_pixmap(100))
         logo.setAlignment(Qt.AlignCenter)
 
         # Title
@@ -126,39 +80,28 @@ class AdminRegisterWindow(QWidget):
         username = self.user_input.text()
         password = self.pass_input.text()
 
-        if not username or not password:
-            QMessageBox.warning(self, "Error", "Please enter both username and password")
+        try:
+            job = get_executor().submit(admin.register, username, password,
+                                        key=("register-admin", username))
+        except ExecutorBusyError as e:
+            QMessageBox.warning(self, "Busy", str(e))
+            return
+        if job is None:
             return
 
-        try:
-            from db_config import get_db_connection
-            conn, cursor = get_db_connection()
-            
-            # Check if admin exists
-            cursor.execute("SELECT 1 FROM admins WHERE username = %s", (username,))
-            if cursor.fetchone():
-                QMessageBox.warning(self, "Error", "Username already exists")
-                return
-
-            # Hash password and create admin
-            hashed_pw = bcrypt.hashpw(password.encode(), bcrypt.gensalt())
-            cursor.execute(
-                "INSERT INTO admins (username, password_hash) VALUES (%s, %s)",
-                (username, hashed_pw.decode())
-            )
-            conn.commit()
-            
-            QMessageBox.information(self, "Success", "Admin registered successfully!")
-            self.go_back()
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Registration failed: {str(e)}")
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        self.job = job
+        self.job.succeeded.connect(self.handle_registered)
+        self.job.failed.connect(self.handle_error)
+
+    def handle_registered(self, _):
+        QMessageBox.information(self, "Success", "Admin registered successfully!")
+        self.go_back()
+
+    def handle_error(self, error):
+        if isinstance(error, ValueError):
+            QMessageBox.warning(self, "Error", str(error))
+        else:
+            QMessageBox.critical(self, "Error", f"Registration failed: {str(error)}")
 
     def go_back(self):
-        from admin_login import AdminLoginWindow
-        self.login_window = AdminLoginWindow()
-        self.login_window.show()
-        self.close()
+        get_navigator().go("admin_login")
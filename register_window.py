@@ -1,9 +1,12 @@
 # register_window.py
 from PyQt5.QtWidgets import (QWidget, QLabel, QLineEdit, QPushButton, 
                             QVBoxLayout, QMessageBox)
-from PyQt5.QtGui import QPixmap, QIntValidator, QFont
+from PyQt5.QtGui import QIntValidator, QFont
 from PyQt5.QtCore import Qt
-import bcrypt
+from db_executor import get_executor, ExecutorBusyError
+from navigation import get_navigator
+from assets import logo_pixmap
+from bank_core import accounts
 
 class RegisterWindow(QWidget):
     def __init__(self):
@@ -12,39 +15,13 @@ class RegisterWindow(QWidget):
         self.resize(500, 500)
         self.setup_ui()
 
+    def activate(self):
+        self.name_input.clear()
+        self.acc_input.clear()
+        self.pin_input.clear()
+
     def setup_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #FFF1D0;
-                font-family: 'Verdana';
-            }
-            QLabel {
-                color: #333;
-                font-size: 14px;
-            }
-            QLineEdit {
-                padding: 10px;
-                border: 1px solid #FFB347;
-                border-radius: 5px;
-                font-size: 14px;
-                min-width: 250px;
-            }
-            QPushButton {
-                padding: 10px;
-                font-size: 14px;
-                min-width: 250px;
-                border-radius: 5px;
-                margin: 5px 0;
-            }
-            #register_btn {
-                background: #4CAF50;
-                color: white;
-            }
-            #back_btn {
-                background: #FFB347;
-                color: black;
-            }
-        """)
+        self.setObjectName("RegisterWindow")
 
         layout = QVBoxLayout()
         layout.setContentsMargins(50, 30, 50, 30)
@@ -52,12 +29,12 @@ class RegisterWindow(QWidget):
 
         # Logo
         logo = QLabel()
-        logo.setPixmap(QPixmap("logo.png").scaled(100, 100, Qt.KeepAspectRatio))
+        logo.setPixmap(logo_pixmap(100))
         logo.setAlignment(Qt.AlignCenter)
 
         # Title
         title = QLabel("Create New Account")
-        title.setStyleSheet("font-size: 20px; font-weight: bold;")
+        title.setObjectName("title")
         title.setAlignment(Qt.AlignCenter)
 
         # Input Fields
@@ -88,7 +65,7 @@ class RegisterWindow(QWidget):
         # Footer (made bolder)
         footer = QLabel("© Chirag")
         footer.setFont(QFont('Verdana', 10, QFont.Bold))  
-        footer.setStyleSheet("color: #555;")
+        footer.setObjectName("footer")
         footer.setAlignment(Qt.AlignRight)
 
         # Add widgets to layout
@@ -108,47 +85,33 @@ class RegisterWindow(QWidget):
         self.setLayout(layout)
 
     def register_user(self):
-        name = self.name_input.text().strip()
-        acc_no = self.acc_input.text().strip()
-        pin = self.pin_input.text().strip()
+        name = self.name_input.text()
+        acc_no = self.acc_input.text()
+        pin = self.pin_input.text()
 
-        if not name or not acc_no or not pin:
-            QMessageBox.warning(self, "Error", "All fields are required!")
+        try:
+            job = get_executor().submit(accounts.register, name, acc_no, pin,
+                                        key=("register", acc_no.strip()))
+        except ExecutorBusyError as e:
+            QMessageBox.warning(self, "Busy", str(e))
             return
-
-        if len(pin) != 4:
-            QMessageBox.warning(self, "Error", "PIN must be 4 digits!")
+        if job is None:
             return
 
-        try:
-            from db_config import get_db_connection
-            conn, cursor = get_db_connection()
-            
-            # Check if account exists
-            cursor.execute("SELECT 1 FROM users WHERE account_no = %s", (acc_no,))
-            if cursor.fetchone():
-                QMessageBox.warning(self, "Error", "Account already exists!")
-                return
-
-            # Hash PIN and create account
-            hashed_pin = bcrypt.hashpw(pin.encode(), bcrypt.gensalt())
-            cursor.execute(
-                "INSERT INTO users (name, account_no, pin_hash, balance) VALUES (%s, %s, %s, 0)",
-                (name, acc_no, hashed_pin.decode())
-            )
-            conn.commit()
-            
-            QMessageBox.information(self, "Success", "Account created successfully!")
-            self.go_back()
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Registration failed: {str(e)}")
-        finally:
-            if 'conn' in locals():
-                conn.close()
+        self.job = job
+        self.job.succeeded.connect(self.handle_registered)
+        self.job.failed.connect(self.handle_error)
+
+    def handle_registered(self, _):
+        QMessageBox.information(self, "Success", "Account created successfully!")
+        self.go_back()
+
+    def handle_error(self, error):
+        # Rejected input (missing fields, bad PIN, taken account number) vs. a failure
+        if isinstance(error, ValueError):
+            QMessageBox.warning(self, "Error", str(error))
+        else:
+            QMessageBox.critical(self, "Error", f"Registration failed: {str(error)}")
 
     def go_back(self):
-        from login_window import LoginWindow
-        self.login_window = LoginWindow()
-        self.login_window.show()
-        self.close()
+        get_navigator().go("login")
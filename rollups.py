@@ -0,0 +1,212 @@
+# rollups.py
+"""Daily and monthly ledger rollups for the admin analytics screen.
+
+    python rollups.py                   catch up once
+    python rollups.py --follow 60       catch up every 60 seconds
+    python rollups.py --rebuild         rebuild from the whole ledger
+
+Three tables hold deposit and withdrawal totals and counts:
+- ledger_daily, one row per day;
+- ledger_monthly, one row per month, plus the accounts active in it;
+- account_monthly, one row per account per month.
+
+They are kept up to date from the ledger by transaction_id: each run
+folds in the rows past rollup_state's watermark, a chunk of ids per
+transaction, moving the watermark in the same transaction.
+
+Postings do not touch the rollups: a per-day row updated by every
+posting would make all of them queue on one lock.
+
+A transaction_id is handed out when a row is inserted but only becomes
+visible at commit, so a run stops at the highest id it saw at least
+SETTLE_SECONDS earlier. That mark is held back for as long as a
+transaction that was already writing when it was taken stays open (a
+long settlement batch, a stuck session): its rows may sit below the mark,
+and once the watermark passes them they would never be rolled up.
+"""
+import argparse
+import logging
+import time
+from datetime import date, datetime
+
+CHUNK = 50000               # transaction ids per rollup transaction
+LOOKUP_CHUNK = 500          # accounts per IN (...) lookup
+# Longer than any posting keeps its rows uncommitted, settlement batches included
+SETTLE_SECONDS = 30
+
+TOTALS = ["deposits_paise", "deposit_count", "withdrawals_paise", "withdrawal_count"]
+ROLLUP_TABLES = ("ledger_daily", "ledger_monthly", "account_monthly")
+
+
+def _as_date(value):
+    # DATE() comes back as a string from SQLite
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def _add(totals, key, txn_type, paise, count):
+    row = totals.setdefault(key, [0, 0, 0, 0])
+    if txn_type == "Deposit":
+        row[0] += paise
+        row[1] += count
+    else:
+        row[2] += paise
+        row[3] += count
+
+
+def _settled_mark(conn, cursor, backend, settle):
+    """(settled, pending): the highest transaction_id safe to roll up now, and the mark still settling.
+
+    Either may be None. A mark is the newest transaction_id at the time
+    it was taken; it settles SETTLE_SECONDS later, once no transaction
+    that began before it is still open with rows written.
+    """
+    from db_config import transaction
+    now = datetime.now().replace(microsecond=0)
+    with transaction(conn):
+        cursor.execute(f"SELECT watermark, mark, marked_at FROM rollup_state WHERE name = 'ledger'{backend.lock_rows}")
+        watermark, mark, marked_at = cursor.fetchone()
+        settled = None
+        if mark is not None and mark > watermark:
+            age = (now - marked_at).total_seconds()
+            if age < settle:
+                # Left alone, so steady traffic cannot keep pushing it back
+                return None, mark
+            writer_age = backend.oldest_writer_age(cursor)
+            if writer_age is not None and writer_age >= age:
+                logging.info(f"Rollups: holding at transaction {watermark}, "
+                             f"a transaction open {writer_age}s may still commit rows up to {mark}")
+                return None, mark
+            settled = mark
+        cursor.execute("SELECT COALESCE(MAX(transaction_id), 0) FROM transactions")
+        latest = cursor.fetchone()[0]
+        if latest <= max(watermark, mark or 0):
+            return settled, None
+        cursor.execute("UPDATE rollup_state SET mark = %s, marked_at = %s WHERE name = 'ledger'",
+                       (latest, now))
+        return settled, latest
+
+
+def _roll_chunk(cursor, backend, low, high):
+    """Fold ledger rows low < transaction_id <= high into the rollups; returns the row count"""
+    cursor.execute(
+        "SELECT DATE(timestamp), account_no, type, SUM(amount_paise), COUNT(*) FROM transactions "
+        "WHERE transaction_id > %s AND transaction_id <= %s GROUP BY DATE(timestamp), account_no, type",
+        (low, high)
+    )
+    daily, monthly, accounts = {}, {}, {}
+    rows = 0
+    for day, acc_no, txn_type, paise, count in cursor.fetchall():
+        day = _as_date(day)
+        month = day.replace(day=1)
+        _add(daily, day, txn_type, paise, count)
+        _add(monthly, month, txn_type, paise, count)
+        _add(accounts, (acc_no, month), txn_type, paise, count)
+        rows += count
+    if not rows:
+        return 0
+
+    # Accounts new to a month make it one more active account
+    by_month = {}
+    for acc_no, month in accounts:
+        by_month.setdefault(month, []).append(acc_no)
+    active = {}
+    for month, names in by_month.items():
+        names.sort()
+        seen = set()
+        for i in range(0, len(names), LOOKUP_CHUNK):
+            chunk = names[i:i + LOOKUP_CHUNK]
+            cursor.execute(
+                f"SELECT account_no FROM account_monthly WHERE month = %s "
+                f"AND account_no IN ({', '.join(['%s'] * len(chunk))})",
+                [month] + chunk
+            )
+            seen.update(row[0] for row in cursor.fetchall())
+        active[month] = len(names) - len(seen)
+
+    backend.accumulate(cursor, "ledger_daily", ["day"], TOTALS,
+                       [(day, *totals) for day, totals in sorted(daily.items())])
+    backend.accumulate(cursor, "ledger_monthly", ["month"], TOTALS + ["active_accounts"],
+                       [(month, *totals, active[month]) for month, totals in sorted(monthly.items())])
+    backend.accumulate(cursor, "account_monthly", ["account_no", "month"], TOTALS,
+                       [(acc_no, month, *totals) for (acc_no, month), totals in sorted(accounts.items())])
+    return rows
+
+
+def catch_up(wait=True, settle=SETTLE_SECONDS):
+    """Fold settled ledger rows into the rollups; returns the run's counters.
+
+    With wait (a one-off run) it waits for the rows there were when it
+    started to settle, and folds them all in. Without it, it folds in what
+    has settled and leaves the rest to the next run.
+    """
+    from db_config import db_connection, get_backend, transaction
+    backend = get_backend()
+    stats = {'rows': 0, 'chunks': 0}
+    started = time.monotonic()
+    with db_connection() as (conn, cursor):
+        settled, pending = _settled_mark(conn, cursor, backend, settle)
+        goal = pending if wait else None
+        while True:
+            while settled is not None:
+                with transaction(conn):
+                    # Locking the state row keeps two runs from folding in the same rows
+                    cursor.execute(f"SELECT watermark FROM rollup_state WHERE name = 'ledger'{backend.lock_rows}")
+                    low = cursor.fetchone()[0]
+                    if low >= settled:
+                        break
+                    high = min(low + CHUNK, settled)
+                    stats['rows'] += _roll_chunk(cursor, backend, low, high)
+                    cursor.execute("UPDATE rollup_state SET watermark = %s WHERE name = 'ledger'", (high,))
+                stats['chunks'] += 1
+            cursor.execute("SELECT watermark FROM rollup_state WHERE name = 'ledger'")
+            stats['watermark'] = cursor.fetchone()[0]
+            if goal is None or stats['watermark'] >= goal:
+                break
+            time.sleep(settle)
+            settled, _ = _settled_mark(conn, cursor, backend, settle)
+    stats['elapsed'] = time.monotonic() - started
+    if stats['rows']:
+        logging.info(f"Rollups: {stats}")
+    return stats
+
+
+def rebuild():
+    """Empty the rollups so the next catch-up folds in the whole ledger again"""
+    from db_config import db_connection, transaction
+    with db_connection() as (conn, cursor):
+        with transaction(conn):
+            for table in ROLLUP_TABLES:
+                cursor.execute(f"DELETE FROM {table}")
+            cursor.execute("UPDATE rollup_state SET watermark = 0, mark = NULL, marked_at = NULL "
+                           "WHERE name = 'ledger'")
+    logging.info("Rollups emptied for a rebuild")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bring the ledger rollup tables up to date")
+    parser.add_argument("--follow", type=float, metavar="SECONDS", help="keep catching up at this interval")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the rollups from the whole ledger")
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS,
+                        help="seconds a new ledger row is given to commit before it is rolled up")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        rebuild()
+    if args.follow is None:
+        stats = catch_up(settle=args.settle)
+        print(f"Rolled up {stats['rows']:,} ledger rows in {stats['chunks']} chunks, {stats['elapsed']:.1f}s "
+              f"(up to transaction {stats['watermark']})")
+        return
+    try:
+        while True:
+            stats = catch_up(wait=False, settle=args.settle)
+            if stats['rows']:
+                print(f"Rolled up {stats['rows']:,} ledger rows (up to transaction {stats['watermark']})",
+                      flush=True)
+            time.sleep(args.follow)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# settlement.py
+"""Netting settlement of transfer batches.
+
+Merchant accounts see thousands of small transfers between the same few
+accounts. Posted one by one, each moves two balances; settled as a batch
+they move each touched account's balance once, by its net position,
+while the ledger still gets both legs of every transfer:
+
+    batch = SettlementBatch()
+    batch.add("1001", "2001", Money.parse("12.50"))
+    ...
+    stats = settle(conn, cursor, batch)
+
+or from a file:
+
+    python settlement.py transfers.csv [--dry-run]
+
+with a header naming from_account, to_account and amount (rupees). Run
+from the command line, it cannot reach the account caches of running
+terminals: their dashboards may show a settled account's old balance
+until the entry expires (account_cache.CACHE_TTL, a minute). Postings
+are unaffected; they work on the database row. LedgerService.settle()
+invalidates its own process's cache.
+
+The batch is all-or-nothing: one transaction, and it is refused if any
+account is unknown or would end below zero. Only the net position has to
+be covered - transfers within the batch may pass through an account in
+any order. Instructions are held column-wise in compact arrays (16 bytes
+each), so a million of them take about 16 MB, and netted with numpy.
+"""
+import argparse
+import csv
+import logging
+import sys
+import time
+from array import array
+import numpy as np
+from money import Money
+
+LOCK_CHUNK = 500            # accounts per IN (...) lookup
+INSERT_CHUNK = 10000        # ledger rows per executemany
+EXACT_FLOAT = 2 ** 53       # float64 holds every whole number of paise below this
+
+
+class SettlementBatch:
+    """Transfer instructions as parallel arrays of account indexes and paise"""
+
+    def __init__(self):
+        self.accounts = []          # index -> account number
+        self._index = {}            # account number -> index
+        self.sources = array('i')
+        self.targets = array('i')
+        self.amounts = array('q')
+
+    def _account(self, acc_no):
+        index = self._index.get(acc_no)
+        if index is None:
+            index = self._index[acc_no] = len(self.accounts)
+            self.accounts.append(acc_no)
+        return index
+
+    def add(self, from_acc, to_acc, amount):
+        """Queue a transfer of amount (Money, or rupees) from one account to another"""
+        paise = Money.of(amount).paise
+        if paise <= 0:
+            raise ValueError("Amount must be positive")
+        if from_acc == to_acc:
+            raise ValueError("Cannot transfer to the same account")
+        self.sources.append(self._account(from_acc))
+        self.targets.append(self._account(to_acc))
+        self.amounts.append(paise)
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def net(self):
+        """Net paise per account index, as an int64 array: credits minus debits"""
+        n = len(self.accounts)
+        # Zero-copy views of the columns
+        sources = np.frombuffer(self.sources, dtype=np.int32)
+        targets = np.frombuffer(self.targets, dtype=np.int32)
+        amounts = np.frombuffer(self.amounts, dtype=np.int64)
+        if len(amounts) and int(amounts.sum()) < EXACT_FLOAT:
+            # bincount sums its weights as float64, exact while no sum can reach 2**53
+            credits = np.bincount(targets, amounts, minlength=n)
+            debits = np.bincount(sources, amounts, minlength=n)
+            return (credits - debits).astype(np.int64)
+        net = np.zeros(n, dtype=np.int64)
+        np.add.at(net, targets, amounts)
+        np.subtract.at(net, sources, amounts)
+        return net
+
+    def ledger_rows(self, opening):
+        """Both legs of every instruction as (account_no, type, amount_paise, counterparty, balance_after_paise).
+
+        opening holds each account index's balance before the batch. Every
+        credit leg is written before any debit leg, each in batch order, so
+        an account's running balance climbs to opening plus its credits and
+        then falls to its closing balance: when the net position is covered
+        no row shows a balance below zero.
+        """
+        accounts = self.accounts
+        running = array('q', opening)
+        for source, target, paise in zip(self.sources, self.targets, self.amounts):
+            running[target] += paise
+            yield (accounts[target], "Deposit", paise, accounts[source], running[target])
+        for source, target, paise in zip(self.sources, self.targets, self.amounts):
+            running[source] -= paise
+            yield (accounts[source], "Withdrawal", paise, accounts[target], running[source])
+
+
+def _lock_balances(cursor, backend, accounts):
+    balances = {}
+    for i in range(0, len(accounts), LOCK_CHUNK):
+        chunk = accounts[i:i + LOCK_CHUNK]
+        marks = ", ".join(["%s"] * len(chunk))
+        cursor.execute(
+            f"SELECT account_no, balance_paise FROM users WHERE account_no IN ({marks}) "
+            f"ORDER BY account_no{backend.lock_rows}",
+            chunk
+        )
+        balances.update(cursor.fetchall())
+    return balances
+
+
+def _apply(conn, cursor, batch, net, dry_run):
+    from db_config import get_backend
+    from ledger import AccountNotFoundError, InsufficientFundsError, local_now
+    backend = get_backend()
+    timings = {}
+    backend.begin(conn)
+    try:
+        started = time.perf_counter()
+        # Account-number order, like every other multi-account writer
+        balances = _lock_balances(cursor, backend, sorted(batch.accounts))
+        for index, acc_no in enumerate(batch.accounts):
+            balance = balances.get(acc_no)
+            if balance is None:
+                raise AccountNotFoundError(acc_no)
+            if balance + int(net[index]) < 0:
+                raise InsufficientFundsError(acc_no, Money(balance), Money(-int(net[index])))
+        timings['lock_time'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        cursor.executemany(
+            "UPDATE users SET balance_paise = balance_paise + %s WHERE account_no = %s",
+            [(int(delta), acc_no) for delta, acc_no in zip(net, batch.accounts) if delta]
+        )
+        timings['update_time'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        rows = batch.ledger_rows(array('q', (balances[acc_no] for acc_no in batch.accounts)))
+        now = local_now()
+        while True:
+            chunk = [row + (now,) for _, row in zip(range(INSERT_CHUNK), rows)]
+            if not chunk:
+                break
+            cursor.executemany(
+                "INSERT INTO transactions (account_no, type, amount_paise, counterparty, balance_after_paise, "
+                "timestamp) VALUES (%s, %s, %s, %s, %s, %s)",
+                chunk
+            )
+        timings['insert_time'] = time.perf_counter() - started
+    except BaseException:
+        conn.rollback()
+        raise
+    if dry_run:
+        conn.rollback()
+    else:
+        conn.commit()
+    return timings
+
+
+def settle(conn, cursor, batch, dry_run=False):
+    """Settle the batch in one transaction; returns its counters and timings.
+
+    Raises AccountNotFoundError or InsufficientFundsError (for the net
+    amount the account is short of) and changes nothing if any account
+    cannot settle. dry_run does all the work, then rolls it back.
+    """
+    from db_config import retry_transient
+    stats = {'instructions': len(batch), 'accounts': len(batch.accounts), 'rows': 2 * len(batch)}
+    if not len(batch):
+        return stats
+    started = time.perf_counter()
+    net = batch.net()
+    stats['net_time'] = time.perf_counter() - started
+    stats.update(retry_transient(_apply, conn, cursor, batch, net, dry_run))
+    stats['balance_updates'] = int(np.count_nonzero(net))
+    stats['elapsed'] = time.perf_counter() - started
+    logging.info(f"Settled {stats['instructions']} transfers over {stats['accounts']} accounts "
+                 f"in {stats['elapsed']:.2f}s")
+    return stats
+
+
+def read_batch(source):
+    """SettlementBatch from an open CSV with from_account, to_account and amount columns"""
+    reader = csv.DictReader(source)
+    reader.fieldnames = [name.strip().lower() for name in (reader.fieldnames or [])]
+    missing = [name for name in ("from_account", "to_account", "amount") if name not in reader.fieldnames]
+    if missing:
+        raise ValueError(f"CSV header is missing column(s): {', '.join(missing)}")
+    batch = SettlementBatch()
+    for record in reader:
+        try:
+            batch.add(record["from_account"].strip(), record["to_account"].strip(),
+                      Money.parse(record["amount"]))
+        except ValueError as e:
+            raise ValueError(f"line {reader.line_num}: {e}")
+    return batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Settle a file of transfers as one netted batch")
+    parser.add_argument("csv_file", help="CSV with from_account, to_account, amount columns")
+    parser.add_argument("--dry-run", action="store_true", help="check the batch settles, then roll it back")
+    args = parser.parse_args()
+
+    from db_config import db_connection
+    from ledger import AccountNotFoundError, InsufficientFundsError
+    try:
+        with open(args.csv_file, newline="", encoding="utf-8-sig") as source:
+            batch = read_batch(source)
+    except ValueError as e:
+        print(f"Cannot settle {args.csv_file}: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    with db_connection() as (conn, cursor):
+        try:
+            stats = settle(conn, cursor, batch, args.dry_run)
+        except (AccountNotFoundError, InsufficientFundsError) as e:
+            print(f"Batch refused, nothing posted: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    verb = "Validated" if args.dry_run else "Settled"
+    print(f"{verb} {stats['instructions']:,} transfers over {stats['accounts']:,} accounts: "
+          f"{stats['balance_updates']:,} balance updates, {stats['rows']:,} ledger rows, "
+          f"{stats['elapsed']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
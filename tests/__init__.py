@@ -0,0 +1,13 @@
+# tests/__init__.py
+"""Tests run against a throwaway SQLite database.
+
+    python -m unittest discover -s tests -t .
+
+The database is chosen here, before anything imports db_config, and
+removed when the run ends. Tests share it, so each uses its own account
+numbers.
+"""
+import atexit
+from benchmarks.common import use_sqlite, remove_sqlite
+
+atexit.register(remove_sqlite, use_sqlite())
@@ -0,0 +1,47 @@
+# tests/test_bulk_import.py
+import csv
+import io
+import unittest
+from datetime import datetime, timezone, timedelta
+
+
+def run_import(text):
+    from bulk_import import import_csv
+    rejects = io.StringIO()
+    stats = import_csv(io.StringIO(text), rejects_file=rejects)
+    return stats, list(csv.DictReader(io.StringIO(rejects.getvalue())))
+
+
+class BulkImportTimestampTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from db_config import ensure_schema
+        from bank_core import accounts
+        ensure_schema()
+        accounts.register("Offset", "T16001", "1234")
+        accounts.register("Order", "T16002", "1234")
+
+    def test_offset_timestamp_is_stored_as_local_time(self):
+        from db_config import db_connection
+        stats, rejects = run_import("account_no,type,amount,timestamp\n"
+                                    "T16001,Deposit,10,2024-05-01T10:00:00+05:30\n")
+        self.assertEqual((stats['posted'], rejects), (1, []))
+        expected = datetime(2024, 5, 1, 10, tzinfo=timezone(timedelta(hours=5, minutes=30)))
+        with db_connection() as (conn, cursor):
+            cursor.execute("SELECT timestamp FROM transactions WHERE account_no = %s", ("T16001",))
+            self.assertEqual(cursor.fetchone()[0], expected.astimezone().replace(tzinfo=None))
+
+    def test_rows_older_than_the_latest_posting_are_rejected(self):
+        stats, rejects = run_import("account_no,type,amount,timestamp\n"
+                                    "T16002,Deposit,10,2025-02-01 09:00:00\n"
+                                    "T16002,Deposit,5,2025-01-15 09:00:00\n"
+                                    "T16002,Deposit,1,2025-03-01T00:00:00+00:00\n"
+                                    "T16002,Deposit,2,2025-01-20T00:00:00-08:00\n")
+        self.assertEqual(stats['posted'], 2)
+        self.assertEqual([row['line'] for row in rejects], ["3", "5"])
+        self.assertIn("older than account T16002's latest posting", rejects[0]['reason'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+# tests/test_db_executor.py
+import importlib.util
+import time
+import unittest
+
+
+@unittest.skipUnless(importlib.util.find_spec("PyQt5"), "needs PyQt5")
+class DbExecutorDeliveryTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from PyQt5.QtCore import QCoreApplication
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        from db_executor import DbExecutor
+        self.executor = DbExecutor(workers=2)
+        self.addCleanup(self.executor.shutdown)
+
+    def wait_for(self, outcome, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not outcome and time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.01)
+
+    def test_job_that_finishes_at_once_still_reaches_late_connections(self):
+        outcome = []
+        job = self.executor.submit(lambda: 42)
+        # Plenty of time for a worker to have run it, were it already queued
+        time.sleep(0.2)
+        job.succeeded.connect(lambda result: outcome.append(("ok", result)))
+        job.failed.connect(lambda error: outcome.append(("failed", error)))
+        self.wait_for(outcome)
+        self.assertEqual(outcome, [("ok", 42)])
+
+    def test_immediate_error_is_delivered(self):
+        def fail():
+            raise ValueError("boom")
+        outcome = []
+        job = self.executor.submit(fail)
+        time.sleep(0.2)
+        job.failed.connect(lambda error: outcome.append(str(error)))
+        self.wait_for(outcome)
+        self.assertEqual(outcome, ["boom"])
+
+    def test_duplicate_key_is_refused_before_the_first_is_queued(self):
+        self.assertIsNotNone(self.executor.submit(time.sleep, 0.05, key="k"))
+        self.assertIsNone(self.executor.submit(time.sleep, 0.05, key="k"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+# tests/test_rollups.py
+import unittest
+from unittest import mock
+
+
+def catch_up():
+    from rollups import catch_up
+    return catch_up(wait=False, settle=0)
+
+
+def account_deposits(acc_no):
+    from db_config import db_connection
+    with db_connection() as (conn, cursor):
+        cursor.execute("SELECT COALESCE(SUM(deposits_paise), 0) FROM account_monthly WHERE account_no = %s",
+                       (acc_no,))
+        return cursor.fetchone()[0]
+
+
+class RollupMarkTest(unittest.TestCase):
+    """A row committed late, below the settled mark, is still rolled up"""
+
+    @classmethod
+    def setUpClass(cls):
+        from db_config import ensure_schema
+        from bank_core import accounts
+        ensure_schema()
+        accounts.register("Late", "T24001", "1234")
+
+    def test_mark_waits_for_a_transaction_open_since_before_it(self):
+        from db_config import db_connection, get_backend
+        from bank_core import ledger
+        from money import Money
+        # Settle whatever the other tests left in the ledger
+        catch_up()
+        catch_up()
+
+        late = ledger.deposit("T24001", Money(700)).transaction_id
+        ledger.deposit("T24001", Money(300))
+        # The first row's id was handed out, but its transaction has not committed yet
+        with db_connection() as (conn, cursor):
+            cursor.execute("SELECT * FROM transactions WHERE transaction_id = %s", (late,))
+            row = cursor.fetchone()
+            cursor.execute("DELETE FROM transactions WHERE transaction_id = %s", (late,))
+            conn.commit()
+
+        backend = type(get_backend())
+        with mock.patch.object(backend, "oldest_writer_age", return_value=3600):
+            catch_up()                          # takes the mark past both rows
+            self.assertEqual(catch_up()['rows'], 0)
+        self.assertEqual(account_deposits("T24001"), 0)
+
+        with db_connection() as (conn, cursor):
+            cursor.execute(f"INSERT INTO transactions VALUES ({', '.join(['%s'] * len(row))})", row)
+            conn.commit()
+        catch_up()
+        self.assertEqual(account_deposits("T24001"), 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# tests/test_timestamps.py
+import os
+import time
+import unittest
+from datetime import datetime, timedelta
+
+
+class LocalTimestampTest(unittest.TestCase):
+    """Ledger rows are stamped in local time on SQLite too, whatever the zone"""
+
+    @classmethod
+    def setUpClass(cls):
+        from db_config import ensure_schema
+        from bank_core import accounts
+        ensure_schema()
+        accounts.register("Local", "T02001", "1234")
+
+    def setUp(self):
+        # Far enough from UTC that a UTC stamp cannot pass for a local one
+        self.old_tz = os.environ.get("TZ")
+        os.environ["TZ"] = "Asia/Kolkata"
+        time.tzset()
+
+    def tearDown(self):
+        if self.old_tz is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = self.old_tz
+        time.tzset()
+
+    def assertNow(self, timestamp):
+        self.assertLess(abs(timestamp - datetime.now()), timedelta(minutes=1))
+
+    def test_posting_is_stamped_in_local_time(self):
+        from bank_core import ledger
+        from money import Money
+        posting = ledger.deposit("T02001", Money(100))
+        rows = ledger.history("T02001", limit=1)
+        self.assertEqual(rows[0][0], posting.transaction_id)
+        self.assertNow(rows[0][4])
+
+    def test_column_default_is_local_time(self):
+        from db_config import db_connection
+        with db_connection() as (conn, cursor):
+            cursor.execute("INSERT INTO transactions (account_no, type, amount_paise) VALUES (%s, %s, %s)",
+                           ("T02001", "Deposit", 1))
+            txn_id = cursor.lastrowid
+            conn.commit()
+            cursor.execute("SELECT timestamp FROM transactions WHERE transaction_id = %s", (txn_id,))
+            self.assertNow(cursor.fetchone()[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,758 @@
+# theme.py
+"""Application-wide stylesheet.
+
+Every screen used to set its own stylesheet, which Qt parsed again each
+time the screen was built. The rules now live here, each screen's rules
+scoped under its object name (the screen's class name), and are compiled
+into one stylesheet that apply_theme() installs on the QApplication once.
+"""
+import re
+
+BASE_STYLE = """
+QWidget {
+    background-color: #FFF1D0;
+    font-family: 'Verdana';
+}
+"""
+
+# Shared by the deposit, withdraw, transfer and history forms
+FORM_STYLE = """
+QLabel {
+    color: #333333;
+    font-size: 16px;
+}
+QLineEdit {
+    padding: 10px;
+    border: 2px solid #FFB347;
+    border-radius: 5px;
+    font-size: 14px;
+    min-width: 250px;
+}
+QPushButton {
+    padding: 12px;
+    font-weight: bold;
+    font-size: 16px;
+    min-width: 250px;
+    border-radius: 6px;
+    margin: 5px;
+}
+#title {
+    font-size: 24px;
+    font-weight: bold;
+    color: #2C3E50;
+}
+#logo {
+    margin-bottom: 20px;
+}
+#footer {
+    color: #555;
+    font-size: 12px;
+    font-weight: bold;
+    padding-top: 20px;
+}
+"""
+
+SCREEN_STYLES = {
+    "MainWindow": """
+.login-option {
+    background-color: white;
+    border-radius: 10px;
+    padding: 30px;
+    margin: 20px;
+    min-width: 250px;
+    border: 3px solid;
+}
+.login-option:hover {
+    background-color: #f5f5f5;
+}
+#title {
+    font-size: 28px;
+    font-weight: bold;
+    color: #2C3E50;
+}
+#footer {
+    color: #555;
+    font-size: 12px;
+    font-weight: bold;
+}
+""",
+    "LoginWindow": """
+QLabel {
+    color: #333333;
+    font-size: 16px;
+}
+QLineEdit {
+    padding: 12px;
+    border: 2px solid #FFB347;
+    border-radius: 8px;
+    font-size: 14px;
+    min-width: 280px;
+    background: white;
+}
+QPushButton {
+    padding: 14px;
+    font-weight: bold;
+    font-size: 16px;
+    min-width: 280px;
+    border-radius: 8px;
+    margin: 8px 0;
+    border: none;
+}
+#title {
+    font-size: 28px;
+    font-weight: bold;
+    color: #2C3E50;
+}
+#login_btn {
+    background-color: #3498DB;
+    color: white;
+}
+#login_btn:hover {
+    background-color: #2980B9;
+}
+#register_btn {
+    background-color: #2ECC71;
+    color: white;
+}
+#register_btn:hover {
+    background-color: #27AE60;
+}
+#back_btn {
+    background-color: #FFB347;
+    color: #000;
+}
+#back_btn:hover {
+    background-color: #FFA500;
+}
+""",
+    "RegisterWindow": """
+QLabel {
+    color: #333;
+    font-size: 14px;
+}
+QLineEdit {
+    padding: 10px;
+    border: 1px solid #FFB347;
+    border-radius: 5px;
+    font-size: 14px;
+    min-width: 250px;
+}
+QPushButton {
+    padding: 10px;
+    font-size: 14px;
+    min-width: 250px;
+    border-radius: 5px;
+    margin: 5px 0;
+}
+#register_btn {
+    background: #4CAF50;
+    color: white;
+}
+#back_btn {
+    background: #FFB347;
+    color: black;
+}
+#title {
+    font-size: 20px;
+    font-weight: bold;
+}
+#footer {
+    color: #555;
+}
+""",
+    "AdminLoginWindow": """
+.login-box {
+    background-color: white;
+    border-radius: 15px;
+    padding: 40px;
+    border: 3px solid #FFB347;
+}
+QLabel {
+    color: #2d3436;
+    font-size: 14px;
+    font-weight: bold;
+}
+QLineEdit {
+    padding: 12px;
+    border: 2px solid #74b9ff;
+    border-radius: 8px;
+    font-size: 14px;
+    min-width: 250px;
+    background: white;
+}
+QPushButton {
+    padding: 12px;
+    font-size: 14px;
+    min-width: 250px;
+    border-radius: 8px;
+    margin: 8px 0;
+    border: none;
+    font-weight: bold;
+}
+#title {
+    font-size: 24px;
+    font-weight: bold;
+    color: #2C3E50;
+    margin-bottom: 10px;
+}
+#logo {
+    margin-bottom: 20px;
+}
+#login_btn {
+    background: #3498db;
+    color: white;
+}
+#login_btn:hover {
+    background: #2980b9;
+}
+#register_btn {
+    background: #2ecc71;
+    color: white;
+}
+#register_btn:hover {
+    background: #27ae60;
+}
+#back_btn {
+    background: #636e72;
+    color: white;
+}
+#back_btn:hover {
+    background: #2d3436;
+}
+#footer {
+    color: #555;
+    font-size: 12px;
+    font-weight: bold;
+}
+""",
+    "AdminRegisterWindow": """
+QLabel {
+    color: #2d3436;
+    font-size: 14px;
+}
+QLineEdit {
+    padding: 12px;
+    border: 1px solid #74b9ff;
+    border-radius: 5px;
+    font-size: 14px;
+    min-width: 250px;
+    background: white;
+}
+QPushButton {
+    padding: 12px;
+    font-size: 14px;
+    min-width: 250px;
+    border-radius: 5px;
+    margin: 8px 0;
+    border: none;
+}
+#title {
+    font-size: 24px;
+    font-weight: bold;
+    color: #2C3E50;
+}
+#logo {
+    margin-bottom: 10px;
+}
+#register_btn {
+    background: #2ecc71;
+    color: white;
+}
+#register_btn:hover {
+    background: #27ae60;
+}
+#back_btn {
+    background: #636e72;
+    color: white;
+}
+#back_btn:hover {
+    background: #2d3436;
+}
+#footer {
+    color: #555;
+    font-size: 12px;
+    font-weight: bold;
+}
+""",
+    "UserDashboard": """
+#title {
+    font-size: 28px;
+    font-weight: bold;
+    color: #2C3E50;
+    margin: 20px 0;
+}
+#logo {
+    margin-bottom: 20px;
+}
+#balance {
+    font-size: 20px;
+    font-weight: bold;
+    color: #27AE60;
+}
+#footer {
+    color: #555;
+    font-size: 12px;
+    font-weight: bold;
+    padding-top: 20px;
+}
+.feature-box {
+    background-color: white;
+    border-radius: 10px;
+    padding: 30px;
+    margin: 10px;
+    min-width: 200px;
+    border: 3px solid;
+}
+QPushButton#logout_btn {
+    background-color: #9b59b6;
+    color: white;
+    padding: 15px;
+    border-radius: 5px;
+    font-size: 16px;
+    min-width: 200px;
+    border: none;
+}
+QPushButton#logout_btn:hover {
+    background-color: #8e44ad;
+}
+""",
+    "DepositWindow": FORM_STYLE + """
+#deposit_btn {
+    background-color: #4CAF50;
+    color: white;
+}
+#back_btn {
+    background-color: #FFB347;
+    color: #000;
+}
+""",
+    "WithdrawWindow": FORM_STYLE + """
+#withdraw_btn {
+    background-color: #E74C3C;
+    color: white;
+}
+#back_btn {
+    background-color: #FFB347;
+    color: #000;
+}
+""",
+    "TransferWindow": FORM_STYLE + """
+#transfer_btn {
+    background-color: #9B59B6;
+    color: white;
+}
+#back_btn {
+    background-color: #FFB347;
+    color: #000;
+}
+""",
+    "TransactionHistory": FORM_STYLE + """
+#title {
+    margin-bottom: 10px;
+}
+#verify_btn {
+    background-color: #3498DB;
+    color: white;
+}
+#back_btn {
+    background-color: #FFB347;
+    color: #000;
+}
+QTableView {
+    background-color: white;
+    border: 2px solid #FFB347;
+    border-radius: 8px;
+    font-size: 14px;
+    gridline-color: #FFB347;
+}
+QHeaderView::section {
+    background-color: #FFB347;
+    color: black;
+    padding: 12px;
+    font-weight: bold;
+    font-size: 15px;
+    border: none;
+}
+QTableView::item {
+    padding: 10px;
+}
+""",
+    "AdminDashboard": """
+#title {
+    font-size: 28px;
+    font-weight: bold;
+    color: #2C3E50;
+    margin: 20px 0;
+}
+#logo {
+    margin-bottom: 20px;
+}
+#footer {
+    color: #555;
+    font-size: 12px;
+    font-weight: bold;
+    padding-top: 20px;
+}
+.feature-box {
+    background-color: white;
+    border-radius: 10px;
+    padding: 20px;
+    margin: 10px;
+    min-width: 250px;
+    border: 3px solid;
+}
+QLabel#feature-label {
+    font-weight: bold;
+    font-size: 16px;
+}
+""",
+    "AdminViewUsersWindow": """
+QWidget {
+    font-family: 'Arial';
+}
+.header {
+    font-size: 24px;
+    font-weight: bold;
+    color: #2C3E50;
+    margin-bottom: 20px;
+}
+QTableWidget {
+    background-color: white;
+    border-radius: 10px;
+    padding: 10px;
+    border: 2px solid #ddd;
+}
+QTableWidget::item {
+    padding: 8px;
+}
+QHeaderView::section {
+    background-color: #3498db;
+    color: white;
+    padding: 8px;
+    font-weight: bold;
+}
+.action-box {
+    background-color: white;
+    border-radius: 10px;
+    padding: 15px;
+    margin: 10px 0;
+    border: 3px solid #f39c12;
+}
+.action-btn {
+    background-color: #f39c12;
+    color: white;
+    border: none;
+    border-radius: 5px;
+    padding: 10px 20px;
+    font-size: 14px;
+    font-weight: bold;
+}
+.action-btn:hover {
+    background-color: #e67e22;
+}
+.action-btn-icon {
+    margin-right: 8px;
+}
+#footer {
+    color: #7f8c8d;
+    font-size: 11px;
+    font-weight: bold;
+}
+""",
+    "AdminViewTransactionsWindow": """
+QWidget {
+    font-family: 'Arial';
+}
+.header {
+    font-size: 24px;
+    font-weight: bold;
+    color: #2C3E50;
+    margin-bottom: 20px;
+}
+QTableView {
+    background-color: white;
+    border-radius: 10px;
+    padding: 5px;
+    border: 2px solid #ddd;
+    alternate-background-color: #f9f9f9;
+    gridline-color: #e0e0e0;
+}
+QTableView::item {
+    padding: 10px;
+    border-bottom: 1px solid #e0e0e0;
+}
+QTableView::item:selected {
+    background-color: #3498db;
+    color: white;
+}
+QHeaderView::section {
+    background-color: #3498db;
+    color: white;
+    padding: 10px;
+    font-weight: bold;
+    border: none;
+    font-size: 14px;
+}
+.action-btn {
+    background-color: #f39c12;
+    color: white;
+    border: none;
+    border-radius: 5px;
+    padding: 10px 20px;
+    font-size: 14px;
+    font-weight: bold;
+    min-width: 120px;
+}
+.action-btn:hover {
+    background-color: #e67e22;
+}
+QLineEdit, QDateEdit {
+    padding: 8px;
+    font-size: 14px;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+}
+#footer {
+    color: #7f8c8d;
+    font-size: 11px;
+    font-weight: bold;
+}
+""",
+    "AdminSearchUserWindow": """
+QWidget {
+    font-family: 'Arial';
+}
+.header {
+    font-size: 28px;
+    font-weight: bold;
+    color: #2C3E50;
+    margin-bottom: 20px;
+}
+.search-box {
+    background-color: white;
+    border-radius: 10px;
+    padding: 20px;
+    margin-bottom: 20px;
+    border: 2px solid #ddd;
+}
+QLineEdit {
+    padding: 12px;
+    font-size: 16px;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+}
+QTableWidget {
+    background-color: white;
+    border-radius: 10px;
+    padding: 5px;
+    border: 2px solid #ddd;
+    alternate-background-color: #f9f9f9;
+    gridline-color: #e0e0e0;
+    font-size: 18px;
+}
+QTableWidget::item {
+    padding: 20px;
+    border-bottom: 1px solid #e0e0e0;
+}
+QTableWidget::item:selected {
+    background-color: #3498db;
+    color: white;
+}
+QHeaderView::section {
+    background-color: #3498db;
+    color: white;
+    padding: 20px;
+    font-weight: bold;
+    border: none;
+    font-size: 18px;
+}
+.action-btn {
+    background-color: #f39c12;
+    color: white;
+    border: none;
+    border-radius: 5px;
+    padding: 12px 24px;
+    font-size: 16px;
+    font-weight: bold;
+    min-width: 120px;
+}
+.action-btn:hover {
+    background-color: #e67e22;
+}
+#footer {
+    color: #7f8c8d;
+    font-size: 12px;
+    font-weight: bold;
+}
+""",
+    "AdminAnalyticsWindow": """
+QWidget {
+    font-family: 'Arial';
+}
+.header {
+    font-size: 24px;
+    font-weight: bold;
+    color: #2C3E50;
+    margin-bottom: 10px;
+}
+#status {
+    color: #7f8c8d;
+    font-size: 13px;
+}
+QLineEdit {
+    padding: 10px;
+    font-size: 14px;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+}
+QTableWidget {
+    background-color: white;
+    border-radius: 10px;
+    padding: 5px;
+    border: 2px solid #ddd;
+    alternate-background-color: #f9f9f9;
+    gridline-color: #e0e0e0;
+}
+QTableWidget::item {
+    padding: 8px;
+}
+QHeaderView::section {
+    background-color: #e67e22;
+    color: white;
+    padding: 8px;
+    font-weight: bold;
+    border: none;
+}
+.action-box {
+    background-color: white;
+    border-radius: 10px;
+    padding: 15px;
+    margin: 10px 0;
+    border: 3px solid #f39c12;
+}
+.action-btn {
+    background-color: #f39c12;
+    color: white;
+    border: none;
+    border-radius: 5px;
+    padding: 10px 20px;
+    font-size: 14px;
+    font-weight: bold;
+}
+.action-btn:hover {
+    background-color: #e67e22;
+}
+#footer {
+    color: #7f8c8d;
+    font-size: 11px;
+    font-weight: bold;
+}
+""",
+    "AdminInsightsWindow": """
+QWidget {
+    font-family: 'Arial';
+}
+.header {
+    font-size: 24px;
+    font-weight: bold;
+    color: #2C3E50;
+    margin-bottom: 10px;
+}
+#summary {
+    color: #2C3E50;
+    font-size: 14px;
+    font-weight: bold;
+}
+QComboBox {
+    padding: 10px;
+    font-size: 14px;
+    border: 1px solid #ddd;
+    border-radius: 5px;
+}
+QProgressBar {
+    border: 1px solid #ddd;
+    border-radius: 5px;
+    height: 12px;
+}
+QProgressBar::chunk {
+    background-color: #16a085;
+}
+QTableWidget {
+    background-color: white;
+    border-radius: 10px;
+    padding: 5px;
+    border: 2px solid #ddd;
+    alternate-background-color: #f9f9f9;
+    gridline-color: #e0e0e0;
+}
+QTableWidget::item {
+    padding: 8px;
+}
+QHeaderView::section {
+    background-color: #16a085;
+    color: white;
+    padding: 8px;
+    font-weight: bold;
+    border: none;
+}
+.action-box {
+    background-color: white;
+    border-radius: 10px;
+    padding: 15px;
+    margin: 10px 0;
+    border: 3px solid #f39c12;
+}
+.action-btn {
+    background-color: #f39c12;
+    color: white;
+    border: none;
+    border-radius: 5px;
+    padding: 10px 20px;
+    font-size: 14px;
+    font-weight: bold;
+}
+.action-btn:hover {
+    background-color: #e67e22;
+}
+#footer {
+    color: #7f8c8d;
+    font-size: 11px;
+    font-weight: bold;
+}
+""",
+}
+
+_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+
+
+def scope_rules(scope, sheet):
+    """Prefix every selector in sheet with #scope, so it only styles that screen.
+
+    A QWidget selector also matches the screen itself, as it did when the
+    sheet was set on the screen directly.
+    """
+    rules = []
+    for selectors, body in _RULE.findall(sheet):
+        scoped = []
+        for selector in selectors.split(","):
+            selector = selector.strip()
+            if selector.startswith("QWidget"):
+                scoped.append(f"#{scope}{selector[len('QWidget'):]}")
+            scoped.append(f"#{scope} {selector}")
+        rules.append(f"{', '.join(scoped)} {{{body}}}")
+    return "\n".join(rules)
+
+
+def build_stylesheet(screen_styles=SCREEN_STYLES):
+    sections = [BASE_STYLE.strip()]
+    for scope, sheet in screen_styles.items():
+        sections.append(scope_rules(scope, sheet))
+    return "\n".join(sections)
+
+
+STYLESHEET = build_stylesheet()
+
+
+def apply_theme(app):
+    """Install the theme on the QApplication; screens then need no stylesheet of their own"""
+    app.setStyleSheet(STYLESHEET)
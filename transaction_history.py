@@ -1,11 +1,11 @@
 # transaction_history
 from PyQt5.QtWidgets import (QWidget, QLabel, QLineEdit, QPushButton, 
-                            QVBoxLayout, QTableWidget, QTableWidgetItem, 
-                            QHeaderView, QMessageBox)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from PyQt5.QtGui import QPixmap, QColor, QFont, QBrush
+                            QVBoxLayout, QTableView, QHeaderView, QMessageBox)
+from PyQt5.QtCore import Qt
 import logging
-from datetime import datetime
+from ledger_models import AccountHistoryModel
+from navigation import get_navigator
+from assets import logo_pixmap
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -13,98 +13,22 @@ logging.basicConfig(
     filename='bank_transactions.log'
 )
 
-class TransactionLoader(QThread):
-    loaded = pyqtSignal(list)
-    
-    def __init__(self, acc_no):
-        super().__init__()
-        self.acc_no = acc_no
-
-    def run(self):
-        try:
-            from db_config import get_db_connection
-            conn, cursor = get_db_connection()
-            cursor.execute("""
-                SELECT type, amount, timestamp 
-                FROM transactions 
-                WHERE account_no = %s 
-                ORDER BY timestamp DESC
-                LIMIT 100
-            """, (self.acc_no,))
-            self.loaded.emit(cursor.fetchall())
-        finally:
-            if 'conn' in locals():
-                conn.close()
-
 class TransactionHistory(QWidget):
     def __init__(self, account_no):
         super().__init__()
         self.account_no = account_no
         self.setWindowTitle("Transaction History - Bank Mate")
-        self.showMaximized()
         self.init_ui()
 
+    def activate(self, account_no):
+        # Nothing is shown again until the account number is re-verified
+        self.account_no = account_no
+        self.model.account_no = account_no
+        self.model.clear()
+        self.acc_input.clear()
+
     def init_ui(self):
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #FFF1D0;
-                font-family: 'Verdana';
-            }
-            QLabel {
-                color: #333333;
-                font-size: 16px;
-            }
-            QLineEdit {
-                padding: 10px;
-                border: 2px solid #FFB347;
-                border-radius: 5px;
-                font-size: 14px;
-                min-width: 250px;
-            }
-            QPushButton {
-                padding: 12px;
-                font-weight: bold;
-                font-size: 16px;
-                min-width: 250px;
-                border-radius: 6px;
-                margin: 5px;
-            }
-            #title {
-                font-size: 24px;
-                font-weight: bold;
-                color: #2C3E50;
-                margin-bottom: 10px;
-            }
-            #logo {
-                margin-bottom: 20px;
-            }
-            #verify_btn {
-                background-color: #3498DB;
-                color: white;
-            }
-            #back_btn {
-                background-color: #FFB347;
-                color: #000;
-            }
-            QTableWidget {
-                background-color: white;
-                border: 2px solid #FFB347;
-                border-radius: 8px;
-                font-size: 14px;
-                gridline-color: #FFB347;
-            }
-            QHeaderView::section {
-                background-color: #FFB347;
-                color: black;
-                padding: 12px;
-                font-weight: bold;
-                font-size: 15px;
-                border: none;
-            }
-            QTableWidget::item {
-                padding: 10px;
-            }
-        """)
+        self.setObjectName("TransactionHistory")
 
         layout = QVBoxLayout()
         layout.setContentsMargins(50, 30, 50, 30)
@@ -113,8 +37,7 @@ class TransactionHistory(QWidget):
         # Logo and Title
         logo = QLabel()
         logo.setObjectName("logo")
-        logo.setPixmap(QPixmap("logo.png").scaled(120, 120, 
-                    Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        logo.setPixmap(logo_pixmap(120))
         logo.setAlignment(Qt.AlignCenter)
 
         title = QLabel("Transaction History")
@@ -130,10 +53,10 @@ class TransactionHistory(QWidget):
         btn_verify.setObjectName("verify_btn")
         btn_verify.clicked.connect(self.verify_and_load)
 
-        # Transactions Table
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["Type", "Amount", "Date & Time"])
+        # Transactions Table - older pages load as the customer scrolls down
+        self.model = AccountHistoryModel(self.account_no, parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table.verticalHeader().setVisible(False)
         self.table.setAlternatingRowColors(True)
@@ -145,12 +68,7 @@ class TransactionHistory(QWidget):
 
         # Footer
         footer = QLabel("© Chirag")
-        footer.setStyleSheet("""
-            color: #555;
-            font-size: 12px;
-            font-weight: bold;
-            padding-top: 20px;
-        """)
+        footer.setObjectName("footer")
         footer.setAlignment(Qt.AlignRight)
 
         # Assembly
@@ -175,47 +93,7 @@ class TransactionHistory(QWidget):
         self.load_transactions()
 
     def load_transactions(self):
-        self.loader = TransactionLoader(self.account_no)
-        self.loader.loaded.connect(self.display_transactions)
-        self.loader.start()
-        QMessageBox.information(self, "Loading", 
-            "Fetching your transaction history...")
-
-    def display_transactions(self, transactions):
-        self.table.setRowCount(len(transactions))
-        
-        for row, (txn_type, amount, timestamp) in enumerate(transactions):
-            
-            type_item = QTableWidgetItem(txn_type.upper())
-            type_item.setTextAlignment(Qt.AlignCenter)
-            
-            # Amount Column (using ₹ symbol)
-            amount_str = f"₹{float(amount):,.2f}"
-            amount_item = QTableWidgetItem(amount_str)
-            amount_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            
-            # Date Column
-            date_str = datetime.strftime(timestamp, "%d %b %Y, %I:%M %p")
-            date_item = QTableWidgetItem(date_str)
-            date_item.setTextAlignment(Qt.AlignCenter)
-            
-            # Set items
-            self.table.setItem(row, 0, type_item)
-            self.table.setItem(row, 1, amount_item)
-            self.table.setItem(row, 2, date_item)
-            
-            
-            if txn_type == "Deposit":
-                type_item.setForeground(QBrush(QColor(46, 204, 113)))  # Green
-                amount_item.setForeground(QBrush(QColor(46, 204, 113)))
-                amount_item.setFont(QFont("Verdana", 12, QFont.Bold))
-            else:
-                type_item.setForeground(QBrush(QColor(231, 76, 60)))   # Red
-                amount_item.setForeground(QBrush(QColor(231, 76, 60)))
-                amount_item.setFont(QFont("Verdana", 12, QFont.Bold))
+        self.model.refresh()
 
     def go_back(self):
-        from user_dashboard import UserDashboard
-        self.dashboard = UserDashboard(self.account_no)
-        self.dashboard.show()
-        self.close()
+        get_navigator().go("user_dashboard", account_no=self.account_no)
@@ -0,0 +1,169 @@
+# transfer_window
+from PyQt5.QtWidgets import (QWidget, QLabel, QLineEdit, QPushButton,
+                            QVBoxLayout, QMessageBox)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QDoubleValidator
+import logging
+import uuid
+from db_executor import get_executor, ExecutorBusyError
+from navigation import get_navigator
+from assets import logo_pixmap
+from bank_core import ledger
+from money import Money
+
+logging.basicConfig(
+    level=logging.DEBUG,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    filename='bank_transfer.log'
+)
+
+def post_transfer(from_acc, to_acc, amount, request_id):
+    """Database job: debit one account and credit the other in one transaction"""
+    ledger.transfer(from_acc, to_acc, amount, request_id)
+    return f"Transferred {amount} to account {to_acc} successfully"
+
+class TransferWindow(QWidget):
+    def __init__(self, account_no):
+        super().__init__()
+        self.account_no = account_no
+        self.setWindowTitle("Transfer - Bank Mate")
+        self.init_ui()
+
+    def activate(self, account_no):
+        self.account_no = account_no
+        self.acc_input.clear()
+        self.to_input.clear()
+        self.amount_input.clear()
+        self.new_request()
+
+    def new_request(self):
+        """Start a new transfer; retries of it send the same request id"""
+        self.request_id = uuid.uuid4().hex
+
+    def init_ui(self):
+        self.setObjectName("TransferWindow")
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(50, 30, 50, 30)
+        layout.setSpacing(20)
+
+        # Logo
+        logo = QLabel()
+        logo.setObjectName("logo")
+        logo.setPixmap(logo_pixmap(120))
+        logo.setAlignment(Qt.AlignCenter)
+
+        # Title
+        title = QLabel("🔁 Transfer Money")
+        title.setObjectName("title")
+        title.setAlignment(Qt.AlignCenter)
+
+        # Account Verification
+        lbl_acc = QLabel("Verify Your Account Number:")
+        self.acc_input = QLineEdit()
+        self.acc_input.setPlaceholderText("Enter your account number")
+
+        # Recipient
+        lbl_to = QLabel("Recipient Account Number:")
+        self.to_input = QLineEdit()
+        self.to_input.setPlaceholderText("Account to credit")
+        self.to_input.textEdited.connect(lambda _text: self.new_request())
+
+        # Amount Input
+        lbl_amount = QLabel("Amount to Transfer:")
+        self.amount_input = QLineEdit()
+        self.amount_input.setPlaceholderText("₹0.00")
+        self.amount_input.setValidator(QDoubleValidator(0, 1000000, 2))
+        self.amount_input.textEdited.connect(lambda _text: self.new_request())
+        self.new_request()
+
+        # Buttons
+        btn_transfer = QPushButton("CONFIRM TRANSFER")
+        btn_transfer.setObjectName("transfer_btn")
+        btn_transfer.clicked.connect(self.verify_and_transfer)
+
+        btn_back = QPushButton("← BACK TO DASHBOARD")
+        btn_back.setObjectName("back_btn")
+        btn_back.clicked.connect(self.close_and_return)
+
+        # Footer
+        footer = QLabel("© Chirag")
+        footer.setObjectName("footer")
+        footer.setAlignment(Qt.AlignRight)
+
+        # Assembly
+        layout.addWidget(logo)
+        layout.addWidget(title)
+        layout.addWidget(lbl_acc)
+        layout.addWidget(self.acc_input)
+        layout.addWidget(lbl_to)
+        layout.addWidget(self.to_input)
+        layout.addWidget(lbl_amount)
+        layout.addWidget(self.amount_input)
+        layout.addWidget(btn_transfer)
+        layout.addWidget(btn_back)
+        layout.addStretch()
+        layout.addWidget(footer)
+
+        self.setLayout(layout)
+
+    def verify_and_transfer(self):
+        entered_acc = self.acc_input.text().strip()
+        if entered_acc != self.account_no:
+            QMessageBox.warning(self, "Error", "Account number doesn't match!")
+            return
+
+        to_acc = self.to_input.text().strip()
+        if not to_acc:
+            QMessageBox.warning(self, "Error", "Please enter the recipient's account number")
+            return
+        if to_acc == self.account_no:
+            QMessageBox.warning(self, "Error", "Cannot transfer to your own account")
+            return
+
+        amount_text = self.amount_input.text().strip()
+        if not amount_text:
+            QMessageBox.warning(self, "Error", "Please enter an amount")
+            return
+
+        try:
+            amount = Money.parse(amount_text)
+            if amount.paise <= 0:
+                raise ValueError("Amount must be positive")
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Amount", str(e))
+            return
+
+        # Same key as deposits and withdrawals: one posting per account in flight
+        try:
+            job = get_executor().submit(post_transfer, self.account_no, to_acc, amount, self.request_id,
+                                        key=("posting", self.account_no))
+        except ExecutorBusyError as e:
+            QMessageBox.warning(self, "Busy", str(e))
+            return
+        if job is None:
+            QMessageBox.information(self, "Processing", "A transaction on this account is already being processed")
+            return
+
+        self.job = job
+        self.job.succeeded.connect(lambda message: self.handle_result(True, message))
+        self.job.failed.connect(self.handle_error)
+        QMessageBox.information(self, "Processing", "Your transfer is being processed...")
+
+    def handle_result(self, success, message):
+        if success:
+            self.new_request()
+            QMessageBox.information(self, "Success", message)
+            self.close_and_return()
+        else:
+            QMessageBox.critical(self, "Error", message)
+
+    def handle_error(self, error):
+        # Declines (insufficient balance, unknown recipient) are shown as-is
+        if isinstance(error, (ValueError, LookupError)):
+            self.handle_result(False, str(error))
+        else:
+            self.handle_result(False, f"Error: {str(error)}")
+
+    def close_and_return(self):
+        get_navigator().go("user_dashboard", account_no=self.account_no)
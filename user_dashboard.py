@@ -1,9 +1,14 @@
 # user_dashboard.py
 from PyQt5.QtWidgets import (QWidget, QLabel, QPushButton, 
                             QVBoxLayout, QHBoxLayout)
-from PyQt5.QtGui import QPixmap, QFont
+from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 from exception_handler import install_exception_handler
+from account_cache import account_cache
+from db_executor import get_executor, ExecutorBusyError
+from navigation import get_navigator
+from assets import logo_pixmap
+from bank_core import accounts
 
 class UserDashboard(QWidget):  
     """
@@ -14,65 +19,21 @@ class UserDashboard(QWidget):
         install_exception_handler()
         self.account_no = account_no
         self.setWindowTitle(f"User Dashboard - Account {account_no}")
-        self.showMaximized()
         self.init_ui()
 
+    def activate(self, account_no):
+        """
+        Re-shows the dashboard, picking up any balance change since the last visit.
+        """
+        self.account_no = account_no
+        self.setWindowTitle(f"User Dashboard - Account {account_no}")
+        self.show_balance()
+
     def init_ui(self):
         """
         Initializes the user interface with colorful feature boxes and a styled layout.
         """
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #FFF1D0;
-                font-family: 'Verdana';
-            }
-            #title {
-                font-size: 28px;
-                font-weight: bold;
-                color: #2C3E50;
-                margin: 20px 0;
-            }
-            #logo {
-                margin-bottom: 20px;
-            }
-            #footer {
-                color: #555;
-                font-size: 12px;
-                font-weight: bold;
-                padding-top: 20px;
-            }
-            /* Enhanced styling for the feature boxes */
-            .feature-box {
-                background-color: white;
-                border-radius: 10px;
-                padding: 30px; /* Increased padding for a larger box */
-                margin: 10px;
-                min-width: 200px;
-                border: 3px solid;
-                /* Add a subtle box-shadow to make it pop */
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            }
-            /* Specific hover effect for the boxes */
-            .feature-box:hover {
-                transform: scale(1.05); /* Slightly enlarge the box on hover */
-                transition: transform 0.2s ease-in-out;
-            }
-
-            /* Consistent styling for the Logout button */
-            QPushButton#logout_btn {
-                background-color: #9b59b6;
-                color: white;
-                padding: 15px;
-                border-radius: 5px;
-                font-size: 16px;
-                min-width: 200px;
-                border: none;
-                box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            }
-            QPushButton#logout_btn:hover {
-                background-color: #8e44ad;
-            }
-        """)
+        self.setObjectName("UserDashboard")
 
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(50, 30, 50, 30)
@@ -81,13 +42,18 @@ class UserDashboard(QWidget):
         # Main Logo at the top
         logo = QLabel()
         logo.setObjectName("logo")
-        logo.setPixmap(QPixmap("logo.png").scaled(120, 120, Qt.KeepAspectRatio))
+        logo.setPixmap(logo_pixmap(120))
         logo.setAlignment(Qt.AlignCenter)
 
         # Title
         title = QLabel(f"Welcome, Account {self.account_no}")
         title.setObjectName("title")
         title.setAlignment(Qt.AlignCenter)
+
+        # Balance - rendered from the account cache when possible
+        self.balance_label = QLabel("Balance: …")
+        self.balance_label.setObjectName("balance")
+        self.balance_label.setAlignment(Qt.AlignCenter)
         
         # Feature Boxes Container
         features_container = QWidget()
@@ -99,10 +65,12 @@ class UserDashboard(QWidget):
         # Create colorful feature boxes with their specific icons and colors
         withdraw_box = self.create_feature_box("💸 Withdraw", "#e74c3c", self.open_withdraw)
         deposit_box = self.create_feature_box("💰 Deposit", "#2ecc71", self.open_deposit)
+        transfer_box = self.create_feature_box("🔁 Transfer", "#9b59b6", self.open_transfer)
         history_box = self.create_feature_box("📊 History", "#3498db", self.open_history)
 
         features_layout.addWidget(withdraw_box)
         features_layout.addWidget(deposit_box)
+        features_layout.addWidget(transfer_box)
         features_layout.addWidget(history_box)
 
         # Logout Button
@@ -118,12 +86,38 @@ class UserDashboard(QWidget):
         # Assemble all components
         main_layout.addWidget(logo)
         main_layout.addWidget(title)
+        main_layout.addWidget(self.balance_label)
         main_layout.addWidget(features_container)
         main_layout.addWidget(logout_btn, alignment=Qt.AlignCenter)
         main_layout.addStretch()
         main_layout.addWidget(footer)
 
         self.setLayout(main_layout)
+        self.show_balance()
+
+    def show_balance(self):
+        """
+        Shows the cached balance, fetching it in the background on a miss.
+        """
+        state = account_cache.get(self.account_no)
+        if state is not None:
+            self.display_balance(state)
+            return
+
+        try:
+            job = get_executor().submit(accounts.state, self.account_no,
+                                        key=("account-state", self.account_no))
+        except ExecutorBusyError:
+            self.balance_label.setText("Balance: unavailable")
+            return
+        if job is None:
+            return
+        self.balance_job = job
+        self.balance_job.succeeded.connect(self.display_balance)
+        self.balance_job.failed.connect(lambda error: self.balance_label.setText("Balance: unavailable"))
+
+    def display_balance(self, state):
+        self.balance_label.setText(f"Balance: {state['balance']}")
 
     def create_feature_box(self, text, color, callback):
         """
@@ -153,36 +147,30 @@ class UserDashboard(QWidget):
 
     def open_withdraw(self):
         """
-        Opens the withdrawal window.
+        Opens the withdrawal screen.
         """
-        from withdraw_window import WithdrawWindow
-        self.withdraw_window = WithdrawWindow(self.account_no)
-        self.withdraw_window.show()
-        self.close()
+        get_navigator().go("withdraw", account_no=self.account_no)
 
     def open_deposit(self):
         """
-        Opens the deposit window.
+        Opens the deposit screen.
+        """
+        get_navigator().go("deposit", account_no=self.account_no)
+
+    def open_transfer(self):
+        """
+        Opens the transfer screen.
         """
-        from deposit_window import DepositWindow
-        self.deposit_window = DepositWindow(self.account_no)
-        self.deposit_window.show()
-        self.close()
+        get_navigator().go("transfer", account_no=self.account_no)
 
     def open_history(self):
         """
-        Opens the transaction history window.
+        Opens the transaction history screen.
         """
-        from transaction_history import TransactionHistory
-        self.history_window = TransactionHistory(self.account_no)
-        self.history_window.show()
-        self.close()
+        get_navigator().go("history", account_no=self.account_no)
 
     def logout(self):
         """
         Logs the user out and returns to the main menu.
         """
-        from main import MainWindow
-        self.main_window = MainWindow()
-        self.main_window.show()
-        self.close()
+        get_navigator().go("main")